@@ -0,0 +1,65 @@
+"""Benchmark de memoria y tiempo de los arrays declarados (`float x(n)`).
+
+Ejecuta `float x(N) = [...]; x[N] = [...];` con el intérprete y mide con
+tracemalloc lo que ocupa el array que queda en el entorno, comparado con la
+lista de floats de Python que se usaba antes.
+
+Uso:
+    python -m benchmarks.bench_arrays [--values N ...]
+"""
+import argparse
+import gc
+import io
+import time
+import tracemalloc
+
+from benchmarks.bench_parse import ROW_SIZE
+from src.parser import parser
+from visitors.interpreter import Interpreter
+
+
+def array_program(n):
+    rows = []
+    for start in range(0, n, ROW_SIZE):
+        rows.append(', '.join(f'{k % 997}.5' for k in range(start, min(n, start + ROW_SIZE))))
+    values = '[' + ',\n'.join(rows) + ']'
+    return f'float x({n}) = {values};\nx[{n}] = {values};\n'
+
+
+def measure(build):
+    """(resultado, memoria retenida en bytes) de build()"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def run(program):
+    interpreter = Interpreter(io.StringIO())
+    interpreter.run(program)
+    return interpreter.globals['x']
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--values', type=int, nargs='*', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    options = args.parse_args()
+
+    print(f"{'N':>9} {'ejecución (s)':>14} {'bytes/valor':>12} {'lista (bytes/valor)':>20} {'veces':>6}")
+    for n in options.values:
+        program = parser.parse(array_program(n))
+        start = time.perf_counter()
+        values = run(program).tolist()
+        elapsed = time.perf_counter() - start
+        _, array_size = measure(lambda: run(program))
+        # Un float nuevo por valor, como la lista que armaba el intérprete
+        _, list_size = measure(lambda: [v * 1.0 for v in values])
+        print(f'{n:>9} {elapsed:>14.3f} {array_size / n:>12.1f} {list_size / n:>20.1f}'
+              f' {list_size / array_size:>5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark de la caché de AST: análisis completo contra carga desde disco.
+
+Para programas de N sentencias y literales de matriz de N valores escribe el
+script en un directorio temporal y mide parse_file, la primera llamada a
+load_program (analiza y guarda) y la segunda (lee el archivo .ast), junto con
+el tamaño del script y de la entrada en la caché.
+
+Uso:
+    python -m benchmarks.bench_astcache [--statements N ...] [--values N ...]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_parse import matrix_program, program
+from src import astcache
+from src.streaming import parse_file
+
+
+def timed(function, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    if result is None:
+        raise SystemExit('El programa generado no se pudo analizar')
+    return elapsed
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--statements', type=int, nargs='*', default=[10 ** 4, 10 ** 5])
+    args.add_argument('--values', type=int, nargs='*', default=[10 ** 4, 10 ** 5])
+    options = args.parse_args()
+
+    print(f"{'entrada':<20} {'N':>8} {'parse (s)':>10} {'guardar (s)':>12} {'caché (s)':>10}"
+          f" {'veces':>6} {'KB script':>10} {'KB .ast':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ[astcache.CACHE_ENV] = directory
+        os.environ.pop(astcache.DISABLE_ENV, None)
+        for label, build, sizes in (('sentencias', program, options.statements),
+                                    ('valores de matriz', matrix_program, options.values)):
+            for n in sizes:
+                script = Path(directory) / f'{label[0]}{n}.txt'
+                script.write_text(build(n), encoding='utf-8')
+                parse = timed(parse_file, script)
+                miss = timed(astcache.load_program, script)
+                hit = timed(astcache.load_program, script)
+                entry = astcache.entry_path(astcache.content_key(script))
+                print(f'{label:<20} {n:>8} {parse:>10.3f} {miss:>12.3f} {hit:>10.3f} {parse / hit:>6.1f}'
+                      f' {script.stat().st_size / 1e3:>10.0f} {entry.stat().st_size / 1e3:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark de throughput de los bloques de datos numéricos, en números/segundo.
+
+Para literales de matriz de N valores (enteros y floats) mide:
+
+- token por número: el lexer con `data_blocks = False` (como el editor), que
+  entrega un token por cada número, coma y punto y coma;
+- scan_block: la conversión directa del bloque en un DataBlock;
+- parser.parse: el análisis completo del script con el lexer normal, que
+  entrega el bloque como un único token DATA_BLOCK.
+
+"mejora" es cuántas veces más rápido es el análisis completo que sólo lexear
+el bloque token por número (sin contar el parser, que era lo más lento).
+
+Uso:
+    python -m benchmarks.bench_datablock [--values N ...]
+"""
+import argparse
+import gc
+import time
+
+from benchmarks.bench_parse import ROW_SIZE, time_parse
+from src.datablock import scan_block
+from src.lexer import lexer
+
+
+def block_program(n, is_float):
+    rows = []
+    for start in range(0, n, ROW_SIZE):
+        numbers = ((start + k) % 997 for k in range(min(ROW_SIZE, n - start)))
+        rows.append(', '.join(f'{x}.25' if is_float else str(x) for x in numbers))
+    return 'm = [' + ';\n'.join(rows) + '];\n'
+
+
+def timed(function):
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def lex_tokens(code):
+    clone = lexer.clone()
+    clone.data_blocks = False
+    clone.input(code)
+    for _ in iter(clone.token, None):
+        pass
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--values', type=int, nargs='*', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    options = args.parse_args()
+
+    print(f"{'valores':<7} {'N':>9} {'token por número':>17} {'scan_block':>12} {'parser.parse':>13}"
+          f" {'mejora':>7}")
+    for label, is_float in (('int', False), ('float', True)):
+        for n in options.values:
+            code = block_program(n, is_float)
+            tokens = timed(lambda: lex_tokens(code))
+            scan = timed(lambda: scan_block(code, code.index('[')))
+            parse = time_parse(code)
+            print(f'{label:<7} {n:>9} {n / tokens:>17,.0f} {n / scan:>12,.0f} {n / parse:>13,.0f}'
+                  f' {tokens / parse:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
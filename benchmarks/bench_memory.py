@@ -0,0 +1,74 @@
+"""Benchmark de memoria del lexer y del AST con tracemalloc.
+
+Para un programa de ~N tokens mide lo que ocupan los tokens guardados como
+lista de LexToken y como TokenBuffer (columnas en arrays), y el AST que queda
+después del análisis junto con el pico de memoria durante parser.parse.
+
+Uso:
+    python -m benchmarks.bench_memory [--tokens N]
+"""
+import argparse
+import contextlib
+import gc
+import os
+import tracemalloc
+
+from benchmarks.bench_parse import STATEMENT, program
+from src.lexer import lexer
+from src.parser import parser
+from src.tokens import TokenBuffer
+
+# Tokens de cada sentencia del programa de bench_parse: x = x + i * 2 ;
+TOKENS_PER_STATEMENT = 8
+
+
+def measure(build):
+    """(memoria retenida, pico) en bytes de lo que devuelve build()"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def lex_list(code):
+    clone = lexer.clone()
+    clone.input(code)
+    return list(iter(clone.token, None))
+
+
+def parse(code):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = parser.parse(code, lexer=lexer.clone())
+        # Libera las pilas que el parser conserva de esta corrida
+        parser.parse(STATEMENT.format(i=0), lexer=lexer.clone())
+    if result is None:
+        raise SystemExit('El programa generado no se pudo analizar')
+    return result
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--tokens', type=int, default=10 ** 6)
+    options = args.parse_args()
+
+    code = program(options.tokens // TOKENS_PER_STATEMENT)
+    tokens, token_list, _ = measure(lambda: lex_list(code))
+    count = len(tokens)
+    del tokens
+    buffer, token_buffer, _ = measure(lambda: TokenBuffer.from_lexer(lexer.clone(), code))
+    del buffer
+    ast, ast_size, ast_peak = measure(lambda: parse(code))
+    del ast
+
+    print(f"{count} tokens, {len(code) / 1e6:.1f} MB de código")
+    print(f"{'':<24} {'MB':>8} {'bytes/token':>12}")
+    for label, size in (('lista de LexToken', token_list), ('TokenBuffer', token_buffer),
+                        ('AST', ast_size), ('pico de parser.parse', ast_peak)):
+        print(f'{label:<24} {size / 1e6:>8.1f} {size / count:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
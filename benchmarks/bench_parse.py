@@ -0,0 +1,63 @@
+"""Benchmark de escalamiento del parser con programas y literales grandes.
+
+Mide el tiempo de parser.parse para programas de N sentencias y para
+literales de matriz de N valores; si la construcción de listas es lineal, el
+tiempo por elemento se mantiene constante al crecer N.
+
+Uso:
+    python -m benchmarks.bench_parse [--statements N ...] [--values N ...]
+"""
+import argparse
+import contextlib
+import gc
+import os
+import time
+
+from src.parser import parser
+
+STATEMENT = 'x = x + {i} * 2;\n'
+ROW_SIZE = 100
+
+
+def program(n):
+    return 'int x = 0;\n' + ''.join(STATEMENT.format(i=i % 1000) for i in range(n))
+
+
+def matrix_program(n):
+    rows = []
+    for start in range(0, n, ROW_SIZE):
+        rows.append(', '.join(f'{(start + k) % 997}.5' for k in range(min(ROW_SIZE, n - start))))
+    return 'm = [' + ';\n'.join(rows) + '];\n'
+
+
+def time_parse(code):
+    # Los errores de sintaxis se imprimen; no se mide la terminal
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # El parser conserva sus pilas de la corrida anterior: se liberan fuera
+        # de la medición
+        parser.parse(STATEMENT.format(i=0))
+        gc.collect()
+        start = time.perf_counter()
+        result = parser.parse(code)
+        elapsed = time.perf_counter() - start
+    if result is None:
+        raise SystemExit('El programa generado no se pudo analizar')
+    return elapsed
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--statements', type=int, nargs='*', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    args.add_argument('--values', type=int, nargs='*', default=[10 ** 3, 10 ** 4, 10 ** 5])
+    options = args.parse_args()
+
+    print(f"{'entrada':<22} {'N':>9} {'tiempo (s)':>11} {'µs/elemento':>12}")
+    for label, build, sizes in (('sentencias', program, options.statements),
+                                ('valores de matriz', matrix_program, options.values)):
+        for n in sizes:
+            elapsed = time_parse(build(n))
+            print(f'{label:<22} {n:>9} {elapsed:>11.3f} {elapsed / n * 1e6:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
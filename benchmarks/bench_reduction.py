@@ -0,0 +1,59 @@
+"""Benchmark de los ciclos de reducción (ReductionLoop) contra el ciclo original.
+
+Ejecuta un nido de dos for-range de N x N vueltas que sólo acumula en una
+variable (`s = s + (i * 0.5 + j) ^ 2 / (j + 1);`) con el intérprete y con la
+máquina de pila, sin optimizar y optimizado (el optimizador lo reemplaza por
+un ReductionLoop). Verifica que ambos den el mismo resultado bit a bit.
+
+Uso:
+    python -m benchmarks.bench_reduction [--sizes N ...]
+"""
+import argparse
+import gc
+import io
+import time
+
+from src.parser import parser
+from visitors.compiler import compile_program
+from visitors.interpreter import Interpreter
+from visitors.optimizer import optimize
+from visitors.vm import VM
+
+
+def program(n):
+    return (f'float s = 0.0;\n'
+            f'for i in range(0, {n}) {{ for j in range(0, {n}) {{ s = s + (i * 0.5 + j) ^ 2 / (j + 1); }} }}\n')
+
+
+def timed(function):
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result['s']
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--sizes', type=int, nargs='*', default=[30, 100, 300])
+    options = args.parse_args()
+
+    print(f"{'vueltas':>9} {'intérprete (s)':>15} {'optimizado':>11} {'veces':>7}"
+          f" {'VM (s)':>8} {'optimizado':>11} {'veces':>7}")
+    for n in options.sizes:
+        source = program(n)
+        tree, reduced = parser.parse(source), optimize(parser.parse(source))
+        plain_code, reduced_code = compile_program(parser.parse(source)), compile_program(reduced)
+        interpreted, expected = timed(lambda: Interpreter(io.StringIO()).run(tree))
+        interpreted_reduced, value = timed(lambda: Interpreter(io.StringIO()).run(reduced))
+        compiled, compiled_value = timed(lambda: VM(io.StringIO()).run(plain_code))
+        compiled_reduced, compiled_reduced_value = timed(lambda: VM(io.StringIO()).run(reduced_code))
+        if not expected == value == compiled_value == compiled_reduced_value:
+            raise SystemExit(f'Resultados distintos: {expected!r} {value!r} {compiled_value!r} '
+                             f'{compiled_reduced_value!r}')
+        print(f'{n * n:>9} {interpreted:>15.4f} {interpreted_reduced:>11.4f}'
+              f' {interpreted / interpreted_reduced:>6.0f}x {compiled:>8.4f} {compiled_reduced:>11.4f}'
+              f' {compiled / compiled_reduced:>6.0f}x')
+
+
+if __name__ == '__main__':
+    main()
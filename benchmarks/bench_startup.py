@@ -0,0 +1,64 @@
+"""Benchmark de arranque en frío: tiempo de importar src.lexer / src.parser.
+
+Cada medición se hace en un proceso nuevo para que no influyan las cachés del
+intérprete. Se compara la construcción completa (caché de tablas desactivada)
+con la carga de las tablas generadas.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs N] [--module src.lexer]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from src.tablecache import CACHE_ENV, DISABLE_ENV
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+IMPORT_SNIPPET = (
+    'import time; t = time.perf_counter(); import {module}; '
+    'print(time.perf_counter() - t)'
+)
+
+
+def time_import(module, env):
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET.format(module=module)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure(module, runs, env):
+    samples = [time_import(module, env) for _ in range(runs)]
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--runs', type=int, default=10)
+    args.add_argument('--module', action='append')
+    options = args.parse_args()
+    modules = options.module or ['src.lexer', 'src.parser']
+
+    with tempfile.TemporaryDirectory() as cache:
+        base_env = dict(os.environ, **{CACHE_ENV: cache})
+        without_cache = dict(base_env, **{DISABLE_ENV: '1'})
+        with_cache = dict(base_env)
+        with_cache.pop(DISABLE_ENV, None)
+
+        print(f"{'módulo':<12} {'modo':<22} {'mediana (ms)':>13} {'mínimo (ms)':>12}")
+        for module in modules:
+            time_import(module, with_cache)  # Genera las tablas una vez
+            for label, env in (('sin caché (antes)', without_cache),
+                               ('tablas en caché', with_cache)):
+                median, best = measure(module, options.runs, env)
+                print(f'{module:<12} {label:<22} {median * 1000:>13.2f} {best * 1000:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark de las expresiones sobre arrays completos contra NumPy escrito a mano.
+
+Declara `float x(N)` y `float y(N)` y evalúa varias veces la expresión
+`x * 2.5 + y * y - x / 4 + 1` con el intérprete, con la máquina de pila y
+directamente con NumPy (`x * 2.5 + y * y - x / 4 + 1` sobre los ndarray). La
+columna "/NumPy" es cuánto más tarda cada motor que NumPy.
+
+Uso:
+    python -m benchmarks.bench_vectorize [--values N ...] [--repeat R]
+"""
+import argparse
+import gc
+import io
+import time
+
+import numpy as np
+
+from src.parser import parser
+from visitors.compiler import compile_program
+from visitors.interpreter import Interpreter
+from visitors.vm import VM
+
+EXPRESSION = 'x * 2.5 + y * y - x / 4 + 1'
+
+
+def program(n, repeat):
+    return (f'float x({n});\nfloat y({n});\n'
+            f'for i in range(0, {repeat}) {{ z = {EXPRESSION}; }}\n')
+
+
+def timed(function):
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--values', type=int, nargs='*', default=[10 ** 3, 10 ** 5, 10 ** 6])
+    args.add_argument('--repeat', type=int, default=20)
+    options = args.parse_args()
+
+    print(f"{'N':>9} {'intérprete (s)':>15} {'/NumPy':>7} {'VM (s)':>8} {'/NumPy':>7} {'NumPy (s)':>10}")
+    for n in options.values:
+        tree = parser.parse(program(n, options.repeat))
+        code = compile_program(tree)
+        interpreted = timed(lambda: Interpreter(io.StringIO()).run(tree))
+        compiled = timed(lambda: VM(io.StringIO()).run(code))
+        x, y = np.zeros(n), np.zeros(n)
+
+        def by_hand():
+            for _ in range(options.repeat):
+                x * 2.5 + y * y - x / 4 + 1
+        numpy = timed(by_hand)
+        print(f'{n:>9} {interpreted:>15.4f} {interpreted / numpy:>6.2f}x {compiled:>8.4f}'
+              f' {compiled / numpy:>6.2f}x {numpy:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: máquina de pila (visitors/vm.py) frente al intérprete de árbol.
+
+Ejecuta ciclos for-range anidados como los de los scripts de modelos y mide
+sólo la ejecución (el análisis y la compilación se hacen una vez fuera del
+cronómetro), sin y con el pase de visitors/optimizer.py.
+
+Uso:
+    python -m benchmarks.bench_vm [--size N] [--runs R]
+"""
+import argparse
+import io
+import time
+
+from src.parser import parser
+from visitors import interpreter, vm
+from visitors.compiler import compile_program
+from visitors.optimizer import optimize
+
+SCRIPTS = {
+    'doble ciclo': '''
+        int n = {n};
+        float s = 0.0;
+        for i in range(0,n) {{
+            for j in range(0,n) {{
+                s = s + (i * j % 7) ^ 2;
+            }}
+        }}
+    ''',
+    'triple ciclo': '''
+        int n = {m};
+        int c = 0;
+        for i in range(0,n) {{
+            for j in range(0,n) {{
+                for k in range(0,n) {{
+                    c = c + i - j + k;
+                }}
+            }}
+        }}
+    ''',
+    'invariantes': '''
+        float a = 1.5;
+        a = a * 2;
+        float s = 0.0;
+        for i in range(0,{n}) {{
+            for j in range(0,{n}) {{
+                s = s + sin(0.5) * a * a + cos(a) * j;
+            }}
+        }}
+    ''',
+    'while': '''
+        int i = 0;
+        float t = 0.0;
+        while (i < {w}) {{
+            t = t + sin(0.5) * i;
+            i = i + 1;
+        }}
+    ''',
+}
+
+
+def best_of(runs, function):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument('--size', type=int, default=300)
+    args.add_argument('--runs', type=int, default=3)
+    options = args.parse_args()
+    sizes = {'n': options.size, 'm': round(options.size ** (2 / 3)), 'w': options.size ** 2}
+
+    print(f"{'script':<14} {'árbol (s)':>10} {'VM (s)':>10} {'aceleración':>12} "
+          f"{'árbol opt.':>11} {'VM opt.':>10}")
+    for name, template in SCRIPTS.items():
+        source = template.format(**sizes)
+        program = parser.parse(source)
+        optimized = optimize(parser.parse(source))
+        code = compile_program(program)
+        optimized_code = compile_program(optimized)
+        expected = interpreter.run(program, io.StringIO())
+        assert vm.VM(io.StringIO()).run(code) == expected, name
+        assert interpreter.run(optimized, io.StringIO()) == expected, name
+        assert vm.VM(io.StringIO()).run(optimized_code) == expected, name
+
+        tree = best_of(options.runs, lambda: interpreter.run(program, io.StringIO()))
+        machine = best_of(options.runs, lambda: vm.VM(io.StringIO()).run(code))
+        tree_opt = best_of(options.runs, lambda: interpreter.run(optimized, io.StringIO()))
+        machine_opt = best_of(options.runs, lambda: vm.VM(io.StringIO()).run(optimized_code))
+        print(f'{name:<14} {tree:>10.3f} {machine:>10.3f} {tree / machine:>11.1f}x '
+              f'{tree_opt:>11.3f} {machine_opt:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,14 +2,23 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog
 from pathlib import Path
 import sys
-import re
+
+# Espera (ms) tras la última tecla antes de resaltar
+HIGHLIGHT_DELAY_MS = 150
+
+# Etiqueta de resaltado de cada tipo de token
+PUNCTUATION = {'L_PARENTESIS', 'R_PARENTESIS', 'L_LLAVE', 'R_LLAVE', 'L_CORCHETE', 'R_CORCHETE'}
+HIGHLIGHT_TAGS = ("tok_comment", "tok_keyword", "tok_string", "tok_punctuation")
 
 # Configurar paths
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root / "src"))
 
-from src.lexer import lexer, reserved
-from src.parser import parser
+from src.analyzer import new_analyzer
+from src.lexer import reserved
+from src.incremental import IncrementalLexer
+from src.my_ast import ASTNode
+from interfaz.worker import AnalysisCancelled, AnalysisWorker
 
 class CodeAnalyzerApp:
     def __init__(self, root):
@@ -17,7 +26,15 @@ class CodeAnalyzerApp:
         self.root.title("Analizador Léxico/Sintáctico")
         self.root.geometry("1200x700")
         self.reserved_words = list(reserved.keys())  # ← Importa las palabras clave
+        self.incremental_lexer = IncrementalLexer()
+        self.token_rows = []  # ids de las filas de token_table de cada línea
+        self.keyword_types = set(reserved.values())
+        self.highlight_lexer = IncrementalLexer()
+        self.analyzer = new_analyzer()  # sólo lo usa el hilo de AnalysisWorker
+        self.stale_lines = []  # líneas cuyo resaltado hay que recalcular
+        self.highlight_job = None
         self.setup_ui()
+        self.worker = AnalysisWorker(self.root, on_busy=self.show_busy)
 
     def setup_ui(self):
         button_frame = ttk.Frame(self.root, padding="10")
@@ -32,6 +49,11 @@ class CodeAnalyzerApp:
         self.syntax_btn = ttk.Button(button_frame, text="Análisis Sintáctico", command=self.syntax_analysis)
         self.syntax_btn.pack(side=tk.LEFT, padx=5)
 
+        self.progress = ttk.Progressbar(button_frame, mode='indeterminate', length=150)
+        self.progress.pack(side=tk.RIGHT, padx=5)
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
 
@@ -46,7 +68,16 @@ class CodeAnalyzerApp:
             undo=True
         )
         self.code_text.pack(fill=tk.BOTH, expand=True)
-        self.code_text.bind("<KeyRelease>", self.highlight_code)
+        self.code_text.bind("<KeyRelease>", self.schedule_highlight)
+        self.code_text.bind("<Configure>", self.schedule_highlight)
+        self.code_text.bind("<<Modified>>", self.on_modified)
+        # Al desplazarse se resaltan las líneas que entran en la vista
+        scroll = self.code_text.vbar.set
+        self.code_text.configure(yscrollcommand=lambda *args: (scroll(*args), self.schedule_highlight()))
+        self.code_text.tag_configure("tok_comment", foreground="#008000")  # Verde
+        self.code_text.tag_configure("tok_keyword", foreground="#0000AA")  # Azul oscuro
+        self.code_text.tag_configure("tok_string", foreground="#008000")  # Verde
+        self.code_text.tag_configure("tok_punctuation", foreground="#FFD700")  # Amarillo
 
         ttk.Separator(main_frame, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
 
@@ -79,25 +110,85 @@ class CodeAnalyzerApp:
                 self.highlight_code()
             self.show_result(f"Archivo cargado: {filepath}")
 
+    def on_modified(self, event=None):
+        """Una edición deja obsoleto el análisis en curso: se cancela"""
+        if self.code_text.edit_modified():
+            self.worker.cancel()
+            self.code_text.edit_modified(False)
+
+    def show_busy(self, busy):
+        if busy:
+            self.status_label.config(text="Analizando...")
+            self.progress.start(10)
+        else:
+            self.status_label.config(text="")
+            self.progress.stop()
+
     def lexical_analysis(self):
-        code = self.code_text.get(1.0, tk.END)
-        self.token_table.delete(*self.token_table.get_children())
+        code = self.code_text.get(1.0, "end-1c")
+        incremental_lexer = self.incremental_lexer
 
-        if not code.strip():
-            self.show_result("Error: No hay código para analizar")
-            return
+        def task(job):
+            return incremental_lexer.update(code, job.checkpoint)
+
+        def done(change, error):
+            # Un cambio ya calculado se aplica siempre (aunque el trabajo se haya
+            # cancelado después) para que la tabla siga al estado del lexer
+            if change is not None:
+                self.patch_token_table(change)
+            if isinstance(error, AnalysisCancelled):
+                self.show_result("Análisis léxico cancelado")
+            elif error is not None:
+                self.show_result(f"ERROR EN ANÁLISIS LÉXICO:\n{str(error)}")
+            elif not code.strip():
+                self.show_result("Error: No hay código para analizar")
+            else:
+                self.show_result("Análisis léxico completado")
 
-        lexer.input(code)
-        try:
-            for token in lexer:
-                texto = token.value
-                tipo = token.type
-                posicion = f"[{token.lineno},{token.lexpos}]"
-                lexema = texto
-                self.token_table.insert("", "end", values=(texto, tipo, posicion, lexema))
-            self.show_result("Análisis léxico completado")
-        except Exception as e:
-            self.show_result(f"ERROR EN ANÁLISIS LÉXICO:\n{str(e)}")
+        self.worker.submit(task, done)
+
+    def patch_token_table(self, change):
+        """Actualiza sólo las filas de las líneas que cambiaron"""
+        table = self.token_table
+        old_rows = self.token_rows[change.start:change.start + change.removed]
+
+        # Posición de inserción: después de la última fila de las líneas anteriores
+        index = 0
+        for rows in reversed(self.token_rows[:change.start]):
+            if rows:
+                index = table.index(rows[-1]) + 1
+                break
+
+        new_rows = []
+        for k in range(max(len(old_rows), len(change.lines))):
+            old_tokens = change.old[k] if k < len(old_rows) else None
+            tokens = change.lines[k] if k < len(change.lines) else None
+            if old_tokens == tokens:
+                new_rows.append(old_rows[k])
+                index += len(old_rows[k])
+                continue
+            if old_tokens is not None:
+                table.delete(*old_rows[k])
+            if tokens is not None:
+                line = change.start + k + 1
+                rows = [table.insert("", index + n, values=self.token_values(token, line))
+                        for n, token in enumerate(tokens)]
+                new_rows.append(rows)
+                index += len(rows)
+        self.token_rows[change.start:change.start + change.removed] = new_rows
+
+        # Si cambió la cantidad de líneas, se renumeran las filas siguientes
+        if change.delta:
+            first = change.start + len(change.lines)
+            all_tokens = self.incremental_lexer.tokens
+            for line in range(first, len(self.token_rows)):
+                for row, (_, _, column, _) in zip(self.token_rows[line], all_tokens[line]):
+                    table.set(row, "Posición", f"[{line + 1},{column}]")
+
+    @staticmethod
+    def token_values(token, line):
+        tipo, texto, columna, _ = token
+        return (texto, tipo, f"[{line},{columna}]", texto)
 
     def syntax_analysis(self):
         code = self.code_text.get(1.0, tk.END)
@@ -105,28 +196,37 @@ class CodeAnalyzerApp:
             self.show_result("Error: No hay código para analizar")
             return
 
-        try:
-            result = parser.parse(code)
-            ast_str = self.format_ast(result)
-            self.show_result("=== ÁRBOL SINTÁCTICO ===\n" + ast_str)
-        except Exception as e:
-            self.show_result(f"ERROR DE SINTÁXIS:\n{str(e)}")
+        def task(job):
+            # El hilo de trabajo usa su propio analizador (lexer y parser)
+            result = self.analyzer.parse(code, checkpoint=job.checkpoint)
+            ast_str = self.format_ast(result.program)
+            if result.errors:
+                ast_str = "\n".join(result.errors) + "\n\n" + ast_str
+            return ast_str
+
+        def done(ast_str, error):
+            if isinstance(error, AnalysisCancelled):
+                self.show_result("Análisis sintáctico cancelado")
+            elif error is not None:
+                self.show_result(f"ERROR DE SINTÁXIS:\n{str(error)}")
+            else:
+                self.show_result("=== ÁRBOL SINTÁCTICO ===\n" + ast_str)
+
+        self.worker.submit(task, done)
 
     def format_ast(self, node, indent=0):
         if isinstance(node, list):
             return "\n".join([self.format_ast(n, indent) for n in node])
 
-        if not hasattr(node, '__dict__'):
+        if not isinstance(node, ASTNode):
             return " " * indent + str(node)
 
         node_str = " " * indent + node.__class__.__name__ + ":\n"
-        for key, value in node.__dict__.items():
-            if key.startswith('_') or key in ['lineno', 'lexpos']:
-                continue
+        for key, value in node.fields():
             node_str += " " * (indent + 2) + f"{key}: "
             if isinstance(value, (list, tuple)):
                 node_str += "[\n" + self.format_ast(value, indent + 4) + "\n" + " " * (indent + 2) + "]\n"
-            elif hasattr(value, '__dict__'):
+            elif isinstance(value, ASTNode):
                 node_str += "\n" + self.format_ast(value, indent + 4)
             else:
                 node_str += str(value) + "\n"
@@ -138,42 +238,73 @@ class CodeAnalyzerApp:
         self.result_text.insert(tk.END, content)
         self.result_text.config(state='disabled')
 
+    def schedule_highlight(self, event=None):
+        """Agrupa las teclas seguidas: sólo se resalta tras HIGHLIGHT_DELAY_MS sin cambios"""
+        if self.highlight_job is not None:
+            self.root.after_cancel(self.highlight_job)
+        self.highlight_job = self.root.after(HIGHLIGHT_DELAY_MS, self.highlight_code)
+
     def highlight_code(self, event=None):
-        code = self.code_text.get("1.0", tk.END)
-        self.code_text.tag_delete("highlight")
-        for tag in self.code_text.tag_names():
-            if tag.startswith("tok_"):
-                self.code_text.tag_delete(tag)
-
-        # Comentarios
-        for match in re.finditer(r"#.*", code):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.code_text.tag_add("tok_comment", start, end)
-        self.code_text.tag_configure("tok_comment", foreground="#008000")  # Verde
+        """Resalta a partir de los tokens del lexer, sólo en las líneas visibles que cambiaron.
 
-        # Palabras reservadas
-        for word in self.reserved_words:
-            for match in re.finditer(rf"\b{re.escape(word)}\b", code):
-                start = f"1.0+{match.start()}c"
-                end = f"1.0+{match.end()}c"
-                self.code_text.tag_add("tok_keyword", start, end)
-        self.code_text.tag_configure("tok_keyword", foreground="#0000AA")  # Azul oscuro
+        Las etiquetas de Tk se desplazan con el texto, así que las líneas que no
+        cambiaron conservan su resaltado; las que cambiaron fuera de la vista
+        quedan pendientes hasta que se desplace hasta ellas.
+        """
+        self.highlight_job = None
+        change = self.highlight_lexer.update(self.code_text.get("1.0", "end-1c"))
+        self.stale_lines[change.start:change.start + change.removed] = [True] * len(change.lines)
 
-        # Cadenas
-        for match in re.finditer(r"(['\"])(.*?)(\1)", code):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.code_text.tag_add("tok_string", start, end)
-        self.code_text.tag_configure("tok_string", foreground="#008000")  # Verde
+        first = int(self.code_text.index("@0,0").split('.')[0]) - 1
+        last = int(self.code_text.index(f"@0,{self.code_text.winfo_height()}").split('.')[0])
+        lines = [line for line in range(first, min(last, len(self.stale_lines))) if self.stale_lines[line]]
+        if not lines:
+            return
+
+        # Una línea que empieza dentro de una cadena multilínea se pinta desde
+        # la línea donde empieza el token
+        clean = self.highlight_lexer.clean
+        targets = set()
+        for line in lines:
+            while line > 0 and not clean[line]:
+                targets.add(line)
+                line -= 1
+            targets.add(line)
+
+        for line in targets:
+            for tag in HIGHLIGHT_TAGS:
+                self.code_text.tag_remove(tag, f"{line + 1}.0", f"{line + 1}.end")
+        for line in sorted(targets):
+            self.highlight_line(line)
+            self.stale_lines[line] = False
+
+    def highlight_line(self, line):
+        text = self.highlight_lexer.lines[line]
+        tokens = self.highlight_lexer.tokens[line]
+        row = line + 1
+
+        # Lo que queda entre tokens y empieza con '#' es un comentario; en una
+        # línea que empieza dentro de una cadena se busca desde el primer token
+        position = 0 if self.highlight_lexer.clean[line] else (tokens[0][2] if tokens else len(text))
+        for tipo, _, column, length in tokens:
+            comment = text.find('#', position, column)
+            if comment != -1:
+                break
+            position = column + length
+            if tipo in self.keyword_types:
+                tag = "tok_keyword"
+            elif tipo == 'LIT_STRING':
+                tag = "tok_string"
+            elif tipo in PUNCTUATION:
+                tag = "tok_punctuation"
+            else:
+                continue
+            self.code_text.tag_add(tag, f"{row}.{column}", f"{row}.{column}+{length}c")
+        else:
+            comment = text.find('#', position)
+        if comment != -1:
+            self.code_text.tag_add("tok_comment", f"{row}.{comment}", f"{row}.end")
 
-        # Signos de puntuación
-        for match in re.finditer(r"[()\[\]{}]", code):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.code_text.tag_add("tok_punctuation", start, end)
-        self.code_text.tag_configure("tok_punctuation", foreground="#FFD700")  # Amarillo
-        
 
 if __name__ == "__main__":
     root = tk.Tk()
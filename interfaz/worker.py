@@ -0,0 +1,94 @@
+"""Hilo de trabajo para los análisis de la interfaz.
+
+Tk no es seguro entre hilos: el hilo de trabajo nunca toca los widgets, sólo
+deja sus resultados en una cola que el hilo principal revisa con root.after.
+Los trabajos se ejecutan de a uno y en orden; al enviar uno nuevo o al editar
+el código se cancela el que estaba en curso, que se detiene en su siguiente
+punto de control (job.checkpoint).
+"""
+import queue
+import threading
+
+# Intervalo (ms) con que el hilo principal revisa los resultados
+POLL_MS = 50
+
+
+class AnalysisCancelled(Exception):
+    """El trabajo fue cancelado antes de terminar"""
+
+
+class Job:
+    def __init__(self, task, on_done):
+        self.task = task
+        self.on_done = on_done
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def checkpoint(self):
+        if self._cancelled.is_set():
+            raise AnalysisCancelled()
+
+
+class AnalysisWorker:
+    def __init__(self, root, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy  # on_busy(True/False) al empezar/terminar de trabajar
+        self.pending = 0
+        self.current = None
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._polling = False
+        threading.Thread(target=self._run, name="analysis-worker", daemon=True).start()
+
+    def submit(self, task, on_done):
+        """Encola task(job) y cancela el trabajo anterior.
+
+        on_done(valor, error) se llama en el hilo principal; error es None, la
+        excepción de la tarea o AnalysisCancelled.
+        """
+        self.cancel()
+        job = self.current = Job(task, on_done)
+        self.pending += 1
+        if self.pending == 1 and self.on_busy:
+            self.on_busy(True)
+        self._jobs.put(job)
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+        return job
+
+    def cancel(self):
+        if self.current is not None:
+            self.current.cancel()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                job.checkpoint()
+                self._results.put((job, job.task(job), None))
+            except Exception as e:
+                self._results.put((job, None, e))
+
+    def _poll(self):
+        while True:
+            try:
+                job, value, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if job is self.current:
+                self.current = None
+            job.on_done(value, error)
+        if self.pending:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+            if self.on_busy:
+                self.on_busy(False)
@@ -0,0 +1,112 @@
+"""Analizadores independientes para usar desde varios hilos o desde asyncio.
+
+`src.lexer.lexer` y `src.parser.parser` son objetos únicos del módulo: el
+lexer guarda la posición y la línea de la última entrada y el parser sus pilas
+durante parse, así que dos análisis simultáneos se pisan. Cada Analyzer tiene
+su propia copia de ambos (las tablas se comparten, son de sólo lectura),
+empieza cada análisis en la línea 1 y junta los errores de ese análisis en
+lugar de imprimirlos.
+
+    analyzer = new_analyzer()
+    result = analyzer.parse(code)        # result.program, result.errors
+
+    result = await analyze(code)         # en un hilo del pool, sin bloquear el loop
+
+Un Analyzer no se comparte entre hilos; analyze usa uno por hilo del pool.
+"""
+import asyncio
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.diagnostics import ERROR, diagnostics
+
+
+class Analysis:
+    """Resultado de Analyzer.parse"""
+    __slots__ = ('program', 'diagnostics')
+
+    def __init__(self, program, diagnostics):
+        self.program = program
+        self.diagnostics = diagnostics
+
+    @property
+    def errors(self):
+        return [record.message for record in self.diagnostics if record.level >= ERROR]
+
+    @property
+    def ok(self):
+        return self.program is not None and not self.errors
+
+    def __repr__(self):
+        return f"Analysis(ok={self.ok}, errors={len(self.errors)})"
+
+
+class Analyzer:
+    def __init__(self):
+        from src.lexer import lexer
+        from src.parser import parser
+        self.lexer = lexer.clone()
+        # Copia superficial: comparte las tablas LALR y tiene sus propias pilas
+        self.parser = copy.copy(parser)
+
+    def _reset(self, source):
+        self.lexer.lineno = 1
+        self.lexer.input(source)
+
+    def tokenize(self, source):
+        """Lista de tokens de `source` (los errores léxicos se imprimen, no se guardan)"""
+        self._reset(source)
+        with diagnostics.scope():
+            return list(iter(self.lexer.token, None))
+
+    def parse(self, source, checkpoint=None):
+        """Analiza `source` y devuelve un Analysis con el AST y sus mensajes.
+
+        `checkpoint`, si se da, se llama antes de pedir cada token (p. ej. para
+        cancelar el análisis lanzando una excepción).
+        """
+        self._reset(source)
+        get_token = self.lexer.token
+        if checkpoint is not None:
+            def get_token(token=self.lexer.token):
+                checkpoint()
+                return token()
+        with diagnostics.scope(echo=False) as sink:
+            program = self.parser.parse(lexer=self.lexer, tokenfunc=get_token)
+        return Analysis(program, list(sink.records))
+
+
+def new_analyzer():
+    """Analizador nuevo, independiente de los demás y de los globales"""
+    return Analyzer()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _thread_analyzer():
+    analyzer = getattr(_local, 'analyzer', None)
+    if analyzer is None:
+        analyzer = _local.analyzer = Analyzer()
+    return analyzer
+
+
+def _parse_in_thread(source):
+    return _thread_analyzer().parse(source)
+
+
+def _default_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix='analyzer')
+        return _executor
+
+
+async def analyze(source, executor=None):
+    """Analiza `source` en un hilo (del pool propio o de `executor`) y devuelve su Analysis"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _default_executor(), _parse_in_thread, source)
@@ -0,0 +1,151 @@
+"""Caché en disco de los AST de los scripts.
+
+Cada archivo analizado se guarda con src/astfile.py bajo un nombre que es el
+hash de su contenido junto con el del código que lo analiza (lexer, parser,
+nodos), así que un script sin cambios se carga sin lexear ni parsear y
+cualquier cambio en el script o en la gramática produce otra entrada. Sólo se
+guardan los análisis limpios: si el parser imprimió errores o dejó
+diagnósticos, el archivo se vuelve a analizar la próxima vez para que los
+mensajes aparezcan de nuevo.
+
+Variables de entorno:
+    TALLER_AST_CACHE     directorio de la caché (por defecto src/__astcache__)
+    TALLER_NO_AST_CACHE  si vale 1, no se lee ni se escribe ningún AST
+
+Para precargar la caché:
+
+    python -m src.astcache script1.txt script2.txt ...
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+from pathlib import Path
+
+from src import astfile
+from src.diagnostics import diagnostics
+from src import tablecache
+from src.tablecache import temp_path
+
+CACHE_ENV = 'TALLER_AST_CACHE'
+DISABLE_ENV = 'TALLER_NO_AST_CACHE'
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / '__astcache__'
+
+# Módulos de los que depende el AST que se obtiene de un script
+ANALYZER_SOURCES = ('lexer.py', 'parser.py', 'my_ast.py', 'streaming.py', 'datablock.py')
+
+READ_SIZE = 1 << 20
+
+_analyzer_key = None
+
+
+def cache_enabled():
+    return tablecache.cache_enabled(DISABLE_ENV)
+
+
+def cache_dir():
+    """Directorio de la caché de AST (ver tablecache.cache_dir)"""
+    return tablecache.cache_dir(CACHE_ENV, DEFAULT_CACHE_DIR, DISABLE_ENV)
+
+
+def analyzer_key():
+    """Hash del código del analizador y del esquema de nodos (se calcula una vez)"""
+    global _analyzer_key
+    if _analyzer_key is None:
+        digest = hashlib.sha256(astfile.SCHEMA)
+        for name in ANALYZER_SOURCES:
+            digest.update((Path(__file__).parent / name).read_bytes())
+        _analyzer_key = digest.digest()
+    return _analyzer_key
+
+
+def content_key(path):
+    """Hash del contenido de `path` más el del analizador"""
+    digest = hashlib.sha256(analyzer_key())
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(READ_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def entry_path(key):
+    directory = cache_dir()
+    if directory is None:
+        return None
+    return directory / f'{key}.ast'
+
+
+def parse_clean(path):
+    """(programa, limpio): analiza `path` y reporta si lo hizo sin mensajes"""
+    from src.streaming import parse_file
+
+    reported = diagnostics.total
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            program = parse_file(path)
+    finally:
+        # Los mensajes del parser se muestran igual que sin caché
+        sys.stdout.write(output.getvalue())
+    return program, not output.getvalue() and diagnostics.total == reported
+
+
+def store(program, entry):
+    tmp = temp_path(entry)
+    try:
+        astfile.dump(program, tmp)
+        os.replace(tmp, entry)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def load_program(path):
+    """AST de un script: desde la caché si el contenido no cambió, si no lo analiza.
+
+    Devuelve None si el script no se pudo analizar, como parse_file.
+    """
+    entry = entry_path(content_key(path)) if cache_enabled() else None
+    if entry is not None and entry.exists():
+        try:
+            return astfile.load(entry)
+        except (astfile.ASTFormatError, OSError):
+            pass  # entrada corrupta o de otra versión: se reemplaza
+    program, clean = parse_clean(path)
+    if entry is not None and program is not None and clean:
+        store(program, entry)
+    return program
+
+
+def main():
+    args = argparse.ArgumentParser(description="Analiza scripts y guarda sus AST en la caché")
+    args.add_argument('scripts', nargs='+')
+    options = args.parse_args()
+    if cache_dir() is None:
+        sys.exit("Error: la caché de AST está desactivada o no se puede crear el directorio")
+    status = 0
+    for script in options.scripts:
+        try:
+            entry = entry_path(content_key(script))
+        except OSError as e:
+            print(f"{script}: {e.strerror}")
+            status = 1
+            continue
+        if entry.exists():
+            print(f"{script}: ya está en la caché")
+            continue
+        program, clean = parse_clean(script)
+        if program is None or not clean:
+            print(f"{script}: no se guardó (el análisis reportó errores)")
+            status = 1
+            continue
+        store(program, entry)
+        print(f"{script}: {entry}")
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+"""Formato binario compacto para árboles Program.
+
+    8 bytes   firma b'TWAST001'
+    8 bytes   hash del esquema de nodos (clases y campos de src/my_ast.py)
+    5 int64   largo en bytes del cuerpo, cantidad de cadenas, largo del
+              texto de las cadenas, cantidad de floats, largo de los datos crudos
+    varints   largo en bytes de cada cadena
+    UTF-8     texto de las cadenas, una tras otra
+    float64   pool de floats
+    bytes     datos crudos (matrices y DataBlock)
+    varints   cuerpo: el árbol en preorden
+
+El cuerpo es una sola secuencia de enteros sin signo en varint (LEB128), así
+que se codifica y decodifica de una vez con NumPy. Cada valor empieza con su
+tipo:
+
+    NONE, FALSE, TRUE
+    INT       entero en zigzag (hasta 64 bits; los mayores van como BIGINT,
+              su texto en el pool de cadenas)
+    FLOAT     índice en el pool de floats
+    STR       índice en el pool de cadenas (nombres, operadores, ...)
+    NODE      id de la clase, lineno y lexpos como diferencia en zigzag con
+              el nodo anterior más 1 (0 es None) y luego sus campos, en el
+              orden de _fields
+    LIST      largo y los valores
+    INT_ROWS / FLOAT_ROWS
+              filas de números de un literal de matriz: cantidad de filas,
+              largo de cada fila y la posición de los valores (int64 /
+              float64) en los datos crudos
+    BLOCK     un DataBlock: 0 (int64) o 1 (float64), cantidad de valores,
+              filas y posición de los valores y offsets en los datos crudos
+
+Los números crudos van en little-endian. El hash del esquema cambia cuando se
+agrega una clase o un campo, y load rechaza archivos de un esquema anterior.
+"""
+import gc
+import hashlib
+import struct
+
+import numpy as np
+
+from src import my_ast
+from src.datablock import DataBlock
+from src.my_ast import ASTNode
+
+MAGIC = b'TWAST001'
+
+(NONE, FALSE, TRUE, INT, BIGINT, FLOAT, STR, NODE, LIST, INT_ROWS, FLOAT_ROWS, BLOCK) = range(12)
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+HEADER = struct.Struct('<8s8s5q')
+
+# Clases de nodo en orden de definición: su posición es el id en el archivo
+NODE_TYPES = [value for value in vars(my_ast).values()
+              if isinstance(value, type) and issubclass(value, ASTNode) and value is not ASTNode]
+TYPE_IDS = {cls: k for k, cls in enumerate(NODE_TYPES)}
+
+SCHEMA = hashlib.sha256(';'.join(
+    f"{cls.__name__}:{','.join(cls._fields)}" for cls in NODE_TYPES).encode('utf-8')).digest()[:8]
+
+
+class ASTFormatError(Exception):
+    """Archivo que no es un AST serializado con el esquema actual"""
+
+
+def zigzag(n):
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+
+def unzigzag(n):
+    return -((n + 1) >> 1) if n & 1 else n >> 1
+
+
+def encode_varints(values):
+    """Codifica enteros sin signo de hasta 64 bits en LEB128"""
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(values.size, dtype=np.int64)
+    for k in range(1, 10):
+        sizes += values >= np.uint64(1 << (7 * k))
+    starts = np.zeros(values.size, dtype=np.int64)
+    np.cumsum(sizes[:-1], out=starts[1:])
+    out = np.empty(int(sizes.sum()), dtype=np.uint8)
+    for k in range(int(sizes.max()) if values.size else 0):
+        present = sizes > k
+        byte = (values[present] >> np.uint64(7 * k)) & np.uint64(0x7f)
+        byte |= np.where(sizes[present] > k + 1, np.uint64(0x80), np.uint64(0))
+        out[starts[present] + k] = byte
+    return out.tobytes()
+
+
+def decode_varints(data, count=None):
+    """Lista de enteros codificados con encode_varints"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not raw.size:
+        return []
+    if raw.max() < 0x80:
+        return raw.tolist()
+    ends = np.flatnonzero(raw < 0x80)
+    if ends.size == 0 or ends[-1] != raw.size - 1:
+        raise ASTFormatError("Varint incompleto al final de una sección")
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shifts = np.arange(raw.size) - np.repeat(starts, ends - starts + 1)
+    parts = (raw & 0x7f).astype(np.uint64) << (np.uint64(7) * shifts.astype(np.uint64))
+    return np.add.reduceat(parts, starts).tolist()
+
+
+class Encoder:
+    def __init__(self):
+        self.ints = []
+        self.strings = {}
+        self.floats = []
+        self.raw = bytearray()
+        self.lineno = self.lexpos = 0
+
+    def string(self, value):
+        return self.strings.setdefault(value, len(self.strings))
+
+    def value(self, value):
+        ints = self.ints
+        if value is None:
+            ints.append(NONE)
+        elif value is True or value is False:
+            ints.append(TRUE if value else FALSE)
+        elif isinstance(value, ASTNode):
+            self.node(value)
+        elif type(value) is int:
+            if INT64_MIN <= value <= INT64_MAX:
+                ints += (INT, zigzag(value))
+            else:
+                ints += (BIGINT, self.string(str(value)))
+        elif type(value) is float:
+            ints += (FLOAT, len(self.floats))
+            self.floats.append(value)
+        elif isinstance(value, str):
+            ints += (STR, self.string(value))
+        elif isinstance(value, list):
+            self.list(value)
+        elif isinstance(value, DataBlock):
+            self.block(value)
+        else:
+            raise ASTFormatError(f"No se puede serializar un valor {type(value).__name__}")
+
+    def node(self, node):
+        cls = type(node)
+        try:
+            self.ints += (NODE, TYPE_IDS[cls], self.position('lineno', node.lineno),
+                          self.position('lexpos', node.lexpos))
+        except KeyError:
+            raise ASTFormatError(f"{cls.__name__} no es un nodo de src/my_ast.py")
+        for name in cls._fields:
+            self.value(getattr(node, name))
+
+    def position(self, field, value):
+        if value is None:
+            return 0
+        delta = value - getattr(self, field)
+        setattr(self, field, value)
+        return zigzag(delta) + 1
+
+    def list(self, value):
+        kind = numeric_rows(value) if value else None
+        if kind is None:
+            self.ints += (LIST, len(value))
+            for item in value:
+                self.value(item)
+            return
+        self.ints += (INT_ROWS if kind == '<i8' else FLOAT_ROWS, len(value))
+        self.ints += [len(row) for row in value]
+        self.ints.append(self.add_raw(np.array([item for row in value for item in row], dtype=kind)))
+
+    def block(self, block):
+        is_float = block.values.dtype.kind == 'f'
+        values = block.values.astype('<f8' if is_float else '<i8', copy=False)
+        self.ints += (BLOCK, int(is_float), values.size, block.rows, self.add_raw(values),
+                      self.add_raw(block.offsets.astype('<i8', copy=False)))
+
+    def add_raw(self, values):
+        """Agrega un arreglo a los datos crudos (alineado a 8 bytes) y devuelve su posición"""
+        self.raw += bytes(-len(self.raw) % 8)
+        position = len(self.raw)
+        self.raw += values.tobytes()
+        return position
+
+    def finish(self):
+        strings = [string.encode('utf-8') for string in self.strings]
+        body = encode_varints(self.ints)
+        text = b''.join(strings)
+        return b''.join([
+            HEADER.pack(MAGIC, SCHEMA, len(body), len(strings), len(text), len(self.floats), len(self.raw)),
+            encode_varints([len(string) for string in strings]),
+            text,
+            np.array(self.floats, dtype='<f8').tobytes(),
+            bytes(self.raw),
+            body,
+        ])
+
+
+def numeric_rows(value):
+    """'<i8' o '<f8' si value son filas de enteros (int64) o de floats, None si no"""
+    kind = None
+    for row in value:
+        if not isinstance(row, list):
+            return None
+        for item in row:
+            if type(item) is int and INT64_MIN <= item <= INT64_MAX:
+                item_kind = '<i8'
+            elif type(item) is float:
+                item_kind = '<f8'
+            else:
+                return None
+            if kind is None:
+                kind = item_kind
+            elif kind != item_kind:
+                return None
+    return kind
+
+
+def decode(data):
+    if len(data) < HEADER.size:
+        raise ASTFormatError("No es un AST serializado")
+    magic, schema, body_size, string_count, text_size, float_count, raw_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ASTFormatError("No es un AST serializado")
+    if schema != SCHEMA:
+        raise ASTFormatError("El AST se serializó con otra versión de los nodos")
+    body_start = len(data) - body_size
+    raw_start = body_start - raw_size
+    floats_start = raw_start - 8 * float_count
+    text_start = floats_start - text_size
+    if text_start < HEADER.size:
+        raise ASTFormatError("AST serializado truncado")
+
+    view = memoryview(data)
+    lengths = decode_varints(view[HEADER.size:text_start])
+    if len(lengths) != string_count:
+        raise ASTFormatError("AST serializado truncado")
+    strings = []
+    position = text_start
+    for length in lengths:
+        strings.append(str(view[position:position + length], 'utf-8'))
+        position += length
+    floats = np.frombuffer(data, dtype='<f8', count=float_count, offset=floats_start).tolist()
+    ints = decode_varints(view[body_start:])
+    layouts = [(cls, cls._fields) for cls in NODE_TYPES]
+    new = object.__new__
+    pos = 0
+    lineno = lexpos = 0
+
+    def raw(dtype, count, offset):
+        return np.frombuffer(data, dtype=dtype, count=count, offset=raw_start + offset)
+
+    def value():
+        nonlocal pos, lineno, lexpos
+        tag = ints[pos]
+        if tag == NODE:
+            cls, fields = layouts[ints[pos + 1]]
+            line, column = ints[pos + 2], ints[pos + 3]
+            pos += 4
+            node = new(cls)
+            # zigzag(d) + 1 es impar si d >= 0 y par (distinto de 0) si d < 0
+            if line:
+                lineno += line >> 1 if line & 1 else -(line >> 1)
+                node.lineno = lineno
+            else:
+                node.lineno = None
+            if column:
+                lexpos += column >> 1 if column & 1 else -(column >> 1)
+                node.lexpos = lexpos
+            else:
+                node.lexpos = None
+            for name in fields:
+                setattr(node, name, value())
+            return node
+        if tag == STR:
+            pos += 2
+            return strings[ints[pos - 1]]
+        if tag == LIST:
+            count = ints[pos + 1]
+            pos += 2
+            return [value() for _ in range(count)]
+        if tag == INT:
+            pos += 2
+            return unzigzag(ints[pos - 1])
+        if tag == FLOAT:
+            pos += 2
+            return floats[ints[pos - 1]]
+        if tag == NONE or tag == TRUE or tag == FALSE:
+            pos += 1
+            return None if tag == NONE else tag == TRUE
+        if tag == BIGINT:
+            pos += 2
+            return int(strings[ints[pos - 1]])
+        if tag == INT_ROWS or tag == FLOAT_ROWS:
+            rows = ints[pos + 1]
+            counts = ints[pos + 2:pos + 2 + rows]
+            offset = ints[pos + 2 + rows]
+            pos += 3 + rows
+            values = raw('<i8' if tag == INT_ROWS else '<f8', sum(counts), offset).tolist()
+            result = []
+            start = 0
+            for count in counts:
+                result.append(values[start:start + count])
+                start += count
+            return result
+        if tag == BLOCK:
+            is_float, size, rows, values_at, offsets_at = ints[pos + 1:pos + 6]
+            pos += 6
+            # Arreglos de sólo lectura sobre los bytes leídos, sin copiar
+            return DataBlock(raw('<f8' if is_float else '<i8', size, values_at),
+                             raw('<i8', rows + 1, offsets_at))
+        raise ASTFormatError(f"Tipo de valor desconocido {tag} en el entero {pos} del cuerpo")
+
+    # Los nodos nuevos no forman ciclos: el recolector sólo agregaría recorridos
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        result = value()
+    finally:
+        if enabled:
+            gc.enable()
+    if pos != len(ints):
+        raise ASTFormatError("Datos sobrantes después del árbol")
+    return result
+
+
+def dumps(program):
+    """Serializa un árbol (normalmente un Program) a bytes"""
+    encoder = Encoder()
+    encoder.value(program)
+    return encoder.finish()
+
+
+def loads(data):
+    """Reconstruye el árbol serializado con dumps"""
+    try:
+        return decode(data)
+    except (IndexError, UnicodeDecodeError, ValueError) as e:
+        raise ASTFormatError(f"AST serializado inválido o truncado: {e}")
+
+
+def dump(program, path):
+    with open(path, 'wb') as file:
+        file.write(dumps(program))
+
+
+def load(path):
+    with open(path, 'rb') as file:
+        return loads(file.read())
@@ -0,0 +1,156 @@
+"""Análisis en lote de muchos scripts, repartidos entre procesos.
+
+Recibe archivos, directorios (se recorren buscando --pattern) y patrones glob,
+y analiza cada archivo en un ProcessPoolExecutor. Cada proceso arma el lexer y
+el parser una sola vez al iniciar y los reutiliza para todos sus archivos.
+Por cada archivo se escribe una línea JSON, en el orden de la entrada:
+
+    {"path": ..., "status": "ok" | "error" | "failed" | "unreadable",
+     "tokens": N, "errors": [...], "seconds": ...}
+
+"ok" es un análisis sin mensajes, "error" uno que reportó errores léxicos o
+de sintaxis pero produjo un AST (el parser se recupera), "failed" uno sin AST
+o en el que el analizador lanzó una excepción (que queda en "errors"), y
+"unreadable" un archivo que no se pudo leer. Al final se imprime un resumen
+en stderr; el código de salida es 1 si algún archivo no quedó "ok".
+
+Uso:
+    python -m src.batch scripts/ 'entregas/**/*.txt' [--jobs N] [--pattern '*.txt']
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.diagnostics import diagnostics
+
+DEFAULT_PATTERN = '*.txt'
+
+# Lexer y parser de este proceso, creados por init_worker
+_worker = None
+
+
+class CountingLexer:
+    """Entrega los tokens de otro lexer y cuenta cuántos pasaron"""
+
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.count = 0
+
+    def token(self):
+        tok = self.lexer.token()
+        if tok is not None:
+            self.count += 1
+        return tok
+
+
+def init_worker():
+    global _worker
+    from src.lexer import lexer
+    from src.parser import parser
+    _worker = (lexer.clone(), parser)
+
+
+def analyze_file(path):
+    """Resultado del análisis de un archivo, como diccionario listo para JSON"""
+    from src.streaming import StreamingLexer
+
+    if _worker is None:
+        init_worker()
+    base_lexer, parser = _worker
+    result = {'path': str(path), 'status': 'ok', 'tokens': 0, 'errors': [], 'seconds': 0.0}
+    output = io.StringIO()
+    diagnostics.clear()
+    start = time.perf_counter()
+    try:
+        lexer = CountingLexer(StreamingLexer(path, lexer=base_lexer))
+    except (OSError, UnicodeDecodeError) as e:
+        result.update(status='unreadable', errors=[str(e)])
+        return result
+    try:
+        with contextlib.redirect_stdout(output):
+            program = parser.parse(lexer=lexer)
+    except UnicodeDecodeError as e:
+        result.update(status='unreadable', errors=[str(e)])
+        return result
+    except Exception as e:
+        # Un error inesperado del analizador no detiene el resto del lote
+        errors = output.getvalue().splitlines()
+        result.update(status='failed', errors=errors + [f"{type(e).__name__}: {e}"])
+        return result
+    finally:
+        lexer.lexer.close()
+        result['seconds'] = round(time.perf_counter() - start, 6)
+        result['tokens'] = lexer.count
+    errors = output.getvalue().splitlines()
+    errors += [str(record) for record in diagnostics.errors if record.message not in errors]
+    result['errors'] = errors
+    if program is None:
+        result['status'] = 'failed'
+    elif errors:
+        result['status'] = 'error'
+    return result
+
+
+def expand(inputs, pattern=DEFAULT_PATTERN):
+    """Archivos de la entrada, sin repetir y en orden"""
+    seen = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found = sorted(p for p in path.rglob(pattern) if p.is_file())
+        elif path.exists() or not glob.has_magic(item):
+            found = [path]
+        else:
+            found = sorted(Path(p) for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        for file in found:
+            if file not in seen:
+                seen.add(file)
+                yield file
+
+
+def analyze_all(paths, jobs=None):
+    """Resultados de analyze_file para cada ruta, en orden; en paralelo si jobs != 1"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        yield from map(analyze_file, paths)
+        return
+    jobs = min(jobs, len(paths))
+    # Bloques de varios archivos por envío: con miles de scripts chicos el
+    # costo de comunicación entre procesos pesa más que el análisis
+    chunksize = max(1, min(64, len(paths) // (jobs * 8)))
+    with ProcessPoolExecutor(jobs, initializer=init_worker) as executor:
+        yield from executor.map(analyze_file, paths, chunksize=chunksize)
+
+
+def main():
+    args = argparse.ArgumentParser(description="Analiza scripts en paralelo y reporta cada uno como JSON")
+    args.add_argument('inputs', nargs='+', help="archivos, directorios o patrones glob")
+    args.add_argument('--jobs', '-j', type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    args.add_argument('--pattern', default=DEFAULT_PATTERN, help="archivos a buscar en los directorios")
+    options = args.parse_args()
+
+    paths = list(expand(options.inputs, options.pattern))
+    if not paths:
+        sys.exit("Error: no se encontraron archivos")
+    start = time.perf_counter()
+    counts = {}
+    tokens = 0
+    for result in analyze_all(paths, options.jobs):
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        tokens += result['tokens']
+    elapsed = time.perf_counter() - start
+    summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items()))
+    print(f"{len(paths)} archivos ({summary}), {tokens} tokens en {elapsed:.2f} s", file=sys.stderr)
+    sys.exit(0 if counts.get('ok', 0) == len(paths) else 1)
+
+
+if __name__ == '__main__':
+    main()
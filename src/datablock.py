@@ -0,0 +1,116 @@
+"""Bloques de datos numéricos `[a, b; c, d]` en arreglos tipados.
+
+Un literal formado sólo por números separados por comas (columnas) y punto y
+coma (filas) se convierte de una vez en un DataBlock: un arreglo NumPy plano
+(int64 si todos los números son enteros, float64 si no) más los offsets que
+delimitan cada fila, sin crear un token ni un nodo del AST por número. Las
+filas pueden tener largos distintos, como las celdas de un twoWayModel.
+Un bloque con enteros que pueden no caber en int64 se deja a los tokens.
+"""
+import re
+
+import numpy as np
+
+# Mismos números que t_LIT_INT / t_LIT_FLOAT
+NUMBER = r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?'
+# Un valor: el número entre espacios y luego una coma, un punto y coma o el final
+FIELD = rf'[ \t\r\n]*{NUMBER}[ \t\r\n]*(?:[,;]|\Z)'
+# El bloque se valida sin repetir un grupo por número (el motor de expresiones
+# guardaría un punto de retroceso por cada uno: cientos de MB con millones de
+# valores): sólo tiene caracteres válidos, empieza con un valor y después de
+# cada separador viene otro. Las clases de caracteres repetidas no guardan nada.
+BLOCK_CHARS = re.compile(r'[-.0-9,; \t\r\n]*')
+FIRST_FIELD = re.compile(FIELD)
+BAD_FIELD = re.compile(rf'[,;](?!{FIELD})')
+
+# Entero de 19 cifras o más: puede no caber en int64 (np.fromstring lo satura)
+LONG_INTEGER = re.compile(r'[0-9]{19}')
+
+# Inicio de un posible bloque: '[' seguido (tras espacios) de un número
+BLOCK_START = re.compile(r'\[[ \t\r\n]*-?[0-9]')
+
+
+class DataBlock:
+    def __init__(self, values, offsets):
+        self.values = values
+        self.offsets = offsets
+
+    @property
+    def rows(self):
+        return self.offsets.size - 1
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets)
+
+    @property
+    def is_rectangular(self):
+        counts = self.counts
+        return counts.size == 0 or bool(np.all(counts == counts[0]))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        i = int(i)
+        if not 0 <= i < self.rows:
+            raise IndexError(f"Fila {i} fuera de un bloque con {self.rows} filas")
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        return (self[i] for i in range(self.rows))
+
+    def __array__(self, dtype=None, copy=None):
+        if not self.is_rectangular:
+            raise ValueError("Un bloque con filas de distinto largo no es una matriz")
+        cols = int(self.counts[0]) if self.rows else 0
+        array = self.values.reshape(self.rows, cols)
+        return array.astype(dtype) if dtype is not None else array
+
+    def tolist(self):
+        return [row.tolist() for row in self]
+
+    def __repr__(self):
+        return f"DataBlock({self.rows} filas, n={self.values.size}, {self.values.dtype})"
+
+    def __str__(self):
+        return str(self.tolist())
+
+
+def is_block_body(body):
+    """Indica si body son números separados por comas y puntos y coma"""
+    return (BLOCK_CHARS.fullmatch(body) is not None and FIRST_FIELD.match(body) is not None
+            and BAD_FIELD.search(body) is None)
+
+
+def parse_block(body):
+    """Convierte el texto entre corchetes en un DataBlock, o None si no es un bloque de números"""
+    if (',' not in body and ';' not in body) or not is_block_body(body):
+        return None
+    dtype = np.float64 if '.' in body else np.int64
+    if dtype is np.int64 and LONG_INTEGER.search(body) is not None:
+        return None  # los tokens dan el entero exacto de Python
+    # Ya validado: todos los números se convierten en una sola llamada y el
+    # largo de cada fila sale de contar sus comas
+    values = np.fromstring(body.replace(';', ','), dtype=dtype, sep=',')
+    counts = [row.count(',') + 1 for row in body.split(';')]
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return DataBlock(values, offsets)
+
+
+def scan_block(text, position):
+    """Reconoce un bloque que empieza con '[' en text[position].
+
+    Devuelve (DataBlock, posición después de ']') o None si en esa posición no
+    hay un bloque de números completo.
+    """
+    if BLOCK_START.match(text, position) is None:
+        return None
+    close = text.find(']', position)
+    if close == -1:
+        return None
+    block = parse_block(text[position + 1:close])
+    if block is None:
+        return None
+    return block, close + 1
@@ -0,0 +1,138 @@
+"""Colector de diagnósticos del analizador.
+
+Las acciones de la gramática y el arranque reportan aquí en lugar de imprimir.
+Cada reporte guarda el mensaje como plantilla más sus argumentos y sólo se
+formatea al leerlo o mostrarlo, así que en modo producción (el predeterminado)
+los mensajes de depuración se descartan sin convertir a texto los datos que
+llevan (p. ej. matrices enteras).
+
+Niveles (como en logging): DEBUG < INFO < WARNING < ERROR. `level` es el
+mínimo que se guarda y `echo` el mínimo que además se imprime al reportarse.
+La variable de entorno TALLER_DIAGNOSTICS elige el modo al importar:
+'production' (guarda WARNING, imprime ERROR) o un nivel ('debug', 'info',
+...), que guarda e imprime desde ese nivel.
+
+Cada colector guarda a lo sumo MAX_RECORDS reportes (los más recientes), para
+que un proceso largo como el editor no acumule mensajes sin límite; `total`
+cuenta todos los guardados.
+
+`diagnostics.scope()` desvía los reportes del contexto actual (un hilo o una
+tarea de asyncio) a un colector propio, para analizar varios programas a la
+vez sin mezclar sus mensajes.
+"""
+import collections
+import contextlib
+import contextvars
+import os
+import sys
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+MODE_ENV = 'TALLER_DIAGNOSTICS'
+MAX_RECORDS = 1000
+
+# Colector que reemplaza al global en el contexto actual (ver DiagnosticSink.scope)
+_scoped = contextvars.ContextVar('taller_diagnostics', default=None)
+
+
+class Diagnostic:
+    __slots__ = ('level', 'template', 'args', 'lineno')
+
+    def __init__(self, level, template, args, lineno=None):
+        self.level = level
+        self.template = template
+        self.args = args
+        self.lineno = lineno
+
+    @property
+    def message(self):
+        return self.template.format(*self.args) if self.args else self.template
+
+    def __str__(self):
+        where = f" (línea {self.lineno})" if self.lineno is not None else ""
+        return f"{LEVEL_NAMES.get(self.level, self.level)}: {self.message}{where}"
+
+    def __repr__(self):
+        return f"Diagnostic({LEVEL_NAMES.get(self.level, self.level)}, {self.template!r})"
+
+
+class DiagnosticSink:
+    def __init__(self, level=WARNING, echo=ERROR, stream=None, limit=MAX_RECORDS):
+        self.level = level
+        self.echo = echo
+        self.stream = stream
+        self.records = collections.deque(maxlen=limit)
+        self.total = 0  # reportes guardados, incluidos los que ya se descartaron
+
+    def enabled(self, level):
+        return level >= self.level or level >= self.echo
+
+    def report(self, level, template, *args, lineno=None):
+        scoped = _scoped.get()
+        if scoped is not None and scoped is not self:
+            scoped.report(level, template, *args, lineno=lineno)
+            return
+        if level < self.level and level < self.echo:
+            return
+        record = Diagnostic(level, template, args, lineno)
+        if level >= self.level:
+            self.records.append(record)
+            self.total += 1
+        if level >= self.echo:
+            print(record.message, file=self.stream or sys.stdout)
+
+    def debug(self, template, *args, lineno=None):
+        self.report(DEBUG, template, *args, lineno=lineno)
+
+    def info(self, template, *args, lineno=None):
+        self.report(INFO, template, *args, lineno=lineno)
+
+    def warning(self, template, *args, lineno=None):
+        self.report(WARNING, template, *args, lineno=lineno)
+
+    def error(self, template, *args, lineno=None):
+        self.report(ERROR, template, *args, lineno=lineno)
+
+    @property
+    def errors(self):
+        return [record for record in self.records if record.level >= ERROR]
+
+    def clear(self):
+        self.records.clear()
+
+    @contextlib.contextmanager
+    def scope(self, echo=True):
+        """Colector nuevo para los reportes de este contexto mientras dure el with.
+
+        Con echo=False no imprime nada; los mensajes quedan en sus records.
+        """
+        sink = DiagnosticSink(self.level, self.echo if echo else float('inf'), self.stream, self.records.maxlen)
+        token = _scoped.set(sink)
+        try:
+            yield sink
+        finally:
+            _scoped.reset(token)
+
+    def configure(self, mode):
+        """Modo 'production' o nombre de nivel ('debug', 'info', 'warning', 'error')"""
+        if mode == 'production':
+            self.level, self.echo = WARNING, ERROR
+            return
+        levels = {name.lower(): value for value, name in LEVEL_NAMES.items()}
+        if mode not in levels:
+            raise ValueError(f"Modo de diagnóstico desconocido: '{mode}'")
+        self.level = self.echo = levels[mode]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+
+diagnostics = DiagnosticSink()
+diagnostics.configure(os.environ.get(MODE_ENV, 'production').lower())
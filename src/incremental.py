@@ -0,0 +1,159 @@
+"""Tokenización incremental por líneas para el editor.
+
+Se guarda la lista de tokens de cada línea y si la línea empieza en un estado
+"limpio": fuera de cualquier token y precedida sólo por espacios o comentarios
+de línea, de modo que tokenizar desde ahí da lo mismo que tokenizar todo el
+texto. Tras una edición sólo se vuelve a tokenizar desde la última línea
+limpia anterior al cambio y se sincroniza en la primera línea posterior al
+cambio que empieza limpia tanto en el texto nuevo como en el anterior: desde
+ahí el texto es idéntico y los tokens viejos siguen siendo válidos.
+
+Una comilla que no formó una cadena hace que el lexer examine el texto hasta el
+final (buscando la comilla de cierre), así que cualquier edición posterior
+puede cambiar cómo se tokeniza; esas líneas se marcan y el reanálisis empieza
+antes de la primera de ellas.
+"""
+from src.diagnostics import diagnostics
+from src.lexer import lexer as base_lexer
+
+QUOTES = ('"', "'")
+
+
+def is_blank_gap(gap):
+    """True si el texto entre dos tokens sólo tiene espacios y comentarios de línea"""
+    for segment in gap.split('\n'):
+        segment = segment.strip(' \t')
+        if segment and not segment.startswith('#'):
+            return False
+    return True
+
+
+class LineChange:
+    """Los tokens de las líneas `old` desde `start` se reemplazaron por los de `lines`"""
+
+    def __init__(self, start, old, lines):
+        self.start = start
+        self.old = old
+        self.lines = lines
+
+    @property
+    def removed(self):
+        return len(self.old)
+
+    @property
+    def delta(self):
+        return len(self.lines) - len(self.old)
+
+    def __repr__(self):
+        return f"LineChange(start={self.start}, removed={self.removed}, added={len(self.lines)})"
+
+
+class IncrementalLexer:
+    def __init__(self, lexer=None):
+        self._lexer = (lexer or base_lexer).clone()
+        # Los bloques de datos dependen de dónde está el ']' de cierre, quizá
+        # muchas líneas más abajo: el editor muestra un token por número
+        self._lexer.data_blocks = False
+        self.lines = []    # texto de cada línea, sin el salto de línea
+        self.tokens = []   # por línea: lista de (tipo, valor, columna, largo)
+        self.clean = []    # por línea: True si se puede tokenizar desde su inicio
+        self.stray = []    # por línea: True si tiene una comilla que no formó cadena
+
+    def update(self, text, checkpoint=None):
+        """Actualiza el estado con el texto completo nuevo y devuelve un LineChange.
+
+        Si se da, checkpoint() se llama en cada token y puede lanzar una
+        excepción para abortar; en ese caso el estado queda como estaba.
+        """
+        new_lines = text.split('\n')
+        old_lines = self.lines
+
+        # Región dañada: prefijo y sufijo de líneas comunes
+        limit = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        if prefix == len(old_lines) == len(new_lines):
+            return LineChange(prefix, [], [])
+        suffix = 0
+        while (suffix < limit - prefix
+               and old_lines[-1 - suffix] == new_lines[-1 - suffix]):
+            suffix += 1
+
+        # Se reanuda en la última línea limpia anterior al cambio (o a la
+        # primera comilla suelta, cuyo resultado depende del resto del texto)
+        start = min(prefix, len(new_lines) - 1)
+        try:
+            start = self.stray.index(True, 0, start + 1)
+        except ValueError:
+            pass
+        while start > 0 and not self.clean[start]:
+            start -= 1
+
+        damage_end = len(new_lines) - suffix   # primera línea nueva sin cambios
+        shift = len(new_lines) - len(old_lines)
+        # Se reanaliza en cada edición: los errores léxicos no se acumulan en el colector global
+        with diagnostics.scope():
+            tokens, clean, stray, resync = self._lex(new_lines, start, damage_end, shift, checkpoint)
+
+        old_end = resync - shift if resync is not None else len(old_lines)
+        change = LineChange(start, self.tokens[start:old_end], tokens)
+        self.lines = new_lines
+        self.tokens[start:old_end] = tokens
+        self.clean[start:old_end] = clean
+        self.stray[start:old_end] = stray
+        return change
+
+    def _lex(self, lines, start, damage_end, shift, checkpoint):
+        """Tokeniza desde la línea `start` hasta sincronizar con el estado anterior.
+
+        Devuelve (tokens, limpieza y comillas sueltas por línea, línea de
+        sincronización o None si se llegó al final del texto).
+        """
+        text = '\n'.join(lines[start:])
+        lexer = self._lexer
+        lexer.input(text)
+        lexer.lineno = start + 1
+
+        tokens = [[]]
+        clean = [True]
+        stray = [False]
+        line = start            # línea actual (absoluta)
+        line_start = 0          # offset de la línea actual dentro de `text`
+        next_start = len(lines[start]) + 1 if start + 1 < len(lines) else None
+        prev_end = 0            # fin del último token
+        prev_line = start       # línea en la que terminó el último token
+
+        def advance_to(position, inside_token):
+            """Avanza las líneas cuyo inicio es <= position; devuelve la línea de sincronización"""
+            nonlocal line, line_start, next_start
+            while next_start is not None and next_start <= position:
+                line += 1
+                line_start = next_start
+                next_start = line_start + len(lines[line]) + 1 if line + 1 < len(lines) else None
+                is_clean = not inside_token and is_blank_gap(text[prev_end:line_start])
+                if (line >= damage_end and is_clean
+                        and 0 <= line - shift < len(self.clean) and self.clean[line - shift]):
+                    return line
+                tokens.append([])
+                clean.append(is_clean)
+                stray.append(False)
+            return None
+
+        while True:
+            if checkpoint is not None:
+                checkpoint()
+            tok = lexer.token()
+            position = len(text) if tok is None else tok.lexpos
+            if any(quote in text[prev_end:position] for quote in QUOTES):
+                stray[prev_line - start] = True
+            resync = advance_to(position, False)
+            if tok is None or resync is not None:
+                return tokens, clean, stray, resync
+            tokens[-1].append((tok.type, tok.value, tok.lexpos - line_start, lexer.lexpos - tok.lexpos))
+            # Las líneas que empiezan dentro del token no son limpias
+            resync = advance_to(lexer.lexpos - 1, True)
+            if resync is not None:
+                return tokens, clean, stray, resync
+            prev_end = lexer.lexpos
+            prev_line = line
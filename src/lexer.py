@@ -1,6 +1,12 @@
+import importlib.util
+import sys
+
 import ply.lex as lex
 from ply.lex import TOKEN
 
+from src import tablecache
+from src.diagnostics import diagnostics
+
 # Lista de tokens
 tokens = [
     # Literales
@@ -24,7 +30,10 @@ tokens = [
     # Delimitadores
     'L_PARENTESIS', 'R_PARENTESIS', 'L_LLAVE', 'R_LLAVE',
     'L_CORCHETE', 'R_CORCHETE', 'COMA', 'PUNTO_COMA',
-    'PUNTO', 'DOS_PUNTOS'
+    'PUNTO', 'DOS_PUNTOS',
+
+    # Bloque de datos numéricos [a, b; c, d] ya convertido (ver t_DATA_BLOCK)
+    'DATA_BLOCK'
 ]
 
 # Palabras reservadas
@@ -161,6 +170,25 @@ def t_R_LLAVE(t):
     t.type = 'R_LLAVE'
     return t
 
+# Bloque de datos: '[' seguido de un número. Si lo que sigue hasta ']' son sólo
+# números separados por ',' y ';', se convierte de una vez en un DataBlock
+# (un solo token en lugar de uno por número); si no, es un '[' común. Un
+# lexer con `data_blocks = False` (el del editor) entrega siempre los números.
+def t_DATA_BLOCK(t):
+    r'\[(?=[ \t\r\n]*-?[0-9])'
+    scanned = None
+    if getattr(t.lexer, 'data_blocks', True):
+        # src.datablock carga NumPy: recién con el primer bloque, no al importar el lexer
+        from src.datablock import scan_block
+        scanned = scan_block(t.lexer.lexdata, t.lexpos)
+    if scanned is None:
+        t.type = 'L_CORCHETE'
+        return t
+    t.value, end = scanned
+    t.lexer.lineno += t.lexer.lexdata.count('\n', t.lexpos, end)
+    t.lexer.lexpos = end
+    return t
+
 def t_L_CORCHETE(t):
     r'\['
     t.type = 'L_CORCHETE'
@@ -234,11 +262,12 @@ def t_ComentarioDocumentacion(t):
 # Errores
 def t_E_NUM_START_ZERO(t):
     r'0[0-9]+'
-    print(f"Error léxico en línea {t.lineno}: Número inválido '{t.value}'")
+    diagnostics.error("Error léxico en línea {}: Número inválido '{}'", t.lineno, t.value, lineno=t.lineno)
 
 def t_E_ID_START_DIGIT(t):
     r'[0-9]+[A-Za-zÑñ_ÁÉÍÓÚáéíóúÜü][A-Za-zÑñ_ÁÉÍÓÚáéíóúÜü0-9]*'
-    print(f"ERROR LÉXICO (Línea {t.lineno}): Identificador no puede comenzar con dígitos: '{t.value}'")
+    diagnostics.error("ERROR LÉXICO (Línea {}): Identificador no puede comenzar con dígitos: '{}'",
+                      t.lineno, t.value, lineno=t.lineno)
     t.lexer.skip(len(t.value))  # Saltar todos los caracteres del identificador inválido
     return None  # No retornar token
 
@@ -252,17 +281,58 @@ def t_newline(t):
 
 # Manejo de errores
 def t_error(t):
-    print(f"Carácter ilegal '{t.value[0]}' en línea {t.lineno}")
+    diagnostics.error("Carácter ilegal '{}' en línea {}", t.value[0], t.lineno, lineno=t.lineno)
     t.lexer.skip(1)
 
 def t_E_SIMB_NOT_FOUND(t):
     r'[^\w\s]'  # Más restrictivo que antes
     # Verificar si ya fue capturado por otras reglas
     if t.value in {'+', '-', '*', '/', '%', '^', '~', '<', '>', '=', '!', '&', '|'}:
-        print(f"ERROR INTERNO: Operador '{t.value}' no debió llegar aquí")
+        diagnostics.error("ERROR INTERNO: Operador '{}' no debió llegar aquí", t.value, lineno=t.lineno)
         t.lexer.skip(1)
         return None
-    print(f"ERROR: Símbolo no permitido '{t.value}' en línea {t.lineno}")
+    diagnostics.error("ERROR: Símbolo no permitido '{}' en línea {}", t.value, t.lineno, lineno=t.lineno)
     t.lexer.skip(1)
+def _lexer_signature():
+    """Firma de las reglas del lexer: nombres, expresiones regulares y tokens"""
+    parts = [' '.join(tokens), t_ignore]
+    for name, rule in globals().items():
+        if name.startswith('t_') and name != 't_ignore':
+            parts.append(name)
+            parts.append(getattr(rule, 'regex', None) or rule.__doc__ if callable(rule) else rule)
+    return tablecache.signature_key(*parts)
+
+def _load_lextab(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def build_lexer():
+    """Construye el lexer en modo optimizado usando la tabla generada en la caché.
+
+    La primera vez se valida y compila el lexer normalmente y se serializa su
+    tabla (expresión regular maestra incluida) en un módulo generado; en los
+    arranques siguientes se carga ese módulo sin volver a validar las reglas.
+    """
+    module = sys.modules[__name__]
+    path = tablecache.table_path('lextab', _lexer_signature(), '.py')
+    if path is None:
+        return lex.lex(module=module)
+    if path.exists():
+        try:
+            return lex.lex(module=module, optimize=True, lextab=_load_lextab(path))
+        except (ImportError, SyntaxError, KeyError):
+            pass  # Tabla corrupta o incompatible: se regenera
+
+    built = lex.lex(module=module)
+    tmp = tablecache.temp_path(path)
+    try:
+        built.writetab(tmp.stem, str(tmp.parent))
+    except OSError:
+        return built
+    tablecache.publish(tmp, path)
+    return built
+
 # Construir el lexer
-lexer = lex.lex()
\ No newline at end of file
+lexer = build_lexer()
\ No newline at end of file
@@ -11,19 +11,19 @@ def configure_paths():
     sys.path.append(str(taller_path / "interfaz"))
     sys.path.append(str(taller_path / "src"))
 
-    # Verificación (opcional para debug)
-    print("Paths configurados:")
-    for p in sys.path:
-        print(p)
+    # Verificación (sólo con TALLER_DIAGNOSTICS=debug)
+    from src.diagnostics import diagnostics
+    diagnostics.debug("Paths configurados:\n{}", "\n".join(sys.path))
 
 configure_paths()
 
 
 def run_cli():
     """Versión de línea de comandos"""
-    from lexer import lexer
-    from parser import parser
-    
+    from src.analyzer import new_analyzer
+
+    # Cada entrada se analiza desde la línea 1 con un lexer y parser propios
+    analyzer = new_analyzer()
     print("Analizador CLI - Ingrese código (Ctrl+C para salir)")
     while True:
         try:
@@ -32,14 +32,15 @@ def run_cli():
                 continue
                 
             # Análisis léxico
-            lexer.input(code)
             print("\nTokens:")
-            for tok in lexer:
+            for tok in analyzer.tokenize(code):
                 print(f"{tok.type:15}: {tok.value}")
                 
             # Análisis sintáctico
-            result = parser.parse(code)
-            print("\nAST:", result)
+            result = analyzer.parse(code)
+            for error in result.errors:
+                print(error)
+            print("\nAST:", result.program)
             
         except KeyboardInterrupt:
             print("\nSaliendo...")
@@ -47,6 +48,36 @@ def run_cli():
         except Exception as e:
             print(f"Error: {e}")
 
+def run_file(path):
+    """Ejecuta un programa completo con el intérprete"""
+    from src.astcache import load_program
+    from visitors.interpreter import run, InterpreterError
+    from visitors.optimizer import optimize
+    from visitors.semantic import check, SemanticError
+
+    # El archivo se lee por bloques; los datos numéricos van directo a arreglos.
+    # Si el script no cambió desde la última vez, el AST sale de la caché
+    program = load_program(path)
+    if program is None:
+        print("No se pudo analizar el programa")
+        return
+    program = optimize(program)
+    # Tipos y formas se validan una vez, antes de ejecutar nada
+    try:
+        table = check(program)
+    except SemanticError as e:
+        for message in e.messages():
+            print(message)
+        return
+    # Lo que sólo falla si se llega a esa rama o ciclo no impide ejecutar
+    for message in table.messages():
+        print(message)
+    try:
+        # Los archivos de modelos se buscan junto al script, no en el directorio actual
+        run(program, base_dir=str(Path(path).resolve().parent))
+    except InterpreterError as e:
+        print(f"Error de ejecución: {e}")
+
 def run_gui():
     """Versión gráfica"""
     try:
@@ -62,4 +93,7 @@ def run_gui():
         raise
 
 if __name__ == "__main__":
-    run_gui() 
\ No newline at end of file
+    if len(sys.argv) > 1:
+        run_file(sys.argv[1])
+    else:
+        run_gui() 
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""Archivos binarios de datos para twoWayModel.
+
+`twoWayModel m["datos.twm"];` enlaza el modelo a un archivo con este formato
+(enteros little-endian); una ruta relativa es relativa a la carpeta del script:
+
+    8 bytes   firma b'TWMODEL1'
+    int64     filas
+    int64     columnas
+    int64     n (cantidad de observaciones)
+    int64     offsets de celda [filas * columnas + 1]
+    float64   observaciones [n], en orden fila-mayor de celdas
+
+Es el mismo esquema valores + offsets que usa TwoWayModel en memoria, así que
+el archivo se abre con numpy.memmap sin copiar ni leer los datos: cargar un
+modelo cuesta lo mismo con 1 KB que con cientos de MB.
+
+Para convertir un modelo declarado como texto:
+
+    python -m src.modelfile script.txt modeloY datos.twm
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from src.twoway import ModelError, TwoWayModel
+
+MAGIC = b'TWMODEL1'
+HEADER = np.dtype([('magic', 'S8'), ('rows', '<i8'), ('cols', '<i8'), ('size', '<i8')])
+
+
+def save_model(model, path):
+    """Escribe el modelo en `path` con el formato binario"""
+    header = np.array([(MAGIC, model.rows, model.cols, model.size)], dtype=HEADER)
+    with open(path, 'wb') as file:
+        file.write(header.tobytes())
+        file.write(model.offsets.astype('<i8', copy=False).tobytes())
+        file.write(model.values.astype('<f8', copy=False).tobytes())
+
+
+def load_model(path, base_dir=None):
+    """Abre el archivo como TwoWayModel respaldado por memmap (sólo lectura).
+
+    Una ruta relativa se busca desde `base_dir` (la carpeta del script), si se da.
+    """
+    if base_dir is not None:
+        path = os.path.join(base_dir, path)  # una ruta absoluta queda igual
+    try:
+        header = np.fromfile(path, dtype=HEADER, count=1)
+    except OSError as e:
+        raise ModelError(f"No se pudo abrir '{path}': {e.strerror}")
+    if header.size != 1 or header['magic'][0] != MAGIC:
+        raise ModelError(f"'{path}' no es un archivo de twoWayModel")
+    rows, cols, size = (int(header[field][0]) for field in ('rows', 'cols', 'size'))
+    ncells = rows * cols + 1
+    expected = HEADER.itemsize + 8 * ncells + 8 * size
+    try:
+        offsets = np.memmap(path, dtype='<i8', mode='r', offset=HEADER.itemsize, shape=(ncells,))
+        values = np.memmap(path, dtype='<f8', mode='r', offset=HEADER.itemsize + 8 * ncells, shape=(size,))
+    except ValueError:
+        raise ModelError(f"'{path}' está truncado: se esperaban {expected} bytes")
+    # Los offsets delimitan las celdas dentro de values: empiezan en 0, no bajan y terminan en n
+    if offsets[0] != 0 or offsets[-1] != size or np.any(np.diff(offsets) < 0):
+        raise ModelError(f"'{path}' tiene offsets de celda inválidos")
+    return TwoWayModel(rows, cols, values, offsets)
+
+
+def export_model(script, name, path):
+    """Evalúa las declaraciones de `name` en el script y guarda el modelo resultante"""
+    from src.my_ast import Declaration, MatrixDeclaration
+    from src.streaming import parse_file
+    from visitors.interpreter import Interpreter, InterpreterError
+
+    program = parse_file(script)
+    if program is None:
+        raise ModelError(f"No se pudo analizar '{script}'")
+    interpreter = Interpreter()
+    declarations = [
+        statement for statement in program.statements
+        if (isinstance(statement, MatrixDeclaration) and statement.name == name)
+        or (isinstance(statement, Declaration) and statement.identifier == name)
+    ]
+    if not declarations:
+        raise ModelError(f"'{script}' no declara '{name}'")
+    try:
+        for statement in declarations:
+            interpreter.visit(statement)
+    except InterpreterError as e:
+        raise ModelError(str(e))
+    model = interpreter.globals.get(name)
+    if not isinstance(model, TwoWayModel):
+        raise ModelError(f"'{name}' no es un twoWayModel")
+    save_model(model, path)
+    return model
+
+
+def main():
+    args = argparse.ArgumentParser(description="Exporta un twoWayModel declarado como texto a un archivo binario")
+    args.add_argument('script')
+    args.add_argument('name')
+    args.add_argument('output')
+    options = args.parse_args()
+    try:
+        model = export_model(options.script, options.name, options.output)
+    except ModelError as e:
+        sys.exit(f"Error: {e}")
+    print(f"{options.name}: {model.rows}x{model.cols}, {model.size} observaciones -> {options.output}")
+    print(f'Declaración: twoWayModel {options.name}["{options.output}"];')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,85 @@
+from operator import attrgetter
+
+
 class ASTNode:
-    """Clase base para todos los nodos del AST"""
+    """Clase base para todos los nodos del AST.
+
+    Los nodos usan __slots__ para no llevar un __dict__ por instancia; cada
+    subclase declara sus campos en __slots__ y `_fields` los reúne (sin la
+    posición) en orden de declaración. Los campos listados en `_attributes`
+    son datos del nodo (nombres, operadores); el resto, en `_children`, son
+    hijos: nodos, listas de nodos o None. children() devuelve los hijos en
+    ese orden (el hijo i es el campo _children[i]) con un attrgetter armado
+    al definir la clase, sin recorrer atributos en cada llamada.
+    """
+    __slots__ = ('lineno', 'lexpos')
+    _fields = ()
+    _attributes = ()
+    _children = ()
+
     def __init__(self, lineno=None, lexpos=None):
         self.lineno = lineno
         self.lexpos = lexpos
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = []
+        attributes = set()
+        for klass in reversed(cls.__mro__):
+            attributes.update(klass.__dict__.get('_attributes', ()))
+            for name in klass.__dict__.get('__slots__', ()):
+                if name not in ASTNode.__slots__ and name not in fields:
+                    fields.append(name)
+        cls._fields = tuple(fields)
+        cls._children = tuple(name for name in fields if name not in attributes)
+        cls._get_children = staticmethod(children_getter(cls._children))
+
+    def fields(self):
+        """Pares (campo, valor) del nodo, sin lineno/lexpos"""
+        return [(name, getattr(self, name)) for name in self._fields]
+
+    def children(self):
+        """Tupla con los valores de los campos hijos, en el orden de _children"""
+        return self._get_children(self)
     
     def accept(self, visitor):
         """Método para implementar el patrón Visitor"""
-        method_name = 'visit_' + self.__class__.__name__.lower()
-        visitor_method = getattr(visitor, method_name, visitor.generic_visit)
-        return visitor_method(self)
+        return visitor._dispatch[self.__class__](visitor, self)
+
+
+def children_getter(names):
+    if not names:
+        return lambda node: ()
+    if len(names) == 1:
+        # attrgetter con un solo nombre devuelve el valor, no una tupla
+        get = attrgetter(names[0])
+        return lambda node: (get(node),)
+    return attrgetter(*names)
+
+ASTNode._get_children = staticmethod(children_getter(()))
+
+
+def walk(node):
+    """Recorre en profundidad los nodos bajo node (un nodo o una lista de nodos)"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ASTNode):
+            yield node
+            stack.extend(node.children())
+        elif isinstance(node, list):
+            stack.extend(node)
 
 # ------------------------- Declaraciones -------------------------
 class Program(ASTNode):
+    __slots__ = ('statements',)
     def __init__(self, statements):
         super().__init__()
         self.statements = statements
 
 class Declaration(ASTNode):
+    __slots__ = ('type', 'identifier', 'value')
+    _attributes = ('type', 'identifier')
     def __init__(self, type_specifier, identifier, value=None):
         super().__init__()
         self.type = type_specifier
@@ -24,17 +87,22 @@ class Declaration(ASTNode):
         self.value = value
 
 class Assignment(ASTNode):
+    __slots__ = ('identifier', 'expression')
     def __init__(self, identifier, expression):
         super().__init__()
         self.identifier = identifier
         self.expression = expression
 class ArrayAssignment(ASTNode):
+    __slots__ = ('array_name', 'index', 'values')
     def __init__(self, array_name, index, values):
+        super().__init__()
         self.array_name = array_name
         self.index = index
         self.values = values
             
 class FunctionDeclaration(ASTNode):
+    __slots__ = ('name', 'params', 'body')
+    _attributes = ('name',)
     def __init__(self, name, params, body):
         super().__init__()
         self.name = name
@@ -42,6 +110,8 @@ class FunctionDeclaration(ASTNode):
         self.body = body
 
 class Parameter(ASTNode):
+    __slots__ = ('type', 'identifier')
+    _attributes = ('type', 'identifier')
     def __init__(self, type_specifier, identifier):
         super().__init__()
         self.type = type_specifier
@@ -49,6 +119,7 @@ class Parameter(ASTNode):
 
 # ------------------------- Estructuras de Control -------------------------
 class IfStatement(ASTNode):
+    __slots__ = ('condition', 'true_block', 'false_block', 'elif_blocks')
     def __init__(self, condition, true_block, false_block=None, elif_blocks=None):
         super().__init__()
         self.condition = condition
@@ -57,18 +128,21 @@ class IfStatement(ASTNode):
         self.elif_blocks = elif_blocks or []
 
 class ElifBlock(ASTNode):
+    __slots__ = ('condition', 'block')
     def __init__(self, condition, block):
         super().__init__()
         self.condition = condition
         self.block = block
 
 class WhileStatement(ASTNode):
+    __slots__ = ('condition', 'body')
     def __init__(self, condition, body):
         super().__init__()
         self.condition = condition
         self.body = body
 
 class ForStatement(ASTNode):
+    __slots__ = ('init', 'condition', 'update', 'body')
     def __init__(self, init, condition, update, body):
         super().__init__()
         self.init = init
@@ -77,15 +151,53 @@ class ForStatement(ASTNode):
         self.body = body
 
 class ForRangeStatement(ASTNode):
-    def __init__(self, var, start, end, body):
+    __slots__ = ('var', 'start', 'end', 'body', 'invariants')
+    _attributes = ('var',)
+    def __init__(self, var, start, end, body, invariants=None):
         super().__init__()
         self.var = var
         self.start = start
         self.end = end
         self.body = body
+        # Sentencias que se ejecutan una vez antes de la primera vuelta (ver visitors/optimizer.py)
+        self.invariants = invariants or []
+
+class ReductionLoop(ASTNode):
+    """Nido de for-range cuyo único efecto es acumular en una variable (`s = s + x;`).
+
+    Lo crea visitors/optimizer.py; `loop` es el nido original, que se ejecuta
+    tal cual si el cuerpo no se puede evaluar sobre todas las vueltas a la vez
+    (ver visitors/reduction.py).
+    """
+    __slots__ = ('loop', 'accumulator')
+    _attributes = ('accumulator',)
+    def __init__(self, loop, accumulator):
+        super().__init__(loop.lineno, loop.lexpos)
+        self.loop = loop
+        self.accumulator = accumulator
+
+class PrintStatement(ASTNode):
+    __slots__ = ('args',)
+    def __init__(self, args):
+        super().__init__()
+        self.args = args
+
+class ReturnStatement(ASTNode):
+    __slots__ = ('value',)
+    def __init__(self, value=None):
+        super().__init__()
+        self.value = value
+
+class BreakStatement(ASTNode):
+    __slots__ = ()
+
+class ContinueStatement(ASTNode):
+    __slots__ = ()
 
 # ------------------------- Expresiones -------------------------
 class BinaryOperation(ASTNode):
+    __slots__ = ('left', 'op', 'right')
+    _attributes = ('op',)
     def __init__(self, left, op, right):
         super().__init__()
         self.left = left
@@ -93,54 +205,107 @@ class BinaryOperation(ASTNode):
         self.right = right
 
 class UnaryOperation(ASTNode):
+    __slots__ = ('op', 'operand')
+    _attributes = ('op',)
     def __init__(self, op, operand):
         super().__init__()
         self.op = op
         self.operand = operand
 
 class FunctionCall(ASTNode):
+    __slots__ = ('name', 'args')
+    _attributes = ('name',)
     def __init__(self, name, args):
         super().__init__()
         self.name = name
         self.args = args
 
 class Identifier(ASTNode):
+    __slots__ = ('name',)
+    _attributes = ('name',)
     def __init__(self, name):
         super().__init__()
         self.name = name
         
 class PropertyAccess(ASTNode):
+    __slots__ = ('object', 'property')
+    _attributes = ('property',)
     def __init__(self, object, property):
         super().__init__()
         self.object = object  
         self.property = property 
 
 class ArrayAccess(ASTNode):
+    __slots__ = ('array', 'index')
     def __init__(self, array, index):
         super().__init__()
         self.array = array  
         self.index = index 
+
+class TrigFunction(ASTNode):
+    __slots__ = ('function', 'argument')
+    _attributes = ('function',)
+    def __init__(self, function, argument):
+        super().__init__()
+        self.function = function  # 'sin', 'cos', ..., 'cot'
+        self.argument = argument
+
+class StatFunction(ASTNode):
+    __slots__ = ('function', 'args')
+    _attributes = ('function',)
+    def __init__(self, function, args):
+        super().__init__()
+        self.function = function  # 'mean', 'median', 'mode', 'streak', 'efects'
+        self.args = args
+
+class MathFunction(StatFunction):
+    __slots__ = ()  # 'max', 'min'
+
+class TwoWayModelExpression(ASTNode):
+    __slots__ = ('expression',)
+    def __init__(self, expression):
+        super().__init__()
+        self.expression = expression
+
+class KeyValuePair(ASTNode):
+    __slots__ = ('key', 'value')
+    def __init__(self, key, value):
+        super().__init__()
+        self.key = key
+        self.value = value
 class ArrayDeclaration(ASTNode):
+    __slots__ = ('type', 'identifier', 'size', 'value')
+    _attributes = ('type', 'identifier')
     def __init__(self, type_specifier, identifier, size, value=None):
+        super().__init__()
         self.type = type_specifier
         self.identifier = identifier
         self.size = size
         self.value = value
 
 class SpecialDeclaration(ASTNode):
+    __slots__ = ('decl_type', 'identifier', 'dimensions')
+    _attributes = ('decl_type', 'identifier')
     def __init__(self, decl_type, identifier, dimensions):
+        super().__init__()
         self.decl_type = decl_type  # 'modeloDosVias' o 'efectos'
         self.identifier = identifier
         self.dimensions = dimensions
 
 class MemberAccess(ASTNode):
+    __slots__ = ('base', 'index', 'member')
+    _attributes = ('member',)
     def __init__(self, base, index=None, member=None):
+        super().__init__()
         self.base = base
         self.index = index
         self.member = member
 
 class MatrixDeclaration(ASTNode):
+    __slots__ = ('name', 'rows', 'cols', 'data')
+    _attributes = ('name', 'rows', 'cols')
     def __init__(self, name, dimensions_or_data):
+        super().__init__()
         self.name = name
         if isinstance(dimensions_or_data, dict):
             # Formato: [2,3,[3,2,4;1,3,2]]
@@ -153,36 +318,77 @@ class MatrixDeclaration(ASTNode):
             self.rows = len(dimensions_or_data)
             self.cols = len(dimensions_or_data[0]) if self.rows > 0 else 0
 
+class ModelFileDeclaration(ASTNode):
+    __slots__ = ('name', 'path')
+    _attributes = ('name', 'path')
+    def __init__(self, name, path):
+        super().__init__()
+        self.name = name
+        self.path = path  # archivo binario de src/modelfile.py
+
 # ------------------------- Literales -------------------------
 class Literal(ASTNode):
+    __slots__ = ('value', 'type')
+    _attributes = ('type',)
     def __init__(self, value, type=None):
         super().__init__()
         self.value = value
         self.type = type
 
 class IntegerLiteral(Literal):
+    __slots__ = ()
     def __init__(self, value):
         super().__init__(value, 'int')
 
 class FloatLiteral(Literal):
+    __slots__ = ()
     def __init__(self, value):
         super().__init__(value, 'float')
 
 class StringLiteral(Literal):
+    __slots__ = ()
     def __init__(self, value):
         super().__init__(value, 'string')
 
 class BooleanLiteral(Literal):
+    __slots__ = ()
     def __init__(self, value):
         super().__init__(value, 'bool')
 class MatrixLiteral(Literal):
+    __slots__ = ()
     def __init__(self, value):
         super().__init__(value, 'matrix')
                 
 # ------------------------- Visitor Pattern -------------------------
+class DispatchTable(dict):
+    """Tabla {clase de nodo: método visit_*} de una clase de visitor.
+
+    Cada clase se resuelve una sola vez (buscando 'visit_' + nombre en
+    minúsculas y recorriendo el MRO del nodo); después visitar un nodo cuesta
+    una búsqueda en el diccionario.
+    """
+    def __init__(self, visitor_cls):
+        super().__init__()
+        self.visitor_cls = visitor_cls
+
+    def __missing__(self, node_cls):
+        method = None
+        for klass in node_cls.__mro__:
+            method = getattr(self.visitor_cls, 'visit_' + klass.__name__.lower(), None)
+            if method is not None:
+                break
+        self[node_cls] = method = method or self.visitor_cls.generic_visit
+        return method
+
 class ASTVisitor:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = DispatchTable(cls)
+
     def visit(self, node):
-        return node.accept(self)
+        return self._dispatch[node.__class__](self, node)
     
     def generic_visit(self, node):
-        raise NotImplementedError(f'No hay método visit_{node.__class__.__name__} definido')
\ No newline at end of file
+        raise NotImplementedError(f'No hay método visit_{node.__class__.__name__} definido')
+
+ASTVisitor._dispatch = DispatchTable(ASTVisitor)
@@ -1,10 +1,15 @@
+import sys
 import ply.yacc as yacc
 from src.lexer import tokens, lexer
+from src import tablecache
+from src.diagnostics import diagnostics
 from src.my_ast import (
     Program, Declaration, MemberAccess, FunctionDeclaration, Parameter, Assignment,
     IfStatement, ElifBlock, WhileStatement, ForStatement, ForRangeStatement, ArrayAssignment,
     BinaryOperation, UnaryOperation, FunctionCall, Identifier, MatrixDeclaration, MatrixLiteral,
-    IntegerLiteral, FloatLiteral, StringLiteral, BooleanLiteral,Literal,ArrayDeclaration,SpecialDeclaration
+    IntegerLiteral, FloatLiteral, StringLiteral, BooleanLiteral,Literal,ArrayDeclaration,SpecialDeclaration,
+    ModelFileDeclaration, ASTNode, PrintStatement, ReturnStatement, BreakStatement, ContinueStatement,
+    ArrayAccess, PropertyAccess, TrigFunction, StatFunction, MathFunction, TwoWayModelExpression, KeyValuePair
 )
 from math import sin, cos, tan, sinh, cosh, tanh  # Para funciones trigonométricas
 
@@ -22,6 +27,21 @@ precedence = (
 
 ## ------------------------- Gramática Principal -------------------------
 
+def at(p, node, n=1):
+    """Da a node la posición del símbolo n de la producción.
+
+    Si el símbolo es un token se usa su línea y lexpos; si es un nodo, la
+    posición del nodo (se comparten los mismos objetos int, así que sólo las
+    hojas agregan memoria). Los demás no terminales (listas, cadenas) no
+    llevan posición sin tracking y dejan la del nodo en None.
+    """
+    symbol = p[n]
+    if isinstance(symbol, ASTNode):
+        node.lineno, node.lexpos = symbol.lineno, symbol.lexpos
+    elif not isinstance(p.slice[n], yacc.YaccSymbol):
+        node.lineno, node.lexpos = p.lineno(n), p.lexpos(n)
+    return node
+
 def p_program(p):
     '''program : statement_list'''
     p[0] = Program(p[1])
@@ -55,41 +75,41 @@ def p_expression(p):
     
     # Operadores binarios
     if len(p) == 4 and p[2] in ['+', '-', '*', '/', '%', '^', '~', '<', '<=', '>', '>=', '==', '!=', '&', '|']:
-        p[0] = BinaryOperation(p[1], p[2], p[3])
+        p[0] = at(p, BinaryOperation(p[1], p[2], p[3]))
     
     # Operadores unarios
     elif len(p) == 3 and p[1] in ['-', '!']:
-        p[0] = UnaryOperation(p[1], p[2])
+        p[0] = at(p, UnaryOperation(p[1], p[2]))
     
     # Paréntesis
     elif len(p) == 4 and p[1] == '(':
         p[0] = p[2]
     
-    # Identificadores y literales
+    # Identificadores (también los que llegan como cadena desde primary_expression)
+    elif len(p) == 2 and isinstance(p[1], str):
+        p[0] = at(p, Identifier(p[1]))
+
+    # Literales, llamadas a funciones y operaciones especiales
     elif len(p) == 2:
-        if isinstance(p[1], (IntegerLiteral, FloatLiteral, StringLiteral, BooleanLiteral)):
-            p[0] = p[1]
-        elif p.slice[1].type == 'IDENTIFICADOR':
-            p[0] = Identifier(p[1])
-    
-    # Llamadas a funciones y operaciones especiales
-    elif len(p) == 2 and isinstance(p[1], (FunctionCall, tuple)):
         p[0] = p[1]
         
 def p_assignment_statement(p):
     '''assignment_statement : IDENTIFICADOR OP_ASIGN expression PUNTO_COMA'''
-    p[0] = Assignment(Identifier(p[1]), p[3])
+    p[0] = at(p, Assignment(at(p, Identifier(p[1])), p[3]))
 
 def p_array_assignment(p):
     '''array_assignment : IDENTIFICADOR L_CORCHETE expression R_CORCHETE OP_ASIGN array_literal PUNTO_COMA'''
-    print(f"Asignando array: {p[1]}[{p[3]}] = {p[6]}")
-    p[0] = ArrayAssignment(Identifier(p[1]), p[3], p[6])
+    diagnostics.debug("Asignando array: {}[{}] = {}", p[1], p[3], p[6], lineno=p.lineno(1))
+    p[0] = at(p, ArrayAssignment(at(p, Identifier(p[1])), p[3], p[6]))
 
 def p_statement_list(p):
     '''statement_list : statement_list statement
                      | statement'''
+    # Las listas se extienden en el lugar (en esta y en las demás producciones
+    # recursivas por la izquierda): copiarlas en cada reducción es cuadrático
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -100,11 +120,13 @@ def p_jump_statement(p):
                      | CONTINUE PUNTO_COMA'''
     if p[1] == 'return':
         if len(p) == 4:  # return con expresión
-            p[0] = ('return_stmt', p[2])
+            p[0] = at(p, ReturnStatement(p[2]))
         else:  # return sin expresión
-            p[0] = ('return_stmt', None)
+            p[0] = at(p, ReturnStatement())
+    elif p[1] == 'break':
+        p[0] = at(p, BreakStatement())
     else:
-        p[0] = (f'{p[1].lower()}_stmt',)  # break o continue
+        p[0] = at(p, ContinueStatement())
 
 def p_expression_statement(p):
     '''expression_statement : expression PUNTO_COMA
@@ -118,30 +140,27 @@ def p_print_statement(p):
     '''print_statement : PRINT L_PARENTESIS print_args R_PARENTESIS
                       | PRINT L_PARENTESIS R_PARENTESIS'''
     if len(p) == 5:
-        p[0] = ('print', p[3])
+        p[0] = at(p, PrintStatement(p[3]))
     else:
-        p[0] = ('print', [])
+        p[0] = at(p, PrintStatement([]))
 
 
 def p_print_args(p):
     '''print_args : print_args COMA expression
                  | expression'''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
 def p_if_statement(p):
     '''if_statement : IF L_PARENTESIS expression R_PARENTESIS block'''
-    p[0] = ('if', p[3], p[5])
+    p[0] = at(p, IfStatement(condition=p[3], true_block=p[5]))
 
 def p_block(p):
-    '''block : L_LLAVE statement_list R_LLAVE
-                | statement'''
-    if len(p) == 4:
-        p[0] = p[2]
-    else:
-        p[0] = [p[1]]
+    '''block : L_LLAVE statement_list R_LLAVE'''
+    p[0] = p[2]
 
 def p_special_statement(p):
     '''special_statement : TWOWAYMODEL L_PARENTESIS expression R_PARENTESIS PUNTO_COMA
@@ -149,15 +168,13 @@ def p_special_statement(p):
                         | STREAK L_PARENTESIS argument_list R_PARENTESIS PUNTO_COMA
                         | STREAK IDENTIFICADOR PUNTO_COMA'''  # 👈 nueva regla
     if p[1] == 'twoWayModel':
-        p[0] = ('two_way_model', p[3])
+        p[0] = at(p, TwoWayModelExpression(p[3]))
     elif p[1] == 'efects':
-        from src.my_ast import SpecialDeclaration
-        p[0] = SpecialDeclaration(decl_type='efects', identifier=p[2], dimensions=p[4])
+        p[0] = at(p, SpecialDeclaration(decl_type='efects', identifier=p[2], dimensions=p[4]))
     elif p[1] == 'streak' and len(p) == 6:
-        p[0] = ('streak', p[3])
+        p[0] = at(p, StatFunction('streak', p[3]))
     elif p[1] == 'streak' and len(p) == 4:
-        from src.my_ast import SpecialDeclaration
-        p[0] = SpecialDeclaration(decl_type='streak', identifier=p[2], dimensions=None)
+        p[0] = at(p, SpecialDeclaration(decl_type='streak', identifier=p[2], dimensions=None))
 
 
 def p_statement(p):
@@ -181,7 +198,8 @@ def p_statement(p):
 def p_declaration_statement(p):
     '''declaration_statement : variable_declaration
                             | array_declaration
-                            | special_matrix_declaration'''
+                            | special_matrix_declaration
+                            | model_file_declaration'''
     p[0] = p[1]
 
 def p_variable_declaration(p):
@@ -190,14 +208,14 @@ def p_variable_declaration(p):
                              | type_specifier IDENTIFICADOR L_PARENTESIS expression R_PARENTESIS PUNTO_COMA
                              | TWOWAYMODEL IDENTIFICADOR OP_ASIGN expression PUNTO_COMA'''
     if len(p) == 6 and p[3] == '=' and p[1] != 'twoWayModel':
-        p[0] = Declaration(p[1], p[2], p[4])
+        p[0] = at(p, Declaration(p[1], p[2], p[4]), 2)
     elif len(p) == 4:
-        p[0] = Declaration(p[1], p[2])
+        p[0] = at(p, Declaration(p[1], p[2]), 2)
     elif len(p) == 7:
-        p[0] = ArrayDeclaration(p[1], p[2], p[4])
+        p[0] = at(p, ArrayDeclaration(p[1], p[2], p[4]), 2)
     elif p[1] == 'twoWayModel':
-        print(f"Declaración especial: {p[2]} = {p[4]}")
-        p[0] = Declaration('twoWayModel', p[2], p[4])
+        diagnostics.debug("Declaración especial: {} = {}", p[2], p[4], lineno=p.lineno(1))
+        p[0] = at(p, Declaration('twoWayModel', p[2], p[4]))
 
 
 
@@ -216,7 +234,7 @@ def p_compound_statement(p):
 # Reglas de producción
 def p_parameter(p):
     '''parameter : type_specifier IDENTIFICADOR'''
-    p[0] = Parameter(type=p[1], name=p[2])
+    p[0] = at(p, Parameter(p[1], p[2]), 2)
 
 def p_parameters(p):
     '''parameters : parameter
@@ -224,16 +242,17 @@ def p_parameters(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 
 def p_function_declaration(p):
     '''function_declaration : FN IDENTIFICADOR L_PARENTESIS parameters R_PARENTESIS compound_statement
                            | FN IDENTIFICADOR L_PARENTESIS R_PARENTESIS compound_statement'''
     if len(p) == 7:
-        p[0] = FunctionDeclaration(name=p[2], params=p[4], body=p[6])
+        p[0] = at(p, FunctionDeclaration(name=p[2], params=p[4], body=p[6]))
     else:
-        p[0] = FunctionDeclaration(name=p[2], params=[], body=p[5])
+        p[0] = at(p, FunctionDeclaration(name=p[2], params=[], body=p[5]))
 
 ## ------------------------- Estructuras de Control -------------------------
 
@@ -242,37 +261,40 @@ def p_selection_statement(p):
                           | IF L_PARENTESIS expression R_PARENTESIS statement ELSE statement
                           | IF L_PARENTESIS expression R_PARENTESIS statement ELIF L_PARENTESIS expression R_PARENTESIS statement'''
     if len(p) == 6:
-        p[0] = IfStatement(condition=p[3], true_block=p[5])
+        p[0] = at(p, IfStatement(condition=p[3], true_block=p[5]))
     elif len(p) == 8:
-        p[0] = IfStatement(condition=p[3], true_block=p[5], false_block=p[7])
+        p[0] = at(p, IfStatement(condition=p[3], true_block=p[5], false_block=p[7]))
     else:
-        p[0] = IfStatement(condition=p[3], true_block=p[5], 
-                          elif_blocks=[ElifBlock(condition=p[7], block=p[9])])
+        p[0] = at(p, IfStatement(condition=p[3], true_block=p[5],
+                                 elif_blocks=[at(p, ElifBlock(condition=p[7], block=p[9]), 6)]))
 
 def p_iteration_statement(p):
     '''iteration_statement : WHILE L_PARENTESIS expression R_PARENTESIS statement
                           | FOR L_PARENTESIS expression PUNTO_COMA expression PUNTO_COMA expression R_PARENTESIS statement
                           | FOR IDENTIFICADOR IN RANGE L_PARENTESIS expression COMA expression R_PARENTESIS statement'''
     if p[1] == 'while':
-        p[0] = WhileStatement(condition=p[3], body=p[5])
+        p[0] = at(p, WhileStatement(condition=p[3], body=p[5]))
     elif len(p) == 10 and p[3] == ';':
-        p[0] = ForStatement(init=p[3], condition=p[5], update=p[7], body=p[9])
+        p[0] = at(p, ForStatement(init=p[3], condition=p[5], update=p[7], body=p[9]))
     else:
-        p[0] = ForRangeStatement(var=p[2], start=p[6], end=p[8], body=p[10])
+        p[0] = at(p, ForRangeStatement(var=p[2], start=p[6], end=p[8], body=p[10]))
 
 def p_key_value_pair(p):
     '''key_value_pair : expression DOS_PUNTOS expression'''
-    p[0] = (p[1], p[3])
+    p[0] = at(p, KeyValuePair(p[1], p[3]))
 
 def p_array_access(p):
     '''array_access : IDENTIFICADOR L_CORCHETE expression R_CORCHETE
-                   | array_access L_CORCHETE expression R_CORCHETE'''
-    p[0] = ('array_access', p[1], p[3])
+                   | array_access L_CORCHETE expression R_CORCHETE
+                   | property_access L_CORCHETE expression R_CORCHETE'''
+    base = at(p, Identifier(p[1])) if isinstance(p[1], str) else p[1]
+    p[0] = at(p, ArrayAccess(base, p[3]))
 
 def p_property_access(p):
     '''property_access : IDENTIFICADOR PUNTO IDENTIFICADOR
                       | property_access PUNTO IDENTIFICADOR'''
-    p[0] = ('property_access', p[1], p[3])
+    base = at(p, Identifier(p[1])) if isinstance(p[1], str) else p[1]
+    p[0] = at(p, PropertyAccess(base, p[3]))
 
 
 
@@ -286,7 +308,7 @@ def p_trig_function(p):
                     | SEC L_PARENTESIS expression R_PARENTESIS
                     | CSC L_PARENTESIS expression R_PARENTESIS
                     | COT L_PARENTESIS expression R_PARENTESIS'''
-    p[0] = ('trig_function', p[1], p[3])
+    p[0] = at(p, TrigFunction(p[1], p[3]))
 
 ## ------------------------- Funciones Estadísticas y Especiales -------------------------
 
@@ -296,11 +318,11 @@ def p_stat_function(p):
                     | MODE L_PARENTESIS argument_list R_PARENTESIS
                     | STREAK L_PARENTESIS argument_list R_PARENTESIS
                     | EFECTS L_PARENTESIS argument_list R_PARENTESIS'''
-    p[0] = ('stat_function', p[1], p[3])
+    p[0] = at(p, StatFunction(p[1], p[3]))
 
 def p_special_operation(p):
     '''special_operation : TWOWAYMODEL L_PARENTESIS expression R_PARENTESIS'''
-    p[0] = ('two_way_model', p[3])
+    p[0] = at(p, TwoWayModelExpression(p[3]))
 
 def p_special_matrix_declaration(p):
     '''special_matrix_declaration : TWOWAYMODEL IDENTIFICADOR L_CORCHETE dimensions R_CORCHETE PUNTO_COMA'''
@@ -321,13 +343,19 @@ def p_special_matrix_declaration(p):
                 raise ValueError(f"Número de columnas incorrecto. Esperado: {p[4]['cols']}, Obtenido: {len(row)}")
 
         
-        print(f"twoWayModel creado: {p[2]} con dimensiones {p[4]['rows']}x{p[4]['cols']}")
-        p[0] = MatrixDeclaration(p[2], p[4])
+        diagnostics.debug("twoWayModel creado: {} con dimensiones {}x{}", p[2], p[4]['rows'], p[4]['cols'],
+                          lineno=p.lineno(1))
+        p[0] = at(p, MatrixDeclaration(p[2], p[4]))
         
     except ValueError as e:
-        print(f"Error en twoWayModel: {str(e)}")
+        diagnostics.error("Error en twoWayModel: {}", e, lineno=p.lineno(1))
         p_error(p)
 
+def p_model_file_declaration(p):
+    '''model_file_declaration : TWOWAYMODEL IDENTIFICADOR L_CORCHETE LIT_STRING R_CORCHETE PUNTO_COMA'''
+    # Datos en un archivo binario (ver src/modelfile.py)
+    p[0] = at(p, ModelFileDeclaration(p[2], p[4]))
+
 def p_dimensions(p):
     '''dimensions : expression COMA expression COMA matrix_literal'''
     # Asegurarse de que las dimensiones sean valores numéricos
@@ -346,7 +374,7 @@ def p_dimensions(p):
         'data': matrix_data
     }
 
-    print(f"Dimensiones procesadas: {rows} filas, {cols} columnas, datos: {p[5]}")
+    diagnostics.debug("Dimensiones procesadas: {} filas, {} columnas, datos: {}", rows, cols, p[5])
 
 def p_row_list(p):
     '''row_list : row
@@ -354,7 +382,8 @@ def p_row_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_row(p):
     '''row : expression
@@ -362,7 +391,8 @@ def p_row(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 ## ------------------------- Funciones y Llamadas -------------------------
 
 def p_function_call(p):
@@ -372,9 +402,9 @@ def p_function_call(p):
                     | math_function
                     | special_operation'''
     if len(p) == 5:
-        p[0] = FunctionCall(p[1], p[3])
-    elif len(p) == 3:
-        p[0] = FunctionCall(p[1], [])
+        p[0] = at(p, FunctionCall(p[1], p[3]))
+    elif len(p) == 4:
+        p[0] = at(p, FunctionCall(p[1], []))
     else:
         p[0] = p[1]
 
@@ -382,7 +412,8 @@ def p_argument_list(p):
     '''argument_list : argument_list COMA expression
                     | expression'''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -412,37 +443,47 @@ def p_literal(p):
                | TRUE
                | FALSE'''
     if p.slice[1].type == 'LIT_INT':
-        p[0] = IntegerLiteral(p[1])
+        p[0] = at(p, IntegerLiteral(p[1]))
     elif p.slice[1].type == 'LIT_FLOAT':
-        p[0] = FloatLiteral(p[1])
+        p[0] = at(p, FloatLiteral(p[1]))
     elif p.slice[1].type == 'LIT_STRING':
-        p[0] = StringLiteral(p[1])
+        p[0] = at(p, StringLiteral(p[1]))
     elif p.slice[1].type == 'TRUE':
-        p[0] = BooleanLiteral(True)
+        p[0] = at(p, BooleanLiteral(True))
     elif p.slice[1].type == 'FALSE':
-        p[0] = BooleanLiteral(False)
+        p[0] = at(p, BooleanLiteral(False))
         
 def p_math_function(p):
     '''math_function : MAX L_PARENTESIS argument_list R_PARENTESIS
                     | MIN L_PARENTESIS argument_list R_PARENTESIS'''
-    p[0] = ('math_function', p[1], p[3])
+    p[0] = at(p, MathFunction(p[1], p[3]))
 
 def p_array_declaration(p):
     '''array_declaration : type_specifier IDENTIFICADOR L_PARENTESIS expression R_PARENTESIS
                         | type_specifier IDENTIFICADOR L_PARENTESIS expression R_PARENTESIS OP_ASIGN array_literal'''
     if len(p) == 6:
-        p[0] = ArrayDeclaration(p[1], p[2], p[4])
+        p[0] = at(p, ArrayDeclaration(p[1], p[2], p[4]), 2)
     else:
-        p[0] = ArrayDeclaration(p[1], p[2], p[4], p[7])
+        p[0] = at(p, ArrayDeclaration(p[1], p[2], p[4], p[7]), 2)
 
 def p_array_literal(p):
     '''array_literal : L_CORCHETE expression_list R_CORCHETE
-                     | L_CORCHETE matrix_literal R_CORCHETE'''
-    p[0] = p[2]
+                     | L_CORCHETE matrix_literal R_CORCHETE
+                     | DATA_BLOCK'''
+    if len(p) == 2:
+        p[0] = at(p, FloatLiteral(p[1]))
+    else:
+        p[0] = p[2]
 
 # Conserva solo UNA de estas definiciones (la más completa)
 def p_matrix_literal(p):
-    '''matrix_literal : L_CORCHETE row_list R_CORCHETE'''
+    '''matrix_literal : L_CORCHETE row_list R_CORCHETE
+                      | DATA_BLOCK'''
+    if len(p) == 2:
+        # Bloque ya convertido en arreglos tipados por el lexer de archivos
+        diagnostics.debug("Bloque de datos: {!r}", p[1], lineno=p.lineno(1))
+        p[0] = at(p, FloatLiteral(p[1]))
+        return
     # Convertir las expresiones a valores numéricos
     processed_data = []
     for row in p[2]:
@@ -454,8 +495,8 @@ def p_matrix_literal(p):
                 processed_row.append(item)
         processed_data.append(processed_row)
     
-    print(f"Matriz literal procesada: {processed_data}")
-    p[0] = FloatLiteral(processed_data)  # o usa Literal(processed_data, 'matrix')
+    diagnostics.debug("Matriz literal procesada: {}", processed_data, lineno=p.lineno(1))
+    p[0] = at(p, FloatLiteral(processed_data))  # o usa Literal(processed_data, 'matrix')
 
 
 def p_expression_list(p):
@@ -464,7 +505,8 @@ def p_expression_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 
 def p_member_access(p):
@@ -473,22 +515,41 @@ def p_member_access(p):
                     | member_access L_CORCHETE expression R_CORCHETE
                     | member_access L_CORCHETE expression R_CORCHETE PUNTO IDENTIFICADOR'''
     if len(p) == 2:
-        p[0] = MemberAccess(p[1])
+        p[0] = at(p, MemberAccess(at(p, Identifier(p[1]))))
     elif p[2] == '.':
-        p[0] = MemberAccess(p[1], p[3])
+        p[0] = at(p, MemberAccess(p[1], p[3]))
     elif len(p) == 5:
-        p[0] = MemberAccess(p[1], index=p[3])
+        p[0] = at(p, MemberAccess(p[1], index=p[3]))
     else:
-        p[0] = MemberAccess(p[1], index=p[3], member=p[6])        
+        p[0] = at(p, MemberAccess(p[1], index=p[3], member=p[6]))        
 ## ------------------------- Manejo de Errores -------------------------
 
 def p_error(p):
     if p:
         if p.type == 'TWOWAYMODEL':
-            print(f"Error de sintaxis en twoWayModel en línea {p.lineno}. Verifique las dimensiones y los datos.")
+            diagnostics.error("Error de sintaxis en twoWayModel en línea {}. Verifique las dimensiones y los datos.",
+                              p.lineno, lineno=p.lineno)
         else:
-            print(f"Error de sintaxis en '{p.value}' (línea {p.lineno})")
+            diagnostics.error("Error de sintaxis en '{}' (línea {})", p.value, p.lineno, lineno=p.lineno)
     else:
-        print("Error de sintaxis: fin de archivo inesperado")
+        diagnostics.error("Error de sintaxis: fin de archivo inesperado")
+
+def build_parser():
+    """Construye el parser reutilizando las tablas LALR de la caché cuando la gramática no cambió"""
+    pinfo = yacc.ParserReflect(globals())
+    pinfo.get_all()
+    path = tablecache.table_path('parser', tablecache.signature_key(pinfo.signature()), '.pickle')
+    if path is None:
+        return yacc.yacc(module=sys.modules[__name__], debug=False, write_tables=False)
+    if path.exists():
+        return yacc.yacc(module=sys.modules[__name__], debug=False, picklefile=str(path))
+
+    # Primera construcción: se escribe en un archivo temporal y se publica atómicamente
+    tmp = tablecache.temp_path(path)
+    built = yacc.yacc(module=sys.modules[__name__], debug=False, picklefile=str(tmp))
+    if tmp.exists():
+        tablecache.publish(tmp, path)
+    return built
+
 # Construir el parser
-parser = yacc.yacc(debug=False, write_tables=False)
\ No newline at end of file
+parser = build_parser()
\ No newline at end of file
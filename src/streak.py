@@ -0,0 +1,280 @@
+"""Motor de rachas (run-length) para los modelos de dos vías.
+
+`Y = efectos ~ modelo;` ajusta el modelo aditivo mu + beta_i + tau_j a cada
+celda, toma el signo de los residuos y calcula las rachas (secuencias
+maximales de residuos con el mismo signo) de todas las celdas en una sola
+pasada vectorizada: los cambios de signo se detectan con diferencias entre
+elementos vecinos, los límites de celda se marcan con los offsets del modelo y
+los inicios de racha se obtienen con flatnonzero. El resultado es un arreglo
+irregular (ragged) de largos de racha indexado por celda.
+"""
+import numpy as np
+
+from src.twoway import ModelError, TwoWayModel
+from src.typedarray import ArrayOperators
+
+
+class RaggedArray(ArrayOperators):
+    """Arreglo irregular de una tabla filas x columnas: datos planos + offsets por celda"""
+
+    def __init__(self, rows, cols, values, offsets):
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.offsets = offsets
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets).reshape(self.rows, self.cols)
+
+    def cell(self, i, j):
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"Celda ({i}, {j}) fuera de una tabla {self.rows}x{self.cols}")
+        k = i * self.cols + j
+        return self.values[self.offsets[k]:self.offsets[k + 1]]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        i = int(i)
+        if not 0 <= i < self.rows:
+            raise IndexError(f"Fila {i} fuera de una tabla con {self.rows} filas")
+        return [self.cell(i, j) for j in range(self.cols)]
+
+    def tolist(self):
+        return [[self.cell(i, j).tolist() for j in range(self.cols)] for i in range(self.rows)]
+
+    def __repr__(self):
+        return f"RaggedArray({self.rows}x{self.cols}, n={self.values.size})"
+
+    def __str__(self):
+        return str(self.tolist())
+
+
+class Effects:
+    """Efectos del modelo aditivo: media general, efectos de fila y de columna"""
+
+    def __init__(self, mu, row_effects, col_effects):
+        self.mu = float(mu)
+        # Copia: un array del programa (TypedArray) se vería sin copiar y
+        # cambiaría los efectos al reasignarlo
+        self.row_effects = np.array(row_effects, dtype=np.float64).ravel()
+        self.col_effects = np.array(col_effects, dtype=np.float64).ravel()
+
+    @classmethod
+    def from_args(cls, args):
+        if len(args) != 3:
+            raise ModelError(f"efects espera (mu, efectos_fila, efectos_columna) y recibió {len(args)} valores")
+        return cls(*args)
+
+    def fitted(self, model):
+        """Tabla filas x columnas de valores ajustados mu + beta_i + tau_j"""
+        if self.row_effects.size != model.rows or self.col_effects.size != model.cols:
+            raise ModelError(
+                f"Efectos {self.row_effects.size}x{self.col_effects.size} incompatibles "
+                f"con un modelo {model.rows}x{model.cols}")
+        return self.mu + self.row_effects[:, None] + self.col_effects[None, :]
+
+    def residuals(self, model):
+        return model.values - self.fitted(model).ravel()[model.cell_ids]
+
+    def __repr__(self):
+        return f"Effects(mu={self.mu:g}, filas={self.row_effects.tolist()}, columnas={self.col_effects.tolist()})"
+
+
+def run_starts(signs, offsets):
+    """Posiciones donde empieza una racha: cambio de signo o inicio de celda"""
+    starts = np.empty(signs.size, dtype=bool)
+    if signs.size == 0:
+        return np.flatnonzero(starts)
+    starts[0] = True
+    np.not_equal(signs[1:], signs[:-1], out=starts[1:])
+    cell_starts = offsets[:-1]
+    starts[cell_starts[cell_starts < signs.size]] = True
+    return np.flatnonzero(starts)
+
+
+def compute_runs(values, offsets):
+    """Calcula las rachas de signo de todas las celdas a la vez.
+
+    Devuelve (largos, signos, offsets_de_rachas): los largos y signos de cada
+    racha en orden de celda y los offsets que delimitan las rachas de cada celda.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    signs = np.sign(values).astype(np.int8)
+    starts = run_starts(signs, offsets)
+    lengths = np.diff(np.append(starts, values.size))
+
+    # Celda a la que pertenece cada racha, y cuántas rachas tiene cada celda
+    ncells = offsets.size - 1
+    cell_of_run = np.searchsorted(offsets, starts, side='right') - 1
+    run_offsets = np.zeros(ncells + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cell_of_run, minlength=ncells), out=run_offsets[1:])
+    return lengths, signs[starts], run_offsets
+
+
+def runs_of(values):
+    """Largos de las rachas de signo de una secuencia simple"""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    lengths, _, _ = compute_runs(values, np.array([0, values.size]))
+    return lengths
+
+
+class LazyRunTable(RaggedArray):
+    """Tabla de rachas que se calcula sólo para las celdas que se indexan.
+
+    `R[i][j]` calcula y guarda las rachas de la celda (i, j) a partir de su
+    tramo de datos; cualquier acceso a la tabla completa (values, offsets,
+    tolist, print) la materializa de una vez con el motor vectorizado.
+    """
+
+    def __init__(self, model, fitted):
+        self.rows = model.rows
+        self.cols = model.cols
+        self.model = model
+        self.fitted = fitted
+        self._cells = {}
+        self._full = None
+
+    @property
+    def materialized_cells(self):
+        return self.rows * self.cols if self._full is not None else len(self._cells)
+
+    def cell(self, i, j):
+        if self._full is not None:
+            return self._full.cell(i, j)
+        k = self.model.cell_index(i, j)
+        runs = self._cells.get(k)
+        if runs is None:
+            runs = self._cells[k] = runs_of(self.model.cell(i, j) - self.fitted[i, j])
+        return runs
+
+    def materialize(self):
+        if self._full is None:
+            residuals = self.model.values - self.fitted.ravel()[self.model.cell_ids]
+            lengths, signs, run_offsets = compute_runs(residuals, self.model.offsets)
+            self._full = RaggedArray(self.rows, self.cols, lengths, run_offsets)
+            self._signs = RaggedArray(self.rows, self.cols, signs, run_offsets)
+            self._cells.clear()
+        return self._full
+
+    @property
+    def values(self):
+        return self.materialize().values
+
+    @property
+    def offsets(self):
+        return self.materialize().offsets
+
+    @property
+    def signs(self):
+        self.materialize()
+        return self._signs
+
+    def tolist(self):
+        return self.materialize().tolist()
+
+    def __getitem__(self, i):
+        i = int(i)
+        if not 0 <= i < self.rows:
+            raise IndexError(f"Fila {i} fuera de una tabla con {self.rows} filas")
+        return LazyRow(self, i)
+
+    def __repr__(self):
+        return f"LazyRunTable({self.rows}x{self.cols}, celdas calculadas={self.materialized_cells})"
+
+
+class LazyRow:
+    """Fila de una LazyRunTable: indexarla calcula sólo la celda pedida"""
+
+    def __init__(self, table, i):
+        self.table = table
+        self.i = i
+
+    def __len__(self):
+        return self.table.cols
+
+    def __getitem__(self, j):
+        return self.table.cell(self.i, int(j))
+
+    def __iter__(self):
+        return (self.table.cell(self.i, j) for j in range(self.table.cols))
+
+    def __str__(self):
+        return str([cell.tolist() for cell in self])
+
+
+class StreakResult:
+    """Resultado de `efectos ~ modelo`.
+
+    No calcula nada al crearse: R se evalúa por celda al indexarse, X es una
+    vista sin copia de los datos del modelo y n_ij se deriva de sus offsets.
+    """
+
+    def __init__(self, effects, model):
+        self.effects = effects
+        self.model = model
+        self.fitted = effects.fitted(model)  # valida las dimensiones de los efectos
+        self._runs = None
+        self._data = None
+        self._n_ij = None
+
+    @property
+    def R(self):
+        if self._runs is None:
+            self._runs = LazyRunTable(self.model, self.fitted)
+        return self._runs
+
+    @property
+    def X(self):
+        if self._data is None:
+            self._data = RaggedArray(self.model.rows, self.model.cols, self.model.values, self.model.offsets)
+        return self._data
+
+    @property
+    def n_ij(self):
+        if self._n_ij is None:
+            self._n_ij = self.model.n_ij
+        return self._n_ij
+
+    @property
+    def residuals(self):
+        return self.model.values - self.fitted.ravel()[self.model.cell_ids]
+
+    @property
+    def signs(self):
+        return self.R.signs
+
+    @property
+    def N(self):
+        return self.model.rows
+
+    @property
+    def M(self):
+        return self.model.cols
+
+    @property
+    def alpha(self):
+        return self.effects.mu
+
+    @property
+    def beta(self):
+        return self.effects.row_effects
+
+    @property
+    def tau(self):
+        return self.effects.col_effects
+
+    def __repr__(self):
+        return f"StreakResult({self.model!r}, {self.R!r})"
+
+
+def streak_analysis(effects, model):
+    """Implementación del operador `~` (el cálculo de rachas es diferido)"""
+    if isinstance(effects, (list, tuple)):
+        effects = Effects.from_args(effects)
+    if not isinstance(effects, Effects) or not isinstance(model, TwoWayModel):
+        raise ModelError("'~' espera efectos a la izquierda y un twoWayModel a la derecha")
+    return StreakResult(effects, model)
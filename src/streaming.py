@@ -0,0 +1,106 @@
+"""Análisis de archivos por bloques, sin cargar el programa completo en memoria.
+
+StreamingLexer lee la fuente de a CHUNK_SIZE caracteres y entrega los tokens a
+medida que el parser los pide (implementa token(), que es lo único que usa
+yacc). Antes de cada token el buffer contiene completa la línea en que
+empieza, así que ningún token de una sola línea queda partido entre dos
+lecturas; las cadenas y los bloques de datos se completan leyendo hasta su
+cierre, así que cada bloque de datos `[a, b; c, d]` llega entero al lexer, que
+lo entrega como un único token DATA_BLOCK (ver src/datablock.py).
+"""
+import re
+from pathlib import Path
+
+from src.datablock import BLOCK_START
+from src.lexer import lexer as base_lexer
+
+CHUNK_SIZE = 1 << 20
+
+# Lo que el lexer salta antes de un token: espacios, saltos de línea y comentarios
+SKIPPED = re.compile(r'(?:[ \t\n]+|\#[^\n]*)*')
+
+
+class StreamingLexer:
+    def __init__(self, source, chunk_size=CHUNK_SIZE, lexer=None):
+        """`source` es un archivo de texto abierto o una ruta"""
+        if isinstance(source, (str, Path)):
+            source = open(source, 'r', encoding='utf-8')
+            self._owned = source
+        else:
+            self._owned = None
+        self._source = source
+        self._chunk_size = chunk_size
+        self._lexer = (lexer or base_lexer).clone()
+        self._lexer.lineno = 1
+        self._buffer = ''
+        self._offset = 0   # posición absoluta del inicio del buffer
+        self._eof = False
+        self._lexer.input('')
+
+    @property
+    def lineno(self):
+        return self._lexer.lineno
+
+    def input(self, data):
+        raise TypeError("StreamingLexer lee su propia fuente; use parser.parse(lexer=...) sin texto")
+
+    def close(self):
+        if self._owned is not None:
+            self._owned.close()
+            self._owned = None
+
+    def _read(self):
+        """Descarta el texto ya consumido por el lexer y agrega una lectura más"""
+        chunk = self._source.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return
+        consumed = self._lexer.lexpos
+        self._offset += consumed
+        self._buffer = self._buffer[consumed:] + chunk
+        self._lexer.input(self._buffer)
+
+    def _fill_until(self, char, ahead):
+        """Lee hasta que `char` aparezca a partir de `ahead` caracteres después de lexpos"""
+        while not self._eof and self._buffer.find(char, self._lexer.lexpos + ahead) == -1:
+            self._read()
+
+    def token(self):
+        lexer = self._lexer
+        while True:
+            # La línea del próximo token tiene que estar completa en el buffer
+            start = SKIPPED.match(self._buffer, lexer.lexpos).end()
+            if not self._eof and self._buffer.find('\n', start) == -1:
+                self._read()
+                continue
+            ahead = start - lexer.lexpos
+            char = self._buffer[start:start + 1]
+            if char in ('"', "'"):
+                self._fill_until(char, ahead + 1)
+            elif char == '[' and BLOCK_START.match(self._buffer, start):
+                # t_DATA_BLOCK necesita el bloque completo hasta ']'
+                self._fill_until(']', ahead)
+
+            tok = lexer.token()
+            if tok is None:
+                if self._eof:
+                    self.close()
+                    return None
+                self._read()
+                continue
+            tok.lexpos += self._offset
+            return tok
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+
+def parse_file(path, parser=None, chunk_size=CHUNK_SIZE):
+    """Analiza un archivo leyéndolo por bloques y devuelve el AST"""
+    if parser is None:
+        from src.parser import parser
+    lexer = StreamingLexer(path, chunk_size)
+    try:
+        return parser.parse(lexer=lexer)
+    finally:
+        lexer.close()
@@ -0,0 +1,78 @@
+"""Caché en disco de las tablas generadas por PLY.
+
+Las tablas se guardan una sola vez en un directorio de caché con un nombre
+que incluye un hash de la firma de la gramática y de la versión de PLY, de
+modo que cualquier cambio en la gramática (o en PLY) produce un archivo nuevo
+y los anteriores se descartan automáticamente.
+
+Variables de entorno:
+    TALLER_TABLE_CACHE     directorio de la caché (por defecto src/__tablecache__)
+    TALLER_NO_TABLE_CACHE  si vale 1, no se lee ni se escribe ninguna tabla
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import ply
+
+CACHE_ENV = 'TALLER_TABLE_CACHE'
+DISABLE_ENV = 'TALLER_NO_TABLE_CACHE'
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / '__tablecache__'
+
+
+def cache_enabled(disable_env=DISABLE_ENV):
+    return os.environ.get(disable_env, '') not in ('1', 'true', 'yes')
+
+
+def cache_dir(cache_env=CACHE_ENV, default=DEFAULT_CACHE_DIR, disable_env=DISABLE_ENV):
+    """Devuelve el directorio de la caché creándolo si hace falta (None si no es posible).
+
+    Los argumentos eligen otra caché con el mismo esquema (p. ej. la de src/astcache.py).
+    """
+    if not cache_enabled(disable_env):
+        return None
+    path = Path(os.environ.get(cache_env) or default)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return path
+
+
+def signature_key(*parts):
+    """Hash estable de la firma de una tabla, incluida la versión de PLY"""
+    digest = hashlib.sha256(ply.__version__.encode('utf-8'))
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(str(part).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def table_path(prefix, key, suffix):
+    """Ruta de la tabla `prefix` para la firma `key` (None si la caché está desactivada)"""
+    directory = cache_dir()
+    if directory is None:
+        return None
+    return directory / f'{prefix}_{key}{suffix}'
+
+
+def temp_path(path):
+    """Ruta temporal única por proceso para escribir una tabla antes de publicarla"""
+    return path.with_name(f'tmp{os.getpid()}_{path.name}')
+
+
+def publish(tmp, path):
+    """Publica atómicamente una tabla recién escrita y elimina las versiones obsoletas"""
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    prefix = path.name[:path.name.rindex('_') + 1]
+    for stale in path.parent.glob(f'{prefix}*{path.suffix}'):
+        if stale != path:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    return True
@@ -1,22 +1,106 @@
 # Versión mejorada de tokens.py con validaciones
+from array import array
+
+
 class Token:
+    # `lexer` lo asigna yacc al reportar un error de sintaxis
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
     def __init__(self, type, value, lineno=None, lexpos=None):
         if not isinstance(type, str):
             raise ValueError("Token type must be a string")
-            
+
         self.type = type
         self.value = value
         self.lineno = lineno if lineno is not None else 0
         self.lexpos = lexpos if lexpos is not None else 0
-    
+        self.lexer = None
+
     def __str__(self):
         return f'Token(type={self.type}, value={repr(self.value)}, line={self.lineno}, position={self.lexpos})'
-    
+
     def __repr__(self):
         return self.__str__()
-    
+
     def __eq__(self, other):
         if not isinstance(other, Token):
             return False
-        return (self.type == other.type and 
-                self.value == other.value)
\ No newline at end of file
+        return (self.type == other.type and
+                self.value == other.value)
+
+
+class TokenBuffer:
+    """Tokens guardados por columnas en lugar de un objeto por token.
+
+    Cada columna es un array tipado: id del tipo (índice en `types`), línea y
+    lexpos; los valores quedan en una lista que sólo guarda referencias (los
+    textos repetidos como '=' o ';' los comparte el lexer). Con un millón de
+    tokens ocupa unos 30 bytes por token, contra ~160 de una lista de
+    LexToken (benchmarks/bench_memory.py). Los Token se crean al leerlos.
+    """
+    def __init__(self):
+        self.types = []        # nombre de cada tipo, por id
+        self._type_ids = {}
+        self.type_ids = array('H')
+        self.values = []
+        self.lines = array('l')
+        self.positions = array('q')
+
+    @classmethod
+    def from_lexer(cls, lexer, data=None):
+        """Lexea todo `data` (o lo que le quede a `lexer`) en un buffer nuevo"""
+        buffer = cls()
+        if data is not None:
+            lexer.input(data)
+        buffer.extend(iter(lexer.token, None))
+        return buffer
+
+    def type_id(self, type):
+        type_id = self._type_ids.get(type)
+        if type_id is None:
+            type_id = self._type_ids[type] = len(self.types)
+            self.types.append(type)
+        return type_id
+
+    def append(self, type, value, lineno, lexpos):
+        self.type_ids.append(self.type_id(type))
+        self.values.append(value)
+        self.lines.append(lineno)
+        self.positions.append(lexpos)
+
+    def extend(self, tokens):
+        """Agrega tokens con atributos type/value/lineno/lexpos (LexToken, Token)"""
+        type_ids, values, lines, positions = self.type_ids, self.values, self.lines, self.positions
+        known = self._type_ids
+        for tok in tokens:
+            type_id = known.get(tok.type)
+            if type_id is None:
+                type_id = self.type_id(tok.type)
+            type_ids.append(type_id)
+            values.append(tok.value)
+            lines.append(tok.lineno)
+            positions.append(tok.lexpos)
+
+    def __len__(self):
+        return len(self.type_ids)
+
+    def __getitem__(self, i):
+        return Token(self.types[self.type_ids[i]], self.values[i], self.lines[i], self.positions[i])
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def reader(self):
+        """Objeto con token() para parser.parse(lexer=...)"""
+        return TokenReader(self)
+
+
+class TokenReader:
+    def __init__(self, buffer):
+        self._tokens = iter(buffer)
+
+    def input(self, data):
+        raise TypeError("TokenReader lee un TokenBuffer; use parser.parse(lexer=...) sin texto")
+
+    def token(self):
+        return next(self._tokens, None)
@@ -0,0 +1,205 @@
+"""Representación en tiempo de ejecución de los modelos de dos vías (twoWayModel).
+
+Las observaciones de todas las celdas se guardan en un único arreglo NumPy
+contiguo (float64) en orden fila-mayor de celdas; `offsets` (int64, de largo
+filas*columnas+1) marca dónde empieza cada celda, de modo que las celdas
+pueden tener tamaños n_ij distintos. Todas las estadísticas se calculan de
+forma vectorizada sobre ese arreglo, sin recorrer listas de Python.
+"""
+import numpy as np
+
+from src.datablock import DataBlock
+
+
+class ModelError(ValueError):
+    """Datos o dimensiones inválidos para un twoWayModel"""
+
+
+class TwoWayModel:
+    def __init__(self, rows, cols, values, offsets):
+        self.rows = int(rows)
+        self.cols = int(cols)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        if self.offsets.shape != (self.rows * self.cols + 1,):
+            raise ModelError(
+                f"Se esperaban {self.rows * self.cols + 1} offsets y hay {self.offsets.size}")
+        if self.offsets[0] != 0 or self.offsets[-1] != self.values.size or np.any(np.diff(self.offsets) < 0):
+            raise ModelError("Offsets de celdas inconsistentes con los datos")
+        self._cell_ids = None
+        self._cell_sums = None
+
+    # ------------------------- Construcción -------------------------
+    @classmethod
+    def from_cells(cls, cells, rows=None, cols=None):
+        """Crea el modelo a partir de una secuencia de celdas en orden fila-mayor"""
+        if isinstance(cells, DataBlock) and rows is None and cols is None:
+            # Las filas del bloque ya son celdas contiguas: no se copia nada
+            return cls(1, cells.rows, cells.values, cells.offsets)
+        cells = [np.asarray(cell, dtype=np.float64).ravel() for cell in cells]
+        if rows is None and cols is None:
+            rows, cols = 1, len(cells)
+        elif rows is None:
+            rows = len(cells) // cols
+        elif cols is None:
+            cols = len(cells) // rows
+        if len(cells) != rows * cols:
+            raise ModelError(f"Se esperaban {rows * cols} celdas ({rows}x{cols}) y hay {len(cells)}")
+        counts = np.fromiter((cell.size for cell in cells), dtype=np.int64, count=len(cells))
+        offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        values = np.concatenate(cells) if cells else np.empty(0)
+        return cls(rows, cols, values, offsets)
+
+    @classmethod
+    def from_counts(cls, counts, values=None):
+        """Crea el modelo a partir de la tabla n_ij (filas x columnas) y los datos planos"""
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.ndim != 2:
+            raise ModelError("La tabla de tamaños de celda debe ser bidimensional")
+        if np.any(counts < 0):
+            raise ModelError("Los tamaños de celda no pueden ser negativos")
+        offsets = np.zeros(counts.size + 1, dtype=np.int64)
+        np.cumsum(counts.ravel(), out=offsets[1:])
+        if values is None:
+            values = np.zeros(offsets[-1])
+        return cls(counts.shape[0], counts.shape[1], values, offsets)
+
+    def with_cells(self, cells):
+        """Nuevo modelo con la forma de éste y los datos de `cells`, validando cada n_ij"""
+        model = TwoWayModel.from_cells(cells, self.rows, self.cols)
+        if not np.array_equal(model.n_ij, self.n_ij):
+            raise ModelError(f"Los tamaños de celda {model.n_ij.tolist()} no coinciden con {self.n_ij.tolist()}")
+        return model
+
+    # ------------------------- Estructura -------------------------
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    @property
+    def N(self):
+        return self.rows
+
+    @property
+    def M(self):
+        return self.cols
+
+    @property
+    def size(self):
+        return self.values.size
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets)
+
+    @property
+    def n_ij(self):
+        return self.counts.reshape(self.rows, self.cols)
+
+    @property
+    def cell_ids(self):
+        """Índice de celda (fila-mayor) de cada observación"""
+        if self._cell_ids is None:
+            self._cell_ids = np.repeat(np.arange(self.rows * self.cols), self.counts)
+        return self._cell_ids
+
+    def cell_index(self, i, j):
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"Celda ({i}, {j}) fuera de un modelo {self.rows}x{self.cols}")
+        return i * self.cols + j
+
+    def cell(self, i, j):
+        """Vista (sin copia) de las observaciones de la celda (i, j)"""
+        k = self.cell_index(i, j)
+        return self.values[self.offsets[k]:self.offsets[k + 1]]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        i = int(i)
+        if not 0 <= i < self.rows:
+            raise IndexError(f"Fila {i} fuera de un modelo con {self.rows} filas")
+        return [self.cell(i, j) for j in range(self.cols)]
+
+    def __repr__(self):
+        return f"TwoWayModel({self.rows}x{self.cols}, n={self.size})"
+
+    def __str__(self):
+        rows = []
+        for i in range(self.rows):
+            rows.append(' | '.join(' '.join(f'{v:g}' for v in self.cell(i, j)) for j in range(self.cols)))
+        return '[' + '; '.join(rows) + ']'
+
+    # ------------------------- Estadísticas -------------------------
+    @property
+    def cell_sums(self):
+        if self._cell_sums is None:
+            self._cell_sums = np.bincount(self.cell_ids, weights=self.values,
+                                          minlength=self.rows * self.cols)
+        return self._cell_sums.reshape(self.rows, self.cols)
+
+    @property
+    def cell_means(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.cell_sums / self.n_ij
+
+    @property
+    def row_means(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.cell_sums.sum(axis=1) / self.n_ij.sum(axis=1)
+
+    @property
+    def col_means(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.cell_sums.sum(axis=0) / self.n_ij.sum(axis=0)
+
+    @property
+    def grand_mean(self):
+        if self.size == 0:
+            return float('nan')
+        return float(self.values.mean())
+
+    def residuals(self):
+        """Desviación de cada observación respecto de la media de su celda"""
+        return self.values - self.cell_means.ravel()[self.cell_ids]
+
+    def sums_of_squares(self):
+        """Descomposición de la suma de cuadrados del diseño de dos vías.
+
+        La interacción se obtiene como SS_celdas - SS_filas - SS_columnas, que es
+        exacta para diseños balanceados o proporcionales.
+        """
+        grand = self.grand_mean
+        n_ij = self.n_ij
+        total = float(np.sum((self.values - grand) ** 2))
+        cells = float(np.nansum(n_ij * (self.cell_means - grand) ** 2))
+        rows = float(np.nansum(n_ij.sum(axis=1) * (self.row_means - grand) ** 2))
+        cols = float(np.nansum(n_ij.sum(axis=0) * (self.col_means - grand) ** 2))
+        return {
+            'total': total,
+            'rows': rows,
+            'cols': cols,
+            'interaction': cells - rows - cols,
+            'within': total - cells,
+        }
+
+
+def declare_model(value, previous=None):
+    """Valor de `twoWayModel m = valor;`.
+
+    Si `m` ya fue declarado con `twoWayModel m[filas, columnas, n_ij]` se usa esa
+    forma y se validan los tamaños de celda; si no, cada fila del literal es una
+    celda de un modelo de una sola fila.
+    """
+    if isinstance(value, TwoWayModel):
+        return value
+    if isinstance(previous, TwoWayModel):
+        return previous.with_cells(value)
+    return TwoWayModel.from_cells(value)
+
+
+def model_from_counts(counts):
+    """Valor de `twoWayModel m[filas, columnas, n_ij];`"""
+    return TwoWayModel.from_counts(counts)
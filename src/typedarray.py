@@ -0,0 +1,154 @@
+"""Arrays declarados con `float x(n)`, `int x(n)` y `bool x(n)`.
+
+Los valores se guardan en un único buffer NumPy contiguo del tipo declarado
+(float64, int64 o bool) en lugar de una lista de objetos de Python: un array
+de n floats ocupa 8n bytes. Leer un elemento devuelve un escalar de Python,
+así que el resto del intérprete no nota la diferencia, y al imprimirse se ven
+igual que una lista.
+
+- Las escrituras verifican los límites: a diferencia de una lista, asignar
+  fuera del array o a un tramo más allá del final no lo agranda. Un valor que
+  no entra en el dtype es un InterpreterError.
+- Un tramo (`x[a:b]`) es una vista sobre el mismo buffer, sin copiar.
+- np.asarray(x) devuelve el buffer sin copiarlo.
+- Los operadores (`x * 2 + y`) se aplican a todo el array, ver src/vectorize.py;
+  asignar el resultado a un array declarado (`x = x * 2`) lo guarda de nuevo
+  como TypedArray del tipo declarado (ver retyped).
+
+Los tipos sin dtype (string) siguen usando una lista.
+"""
+import numpy as np
+
+DTYPES = {
+    'int': np.int64,
+    'float': np.float64,
+    'bool': np.bool_,
+}
+
+
+def _operators(op):
+    def method(self, other):
+        from src.vectorize import binary
+        return binary(op, self, other)
+
+    def reflected(self, other):
+        from src.vectorize import binary
+        return binary(op, other, self)
+    return method, reflected
+
+
+class ArrayOperators:
+    """Operadores de Python para arrays, calculados con src/vectorize.py.
+
+    Con ellos `x + 1` o `x * y` funcionan igual desde la máquina de pila, que
+    aplica los operadores de Python directamente. `__array_ufunc__ = None`
+    hace que un np.ndarray delegue en estos métodos en lugar de tratar el
+    objeto como un escalar.
+    """
+    __slots__ = ()
+    __array_ufunc__ = None
+
+    __add__, __radd__ = _operators('+')
+    __sub__, __rsub__ = _operators('-')
+    __mul__, __rmul__ = _operators('*')
+    __truediv__, __rtruediv__ = _operators('/')
+    __mod__, __rmod__ = _operators('%')
+    __pow__, __rpow__ = _operators('^')
+    __lt__, __gt__ = _operators('<')
+    __le__, __ge__ = _operators('<=')
+    __eq__, _ = _operators('==')
+    __ne__, _ = _operators('!=')
+    __hash__ = None
+
+    def __neg__(self):
+        from src.vectorize import unary
+        return unary('-', self)
+
+
+class TypedArray(ArrayOperators):
+    __slots__ = ('type', 'data')
+
+    def __init__(self, type_specifier, data):
+        self.type = type_specifier
+        self.data = data
+
+    @classmethod
+    def zeros(cls, type_specifier, size):
+        return cls(type_specifier, np.zeros(size, dtype=DTYPES[type_specifier]))
+
+    def __len__(self):
+        return self.data.size
+
+    def _position(self, i):
+        i = int(i)
+        if not -self.data.size <= i < self.data.size:
+            raise IndexError(f"Posición {i} fuera de un array de {self.data.size} valores")
+        return i
+
+    def _range(self, part):
+        start, stop, step = part.indices(self.data.size)
+        if step != 1:
+            raise IndexError("Sólo se admiten tramos contiguos")
+        if part.stop is not None and part.stop > self.data.size:
+            raise IndexError(f"Tramo [{start}:{part.stop}] fuera de un array de {self.data.size} valores")
+        return slice(start, max(start, stop))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TypedArray(self.type, self.data[self._range(i)])
+        return self.data[self._position(i)].item()
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            part = self._range(i)
+            if len(value) != part.stop - part.start:
+                raise ValueError(f"Se esperaban {part.stop - part.start} valores y hay {len(value)}")
+        else:
+            part = self._position(i)
+        try:
+            self.data[part] = value
+        except (OverflowError, ValueError):
+            # Un entero que no cabe en int64 (o float64), NaN en un array int, ...
+            from visitors.interpreter import InterpreterError
+            raise InterpreterError(f"Valor fuera de rango o inválido para un array {self.type}") from None
+
+    def __iter__(self):
+        return iter(self.data.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return self.data.astype(dtype or self.data.dtype)
+        return self.data if dtype is None else self.data.astype(dtype, copy=False)
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def __repr__(self):
+        return f"TypedArray({self.type}, {self.data.tolist()})"
+
+    def __str__(self):
+        return str(self.tolist())
+
+
+def retyped(type_specifier, value):
+    """Un ndarray o TypedArray de una dimensión como TypedArray nuevo del tipo declarado.
+
+    Los float pasan a int truncando, como al convertir un escalar; los que no
+    son finitos o no caben en int64 no se convierten (ValueError).
+    """
+    data = value.data if value.__class__ is TypedArray else value
+    if data.ndim != 1:
+        raise ValueError(f"un array de {data.ndim} dimensiones no cabe en un array declarado")
+    dtype = np.dtype(DTYPES[type_specifier])
+    if dtype.kind == 'i' and data.dtype.kind == 'f' and not np.all(np.abs(data) < 2.0 ** 63):
+        raise ValueError("valores que no son enteros de 64 bits")
+    # Siempre una copia, aunque el tipo ya coincida: `y = x` no debe compartir el buffer
+    # de x, y el resultado puede ser un array de otro valor (p. ej. Y.beta)
+    return TypedArray(type_specifier, data.astype(dtype))
+
+
+def new_array(type_specifier, size, default=None):
+    """Array de `size` valores por defecto: TypedArray si el tipo tiene dtype, si no una lista"""
+    if type_specifier in DTYPES:
+        return TypedArray.zeros(type_specifier, max(size, 0))
+    return [default] * size
@@ -0,0 +1,138 @@
+"""Operaciones del lenguaje sobre arrays completos, con broadcasting de NumPy.
+
+Si un operando de una operación aritmética o de comparación es un array
+(TypedArray, np.ndarray o una tabla irregular de un modelo, como Y.X o Y.R)
+la operación se aplica a todos sus elementos de una vez, con una función
+universal de NumPy, en lugar de recorrerlos uno por uno. Se mantienen las
+reglas de los escalares:
+
+- dividir o tomar módulo por un array con algún cero es un error;
+- `^` entre enteros con algún exponente negativo da float;
+- los bool se suman, restan y multiplican como enteros.
+
+Una tabla irregular (RaggedArray) opera sobre todos sus valores y conserva
+sus celdas: con un escalar o con otra tabla de las mismas celdas valor a
+valor, y con una tabla filas x columnas (p. ej. Y.n_ij o los ajustados) cada
+valor con el de su celda.
+
+`out`, si se da, es un array temporal que se puede reutilizar para guardar el
+resultado: así una expresión como `a * 2 + b - 1` reserva un solo array en
+lugar de uno por operación. Se usa sólo si el resultado tiene su mismo tipo y
+forma.
+"""
+import numpy as np
+
+from src.streak import LazyRunTable, RaggedArray
+from src.typedarray import TypedArray
+
+UFUNCS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.true_divide,
+    '%': np.remainder,
+    '^': np.power,
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+UNARY_UFUNCS = {
+    '-': np.negative,
+    '!': np.logical_not,
+}
+
+COMPARISONS = {'<', '<=', '>', '>=', '==', '!='}
+
+# Clases que se operan como arrays (se comparan por clase exacta: es lo más rápido)
+ARRAY_CLASSES = frozenset({np.ndarray, TypedArray, RaggedArray, LazyRunTable})
+
+
+def is_array(value):
+    return value.__class__ in ARRAY_CLASSES
+
+
+def operand(value):
+    """Datos de un operando como algo que NumPy opera directamente"""
+    if value.__class__ is TypedArray:
+        return value.data
+    if isinstance(value, (list, tuple)):
+        return np.asarray(value)
+    return value
+
+
+def cell_values(value, table):
+    """Operando de una operación con la tabla irregular `table`, alineado con sus valores"""
+    if isinstance(value, RaggedArray):
+        if (value.rows, value.cols) != (table.rows, table.cols) or not np.array_equal(
+                value.offsets, table.offsets):
+            raise TypeError(f"tablas con celdas distintas ({value.rows}x{value.cols} y {table.rows}x{table.cols})")
+        return value.values
+    value = operand(value)
+    if np.ndim(value) == 2 and np.shape(value) == (table.rows, table.cols):
+        return np.repeat(np.ravel(value), np.diff(table.offsets))
+    return value
+
+
+def fits(out, result_dtype, shapes):
+    try:
+        return out.dtype == result_dtype and out.shape == np.broadcast_shapes(*shapes)
+    except ValueError:
+        return False
+
+
+def apply_binary(op, a, b, out=None):
+    ufunc = UFUNCS.get(op)
+    if ufunc is None:
+        raise TypeError(f"'{op}' no se aplica a arrays")
+    if op in COMPARISONS:
+        result_dtype = np.bool_
+    else:
+        if op in ('/', '%') and np.any(np.equal(b, 0)):
+            raise ZeroDivisionError("División por cero" if op == '/' else "Módulo por cero")
+        result_dtype = np.result_type(a, b)
+        if result_dtype == np.bool_:
+            result_dtype = np.dtype(np.int64)
+            a = np.asarray(a, dtype=np.int64)
+        elif op == '^' and result_dtype.kind in 'iu' and np.any(np.less(b, 0)):
+            result_dtype = np.dtype(np.float64)
+            a = np.asarray(a, dtype=np.float64)
+        if op == '/':
+            result_dtype = np.result_type(result_dtype, np.float64)
+    try:
+        if out is not None and fits(out, result_dtype, (np.shape(a), np.shape(b))):
+            return ufunc(a, b, out=out)
+        return ufunc(a, b)
+    except ValueError as e:
+        # Formas que no se pueden combinar: es un error de operandos, como en los escalares
+        raise TypeError(str(e)) from None
+
+
+def binary(op, left, right, out=None):
+    """Resultado de `left op right` cuando alguno de los dos es un array"""
+    table = left if isinstance(left, RaggedArray) else right if isinstance(right, RaggedArray) else None
+    if table is None:
+        return apply_binary(op, operand(left), operand(right), out)
+    values = apply_binary(op, cell_values(left, table), cell_values(right, table),
+                          out.values if isinstance(out, RaggedArray) else None)
+    return RaggedArray(table.rows, table.cols, values, table.offsets)
+
+
+def unary(op, value, out=None):
+    """Resultado de `op value` para un array"""
+    table = value if isinstance(value, RaggedArray) else None
+    data = operand(value) if table is None else value.values
+    if op == '-' and np.result_type(data) == np.bool_:
+        data = np.asarray(data, dtype=np.int64)
+    out = out.values if isinstance(out, RaggedArray) else out
+    ufunc = UNARY_UFUNCS[op]
+    if out is not None and fits(out, np.bool_ if op == '!' else np.result_type(data), (np.shape(data),)):
+        result = ufunc(data, out=out)
+    else:
+        result = ufunc(data)
+    if table is None:
+        return result
+    return RaggedArray(table.rows, table.cols, result, table.offsets)
@@ -0,0 +1,53 @@
+"""Llamadas a funciones del programa, con y sin argumentos, en ambos motores."""
+import io
+
+import pytest
+
+from src.my_ast import FunctionCall
+from src.parser import parser
+from visitors import interpreter, vm
+from visitors.interpreter import InterpreterError
+
+ENGINES = [interpreter.run, vm.run]
+
+SOURCE = '''
+fn tres() { return 3; }
+fn doble(int x) { return x * 2; }
+print(tres());
+print(doble(tres()));
+'''
+
+
+def output(run, source):
+    stream = io.StringIO()
+    run(parser.parse(source), stream)
+    return stream.getvalue()
+
+
+def test_llamada_sin_argumentos_es_un_functioncall():
+    program = parser.parse('fn f() { return 1; }\nprint(f());\n')
+    call = program.statements[1].args[0]
+    assert isinstance(call, FunctionCall)
+    assert call.name == 'f'
+    assert call.args == []
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_llamada_sin_argumentos(run):
+    assert output(run, SOURCE) == '3\n6\n'
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_argumentos_de_mas_en_una_funcion_sin_parametros(run):
+    with pytest.raises(InterpreterError, match="'tres' espera 0 argumentos y recibió 1"):
+        output(run, 'fn tres() { return 3; }\nprint(tres(1));\n')
+
+
+@pytest.mark.parametrize('run', ENGINES)
+@pytest.mark.parametrize('statement', ['break', 'continue'])
+def test_break_en_una_funcion_no_sale_del_ciclo_que_la_llama(run, statement):
+    source = f'fn f() {{ {statement}; }}\nfor i in range(0, 3) {{ print(i); f(); }}\nprint(9);\n'
+    stream = io.StringIO()
+    with pytest.raises(InterpreterError, match="'break'/'continue' fuera de un ciclo"):
+        run(parser.parse(source), stream)
+    assert stream.getvalue() == '0\n'
@@ -0,0 +1,29 @@
+"""Archivos binarios de twoWayModel (src/modelfile.py)."""
+import numpy as np
+import pytest
+
+from src.modelfile import HEADER, MAGIC, load_model, save_model
+from src.twoway import ModelError, TwoWayModel
+
+
+def write_model(path, rows, cols, offsets, values):
+    header = np.array([(MAGIC, rows, cols, len(values))], dtype=HEADER)
+    with open(path, 'wb') as file:
+        file.write(header.tobytes())
+        file.write(np.asarray(offsets, dtype='<i8').tobytes())
+        file.write(np.asarray(values, dtype='<f8').tobytes())
+
+
+def test_guardar_y_cargar(tmp_path):
+    model = TwoWayModel(1, 2, np.array([1.0, 2.0, 3.0]), np.array([0, 1, 3]))
+    save_model(model, tmp_path / 'm.twm')
+    loaded = load_model('m.twm', base_dir=str(tmp_path))
+    assert loaded.n_ij.tolist() == [[1, 2]]
+    assert loaded.values.tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize('offsets', [[1, 2, 3], [0, 3, 2], [0, 1, 2]])
+def test_offsets_invalidos(tmp_path, offsets):
+    write_model(tmp_path / 'm.twm', 1, 2, offsets, [1.0, 2.0, 3.0])
+    with pytest.raises(ModelError, match="offsets de celda inválidos"):
+        load_model(str(tmp_path / 'm.twm'))
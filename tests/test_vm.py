@@ -0,0 +1,101 @@
+"""La máquina de pila da los mismos resultados y errores que el intérprete."""
+import io
+
+import numpy as np
+import pytest
+
+from src.modelfile import save_model
+from src.parser import parser
+from src.twoway import TwoWayModel
+from visitors import interpreter, vm
+from visitors.interpreter import InterpreterError
+from visitors.optimizer import optimize
+
+ENGINES = [interpreter.run, vm.run]
+
+
+def output(run, source, base_dir=None):
+    stream = io.StringIO()
+    run(parser.parse(source), stream, base_dir=base_dir)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize('run', ENGINES)
+@pytest.mark.parametrize('source, name', [
+    ('if (false) { x = 1; }\nprint(x);\n', 'x'),
+    ('for i in range(5, 1) { }\nprint(i);\n', 'i'),
+    ('int n = 0;\nwhile (n > 0) { w = 1; }\nprint(w);\n', 'w'),
+])
+def test_variable_asignada_en_un_solo_camino(run, source, name):
+    with pytest.raises(InterpreterError, match=f"Variable no definida: '{name}'"):
+        output(run, source)
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_variable_asignada_antes_y_en_el_ciclo(run):
+    source = 'float s = 0.0;\nfor i in range(0, 3) { s = s + i; z = i; }\nprint(s, i, z);\n'
+    assert output(run, source) == '3.0 2 2\n'
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_funcion_lee_global_declarada_despues(run):
+    source = 'fn f() { return g; }\nint g = 5;\nprint(f());\n'
+    assert output(run, source) == '5\n'
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_funcion_llamada_antes_de_asignar_la_global(run):
+    source = 'fn f() { return g; }\nprint(f());\nint g = 5;\n'
+    with pytest.raises(InterpreterError, match="Variable no definida: 'g'"):
+        output(run, source)
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_funcion_asigna_global(run):
+    source = 'fn f() { g = g + 1; h = 1; return h; }\nint g = 1;\nf();\nf();\nprint(g, f());\n'
+    assert output(run, source) == '3 1\n'
+
+
+@pytest.mark.parametrize('run', ENGINES)
+@pytest.mark.parametrize('source, message', [
+    ('for i in range(0, 3) { print(i); print(z * 2); }\n', "Variable no definida: 'z'"),
+    ('string s = "a";\nfor i in range(0, 3) { print(i); print(s - 1); }\n', "Operandos inválidos para '-'"),
+])
+def test_invariante_que_falla_despues_de_imprimir(run, source, message):
+    stream = io.StringIO()
+    with pytest.raises(InterpreterError, match=message):
+        run(optimize(parser.parse(source)), stream)
+    assert stream.getvalue() == '0\n'
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """Carpeta con m.twm, un modelo 1x1 con una observación"""
+    save_model(TwoWayModel(1, 1, np.array([1.5]), np.array([0, 1])), tmp_path / 'm.twm')
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('run', ENGINES)
+@pytest.mark.parametrize('op, message', [('/', 'División por cero'), ('%', 'Módulo por cero')])
+def test_division_por_cero_con_celda_de_modelo(run, op, message, model_dir):
+    # Las celdas de un modelo son escalares de NumPy, que dan inf o nan en lugar de fallar
+    with pytest.raises(InterpreterError, match=message):
+        output(run, f'twoWayModel m["m.twm"];\nprint(m[0][0][0] {op} 0);\n', model_dir)
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_asignar_un_array_lo_copia(run):
+    source = 'float x(2) = [1, 2];\nfloat y(2);\ny = x;\nx[1] = [9];\nprint(x, y);\n'
+    assert output(run, source) == '[9.0, 2.0] [1.0, 2.0]\n'
+
+
+@pytest.mark.parametrize('run', ENGINES)
+def test_miembro_del_lenguaje(run, model_dir):
+    assert output(run, 'twoWayModel m["m.twm"];\nprint(m.n_ij);\n', model_dir) == '[[1]]\n'
+
+
+@pytest.mark.parametrize('run', ENGINES)
+@pytest.mark.parametrize('member', ['with_cells', '_cell_ids', 'values'])
+def test_atributos_de_python_no_son_miembros(run, member, model_dir):
+    with pytest.raises(InterpreterError, match=f"'TwoWayModel' no tiene el miembro '{member}'"):
+        output(run, f'twoWayModel m["m.twm"];\nprint(m.{member});\n', model_dir)
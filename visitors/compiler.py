@@ -0,0 +1,697 @@
+"""Compilador del AST a bytecode plano para la máquina de pila de visitors/vm.py.
+
+Cada CodeObject guarda las instrucciones en una sola lista de enteros
+(código de operación seguido de sus argumentos), un pool de constantes y el
+número de ranuras locales. Los identificadores se resuelven en tiempo de
+compilación a índices de ranura y los saltos de if/while/for a posiciones
+absolutas dentro de la lista.
+
+Las funciones se compilan después del programa, con todas sus variables
+globales conocidas. Dentro de una función, un nombre que también es global
+se resuelve en ejecución como en el intérprete (LOAD_NAME/STORE_NAME): la
+variable local si ya tiene valor, si no la global.
+"""
+from operator import itemgetter
+
+from src.my_ast import (
+    ASTVisitor, ArrayAccess, BinaryOperation, FunctionCall, Identifier, KeyValuePair, Literal,
+    MemberAccess, PropertyAccess, StatFunction, TrigFunction, TwoWayModelExpression, UnaryOperation
+)
+from src.datablock import DataBlock
+from src.modelfile import load_model
+from src.streak import Effects
+from src.twoway import declare_model, model_from_counts
+from src.typedarray import DTYPES, new_array
+from visitors.interpreter import (
+    BINARY_OPERATORS, COERCIONS, CONTAINERS, DEFAULT_VALUES, STAT_FUNCTIONS, TRIG_FUNCTIONS,
+    InterpreterError, build_model, coerce_array, flatten, invalid_operands, truth
+)
+from visitors.reduction import loop_names, nest, reduce_loop
+
+
+class CompileError(Exception):
+    """Construcción del AST que el compilador no sabe traducir"""
+
+
+# ------------------------- Códigos de operación -------------------------
+(
+    LOAD_CONST, LOAD_SLOT, LOAD_SLOT_CHECKED, STORE_SLOT, LOAD_NAME, STORE_NAME,
+    POP, ADD, SUB, MUL, DIV, MOD, POW, LT, LE, GT, GE, EQ, NE, NEG, NOT,
+    JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, FOR_NEXT,
+    INDEX, GET_MEMBER, BUILD_LIST, PRINT, CALL, CALL_FUNCTION, DEFINE_FUNCTION,
+    RETURN_VALUE,
+) = range(34)
+
+OPCODE_NAMES = [
+    'LOAD_CONST', 'LOAD_SLOT', 'LOAD_SLOT_CHECKED', 'STORE_SLOT', 'LOAD_NAME', 'STORE_NAME',
+    'POP', 'ADD', 'SUB', 'MUL', 'DIV', 'MOD', 'POW', 'LT', 'LE', 'GT', 'GE', 'EQ', 'NE', 'NEG', 'NOT',
+    'JUMP', 'JUMP_IF_FALSE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'FOR_NEXT',
+    'INDEX', 'GET_MEMBER', 'BUILD_LIST', 'PRINT', 'CALL', 'CALL_FUNCTION', 'DEFINE_FUNCTION',
+    'RETURN_VALUE',
+]
+
+# Número de argumentos de cada instrucción
+ARITY = [0] * len(OPCODE_NAMES)
+for _op in (LOAD_CONST, LOAD_SLOT, LOAD_SLOT_CHECKED, STORE_SLOT,
+            JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+            GET_MEMBER, BUILD_LIST, PRINT, DEFINE_FUNCTION):
+    ARITY[_op] = 1
+for _op in (LOAD_NAME, STORE_NAME, CALL, CALL_FUNCTION):
+    ARITY[_op] = 2
+ARITY[FOR_NEXT] = 3
+
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV, '%': MOD, '^': POW,
+    '<': LT, '<=': LE, '>': GT, '>=': GE, '==': EQ, '!=': NE,
+}
+
+UNARY_OPCODES = {'-': NEG, '!': NOT}
+
+
+class CodeObject:
+    def __init__(self, name, code, consts, slot_names, params=()):
+        self.name = name
+        self.code = code
+        self.consts = consts
+        self.slot_names = slot_names
+        self.nslots = len(slot_names)
+        self.params = params
+
+    def disassemble(self):
+        lines = []
+        pc = 0
+        while pc < len(self.code):
+            op = self.code[pc]
+            args = self.code[pc + 1:pc + 1 + ARITY[op]]
+            lines.append(f"{pc:5} {OPCODE_NAMES[op]:<22} {' '.join(map(str, args))}")
+            pc += 1 + ARITY[op]
+        return '\n'.join(lines)
+
+
+# ------------------------- Funciones auxiliares del runtime -------------------------
+def make_coercion(type_specifier):
+    convert = COERCIONS[type_specifier]
+
+    def coerce(value):
+        if value is None or isinstance(value, CONTAINERS):
+            return value
+        try:
+            return convert(value)
+        except (TypeError, ValueError, OverflowError):
+            raise InterpreterError(f"No se puede convertir {value!r} a {type_specifier}")
+    return coerce
+
+def make_array_coercion(type_specifier):
+    return lambda value: coerce_array(type_specifier, value)
+
+def make_stat_function(name):
+    function = STAT_FUNCTIONS[name]
+
+    def call(*args):
+        values = flatten(args)
+        if not values:
+            raise InterpreterError(f"'{name}' requiere al menos un valor")
+        return function(values)
+    return call
+
+def make_pair(key, value):
+    return (key, value)
+
+def model_builder(factory):
+    return lambda *args: build_model(factory, *args)
+
+def make_binary(op):
+    function = BINARY_OPERATORS[op]
+
+    def apply(left, right):
+        try:
+            return function(left, right)
+        except TypeError:
+            raise invalid_operands(op, left, right)
+    return apply
+
+def make_array_builder(name, type_specifier):
+    default = DEFAULT_VALUES.get(type_specifier)
+    convert = make_coercion(type_specifier) if type_specifier in COERCIONS else (lambda v: v)
+
+    def build(size, initial):
+        size = int(size)
+        array = new_array(type_specifier, size, default)
+        if initial is not None:
+            initial = flatten(initial)
+            if len(initial) > size:
+                raise InterpreterError(f"Demasiados valores para '{name}({size})'")
+            array[:len(initial)] = [convert(v) for v in initial]
+        return array
+    return build
+
+def make_reduction(node, names, declared):
+    """Runtime de un ReductionLoop: recibe los valores de loop_names(node) y devuelve los
+    nuevos del acumulador y de las variables de los ciclos, o None si hay que ejecutar el ciclo"""
+    assigned = len(nest(node)[0]) + 1
+
+    def reduce(*values):
+        result = reduce_loop(node, dict(zip(names, values)), declared)
+        if result is None:
+            return None
+        return tuple(result.get(name, value) for name, value in zip(names[:assigned], values))
+    return reduce
+
+def make_array_assigner(name, type_specifier):
+    convert = make_coercion(type_specifier) if type_specifier in COERCIONS else (lambda v: v)
+
+    def assign(target, count, values):
+        count = int(count)
+        values = flatten(values)
+        if len(values) != count:
+            raise InterpreterError(f"'{name}[{count}]' espera {count} valores y recibió {len(values)}")
+        if count > len(target):
+            raise InterpreterError(f"Índice fuera de rango en '{name}[{count}]'")
+        target[:count] = [convert(v) for v in values]
+    return assign
+
+def outside_loop():
+    # Como en el intérprete, el error aparece recién al ejecutar la sentencia
+    raise InterpreterError("'break'/'continue' fuera de un ciclo")
+
+
+EXPRESSION_NODES = (
+    BinaryOperation, UnaryOperation, FunctionCall, Identifier, Literal,
+    MemberAccess, PropertyAccess, ArrayAccess, TrigFunction, StatFunction,
+    TwoWayModelExpression, KeyValuePair,
+)
+
+def is_expression(node):
+    """Indica si una sentencia es una expresión suelta (deja un valor en la pila)"""
+    return isinstance(node, EXPRESSION_NODES)
+
+
+COMPARISON_OPERATORS = {'<', '<=', '>', '>=', '==', '!=', '&', '|'}
+
+NUMERIC_TYPES = {'int', 'float'}
+
+
+class Scope:
+    """Tabla de símbolos de un CodeObject: nombre -> (ranura, tipo declarado)"""
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.slots = {}
+        self.types = {}
+        self.arrays = set()  # declaradas como arrays con dtype (`float x(n)`)
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def names(self):
+        return sorted(self.slots, key=self.slots.get)
+
+
+class Compiler(ASTVisitor):
+    """Traduce un Program (o el cuerpo de una función) a un CodeObject"""
+
+    def __init__(self, name='<programa>', parent=None, params=(), base_dir=None):
+        self.name = name
+        self.base_dir = parent.base_dir if parent else base_dir  # ver Interpreter.base_dir
+        self.scope = Scope(parent.scope if parent else None)
+        self.code = []
+        self.consts = []
+        self.const_index = {}
+        self.loops = []  # (posiciones de 'continue', posiciones de 'break') por ciclo
+        self.functions = []  # (FunctionDeclaration, constante del CodeObject) pendientes
+        self.params = tuple(params)
+        # Variables asignadas en todos los caminos hasta la instrucción actual:
+        # sólo esas se leen sin verificar que la ranura no esté en UNSET
+        self.assigned = set()
+        for param in self.params:
+            self.scope.slot(param.identifier)
+            self.scope.types[param.identifier] = param.type
+            self.assigned.add(param.identifier)
+
+    @classmethod
+    def compile_program(cls, program, base_dir=None):
+        compiler = cls(base_dir=base_dir)
+        compiler.visit(program)
+        return compiler.finish()
+
+    def finish(self):
+        self.emit(LOAD_CONST, self.const(None))
+        self.emit(RETURN_VALUE)
+        for node, index in self.functions:
+            compiler = Compiler(node.name, parent=self, params=node.params)
+            compiler.block(node.body)
+            self.consts[index] = compiler.finish()
+        return CodeObject(self.name, self.code, self.consts, self.scope.names(), self.params)
+
+    # ------------------------- Emisión -------------------------
+    def emit(self, op, *args):
+        self.code.append(op)
+        self.code.extend(args)
+        return len(self.code) - len(args)  # posición del primer argumento
+
+    def patch(self, position, target=None):
+        self.code[position] = len(self.code) if target is None else target
+
+    def const(self, value):
+        key = (type(value), value) if isinstance(value, (int, float, str, bool, type(None))) else id(value)
+        if key not in self.const_index:
+            self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return self.const_index[key]
+
+    def load(self, name):
+        if name in self.assigned:
+            self.emit(LOAD_SLOT, self.scope.slots[name])
+        elif self.is_shared(name):
+            self.emit(LOAD_NAME, self.scope.slot(name), self.scope.parent.slots[name])
+        else:
+            # Puede no estar asignada todavía (p. ej. sólo en una rama de un if): se verifica en ejecución
+            self.emit(LOAD_SLOT_CHECKED, self.scope.slot(name))
+
+    def branch(self, before, block):
+        """Compila un bloque que puede no ejecutarse; devuelve lo que queda asignado al terminarlo"""
+        self.assigned = set(before)
+        self.block(block)
+        return self.assigned
+
+    def is_known(self, name):
+        """Indica si name tiene una ranura local que se puede leer sin resolverla en ejecución"""
+        return name in self.scope.slots and not self.is_shared(name)
+
+    def load_unchecked(self, name):
+        """Como load, pero una variable sin asignar queda en la pila como UNSET (ver visitors/vm.py)"""
+        self.emit(LOAD_SLOT, self.scope.slot(name))
+
+    def is_shared(self, name):
+        """En una función: nombre que también es global y que se resuelve en ejecución"""
+        return (self.scope.parent is not None and name in self.scope.parent.slots
+                and name not in self.assigned and '$' not in name)
+
+    def store(self, name, type_specifier=None, declare=False, value_type=None):
+        """Guarda el tope de la pila; omite la conversión si el tipo estático ya coincide"""
+        shared = not declare and self.is_shared(name)
+        scope = self.scope
+        if type_specifier is not None:
+            scope.types[name] = type_specifier
+        if declare:
+            scope.arrays.discard(name)
+        # Sin declaración local, la conversión es la de la variable global
+        owner = scope.parent if shared and name not in scope.types else scope
+        declared = owner.types.get(name)
+        if name in owner.arrays:
+            self.emit(CALL, self.const(make_array_coercion(declared)), 1)
+        elif declared in COERCIONS and declared != value_type:
+            self.emit(CALL, self.const(make_coercion(declared)), 1)
+        if shared:
+            self.emit(STORE_NAME, scope.slot(name), scope.parent.slots[name])
+        else:
+            self.emit(STORE_SLOT, scope.slot(name))
+            self.assigned.add(name)
+
+    def static_type(self, node):
+        """Tipo estático de una expresión cuando se puede deducir sin ejecutarla"""
+        if isinstance(node, Literal):
+            return None if isinstance(node.value, list) else node.type
+        if isinstance(node, Identifier):
+            name = node.name
+            if self.is_shared(name):
+                return None  # local o global según la ejecución
+            scope = self.scope
+            # El tipo declarado de un array es el de sus elementos, no el suyo
+            return None if name in scope.arrays else scope.types.get(name)
+        if isinstance(node, UnaryOperation):
+            return 'bool' if node.op == '!' else self.static_type(node.operand)
+        if isinstance(node, BinaryOperation):
+            if node.op in COMPARISON_OPERATORS:
+                return 'bool'
+            left, right = self.static_type(node.left), self.static_type(node.right)
+            if left not in NUMERIC_TYPES or right not in NUMERIC_TYPES:
+                return None
+            if node.op == '/' or 'float' in (left, right):
+                return 'float'
+            return 'int' if node.op in ('+', '-', '*', '%') else None
+        if isinstance(node, TrigFunction):
+            return 'float'
+        return None
+
+    def block(self, block):
+        for stmt in block if isinstance(block, list) else [block]:
+            self.visit(stmt)
+            if is_expression(stmt):
+                self.emit(POP)
+
+    def generic_visit(self, node):
+        raise CompileError(f"No se puede compilar {node.__class__.__name__}")
+
+    # ------------------------- Sentencias -------------------------
+    def visit_program(self, node):
+        self.block(node.statements)
+
+    def visit_list(self, node):
+        self.block(node)
+
+    def visit_nonetype(self, node):
+        pass
+
+    def statement_expression(self, node):
+        self.visit(node)
+        if is_expression(node):
+            self.emit(POP)
+
+    def visit_declaration(self, node):
+        if node.type == 'twoWayModel':
+            self.visit(node.value)
+            self.emit(LOAD_SLOT, self.scope.slot(node.identifier))  # declaración previa, si la hay
+            self.emit(CALL, self.const(model_builder(declare_model)), 2)
+            self.store(node.identifier, node.type, declare=True)
+            return
+        if node.value is None:
+            self.emit(LOAD_CONST, self.const(DEFAULT_VALUES.get(node.type)))
+        else:
+            self.visit(node.value)
+        self.store(node.identifier, node.type, declare=True, value_type=self.static_type(node.value))
+
+    def visit_arraydeclaration(self, node):
+        self.visit(node.size)
+        if node.value is None:
+            self.emit(LOAD_CONST, self.const(None))
+        else:
+            self.values(node.value)
+        self.emit(CALL, self.const(make_array_builder(node.identifier, node.type)), 2)
+        self.store(node.identifier, node.type, declare=True)
+        if node.type in DTYPES:
+            self.scope.arrays.add(node.identifier)
+
+    def visit_matrixdeclaration(self, node):
+        self.matrix(node.data.value if isinstance(node.data, Literal) else node.data)
+        self.emit(CALL, self.const(model_builder(model_from_counts)), 1)
+        self.store(node.name, 'twoWayModel', declare=True)
+
+    def visit_modelfiledeclaration(self, node):
+        self.emit(LOAD_CONST, self.const(node.path))
+        self.emit(LOAD_CONST, self.const(self.base_dir))
+        self.emit(CALL, self.const(model_builder(load_model)), 2)
+        self.store(node.name, 'twoWayModel', declare=True)
+
+    def visit_specialdeclaration(self, node):
+        if node.dimensions is None:
+            self.emit(LOAD_CONST, self.const(None))
+        else:
+            for arg in node.dimensions:
+                self.visit(arg)
+            self.emit(BUILD_LIST, len(node.dimensions))
+            if node.decl_type == 'efects':
+                self.emit(CALL, self.const(model_builder(Effects.from_args)), 1)
+        self.store(node.identifier, node.decl_type, declare=True)
+
+    def visit_assignment(self, node):
+        self.visit(node.expression)
+        self.store(node.identifier.name, value_type=self.static_type(node.expression))
+
+    def visit_arrayassignment(self, node):
+        name = node.array_name.name
+        self.load(name)
+        self.visit(node.index)
+        self.values(node.values)
+        self.emit(CALL, self.const(make_array_assigner(name, self.scope.types.get(name))), 3)
+        self.emit(POP)
+
+    def visit_functiondeclaration(self, node):
+        # El CodeObject se arma en finish(), cuando ya se conocen todas las globales
+        self.consts.append(None)
+        self.functions.append((node, len(self.consts) - 1))
+        self.emit(DEFINE_FUNCTION, len(self.consts) - 1)
+
+    def visit_ifstatement(self, node):
+        before = self.assigned
+        paths = []
+        exits = []
+        jump = self.condition(node.condition)
+        paths.append(self.branch(before, node.true_block))
+        exits.append(self.emit(JUMP, 0))
+        self.patch(jump)
+        for elif_block in node.elif_blocks:
+            self.assigned = before
+            jump = self.condition(elif_block.condition)
+            paths.append(self.branch(before, elif_block.block))
+            exits.append(self.emit(JUMP, 0))
+            self.patch(jump)
+        if node.false_block is not None:
+            paths.append(self.branch(before, node.false_block))
+        else:
+            paths.append(before)
+        for position in exits:
+            self.patch(position)
+        # Después del if sólo cuenta lo que asignan todas las ramas
+        self.assigned = set.intersection(*paths)
+
+    def condition(self, expression):
+        self.visit(expression)
+        return self.emit(JUMP_IF_FALSE, 0)
+
+    def loop(self, body):
+        """Compila el cuerpo de un ciclo y devuelve los saltos pendientes de 'continue'/'break'"""
+        self.loops.append(([], []))
+        self.block(body)
+        return self.loops.pop()
+
+    def visit_whilestatement(self, node):
+        before = self.assigned
+        start = len(self.code)
+        exit_jump = self.condition(node.condition)
+        self.assigned = set(before)
+        continues, breaks = self.loop(node.body)
+        self.assigned = before  # el cuerpo puede no ejecutarse
+        self.emit(JUMP, start)
+        for position in continues:
+            self.patch(position, start)
+        self.patch(exit_jump)
+        for position in breaks:
+            self.patch(position)
+
+    def visit_forstatement(self, node):
+        self.statement_expression(node.init)
+        before = self.assigned
+        start = len(self.code)
+        exit_jump = self.condition(node.condition)
+        self.assigned = set(before)
+        continues, breaks = self.loop(node.body)
+        update = len(self.code)
+        # Un 'continue' salta al update desde cualquier punto del cuerpo
+        self.assigned = set(before)
+        self.statement_expression(node.update)
+        self.assigned = before
+        self.emit(JUMP, start)
+        for position in continues:
+            self.patch(position, update)
+        self.patch(exit_jump)
+        for position in breaks:
+            self.patch(position)
+
+    def visit_forrangestatement(self, node):
+        # Ranuras ocultas contiguas: contador y límite del rango
+        counter = self.scope.slot(f'{node.var}$cont{len(self.code)}')
+        self.visit(node.start)
+        self.emit(CALL, self.const(int), 1)
+        self.emit(STORE_SLOT, counter)
+        limit = self.scope.slot(f'{node.var}$fin{len(self.code)}')
+        self.visit(node.end)
+        self.emit(CALL, self.const(int), 1)
+        self.emit(STORE_SLOT, limit)
+        var = self.scope.slot(node.var)
+        self.scope.types.setdefault(node.var, 'int')
+        before = self.assigned
+        self.assigned = set(before)
+        if node.invariants:
+            # Invariantes extraídos por el optimizador: una vez, si el rango no es vacío
+            self.emit(LOAD_SLOT, counter)
+            self.emit(LOAD_SLOT, limit)
+            self.emit(LT)
+            skip = self.emit(JUMP_IF_FALSE, 0)
+            self.block(node.invariants)
+            self.patch(skip)
+
+        start = len(self.code)
+        exit_jump = self.emit(FOR_NEXT, counter, var, 0) + 2
+        # Las invariantes corren si el rango no es vacío, igual que el cuerpo
+        self.assigned.add(node.var)
+        continues, breaks = self.loop(node.body)
+        self.assigned = before  # con un rango vacío no se asigna nada, ni la variable del ciclo
+        self.emit(JUMP, start)
+        for position in continues:
+            self.patch(position, start)
+        self.patch(exit_jump)
+        for position in breaks:
+            self.patch(position)
+
+    def visit_reductionloop(self, node):
+        # El runtime devuelve None si el nido no se puede vectorizar: entonces se ejecuta el ciclo
+        loops, _ = nest(node)
+        loop_vars = [loop.var for loop in loops]
+        names = loop_names(node)
+        if not all(self.is_known(name) for name in names if name not in loop_vars):
+            # Una variable sin ranura todavía se lee con verificación dentro del ciclo
+            self.visit(node.loop)
+            return
+        for name in names:
+            if name in loop_vars:
+                self.emit(LOAD_SLOT, self.scope.slot(name))  # como en FOR_NEXT, siempre locales
+            else:
+                self.load_unchecked(name)
+        declared = self.scope.types.get(node.accumulator)
+        before = self.assigned
+        self.assigned = set(before)
+        self.emit(CALL, self.const(make_reduction(node, names, declared)), len(names))
+        result = self.scope.slot(f'$red{len(self.code)}')
+        self.emit(STORE_SLOT, result)
+        self.emit(LOAD_SLOT, result)
+        fallback = self.emit(JUMP_IF_FALSE, 0)
+        for k, name in enumerate([node.accumulator] + loop_vars):
+            self.emit(LOAD_SLOT, result)
+            self.emit(CALL, self.const(itemgetter(k)), 1)
+            if k == 0:
+                self.store(name, value_type=declared)  # reduce_loop ya aplicó el tipo declarado
+            else:
+                self.emit(STORE_SLOT, self.scope.slot(name))
+        done = self.emit(JUMP, 0)
+        self.patch(fallback)
+        self.assigned = before
+        self.visit(node.loop)
+        self.patch(done)
+        self.assigned = before  # el ciclo puede no asignar nada
+
+    # ------------------------- Expresiones -------------------------
+    def visit_literal(self, node):
+        if isinstance(node.value, list):
+            self.matrix(node.value)
+        else:
+            self.emit(LOAD_CONST, self.const(node.value))
+
+    def visit_identifier(self, node):
+        self.load(node.name)
+
+    def visit_binaryoperation(self, node):
+        if node.op in ('&', '|'):
+            self.visit(node.left)
+            self.emit(CALL, self.const(truth), 1)
+            jump = self.emit(JUMP_IF_FALSE_OR_POP if node.op == '&' else JUMP_IF_TRUE_OR_POP, 0)
+            self.visit(node.right)
+            self.emit(CALL, self.const(truth), 1)
+            self.patch(jump)
+            return
+        opcode = BINARY_OPCODES.get(node.op)
+        if opcode is None and node.op not in BINARY_OPERATORS:
+            raise CompileError(f"Operador no soportado: '{node.op}'")
+        self.visit(node.left)
+        self.visit(node.right)
+        if opcode is None:
+            # Operadores sin instrucción propia (p. ej. '~') se llaman como función
+            self.emit(CALL, self.const(make_binary(node.op)), 2)
+        else:
+            self.emit(opcode)
+
+    def visit_unaryoperation(self, node):
+        self.visit(node.operand)
+        self.emit(UNARY_OPCODES[node.op])
+
+    def visit_functioncall(self, node):
+        for arg in node.args:
+            self.visit(arg)
+        self.emit(CALL_FUNCTION, self.const(node.name), len(node.args))
+
+    def visit_memberaccess(self, node):
+        self.visit(node.base)
+        if node.index is not None:
+            self.visit(node.index)
+            self.emit(INDEX)
+        if node.member is not None:
+            self.emit(GET_MEMBER, self.const(node.member))
+
+    def visit_propertyaccess(self, node):
+        self.visit(node.object)
+        self.emit(GET_MEMBER, self.const(node.property))
+
+    def visit_arrayaccess(self, node):
+        self.visit(node.array)
+        self.visit(node.index)
+        self.emit(INDEX)
+
+    def matrix(self, rows):
+        if isinstance(rows, DataBlock):
+            self.emit(LOAD_CONST, self.const(rows))
+            return
+        for row in rows:
+            if isinstance(row, list):
+                for item in row:
+                    if isinstance(item, (int, float)):
+                        self.emit(LOAD_CONST, self.const(item))
+                    else:
+                        self.visit(item)
+                self.emit(BUILD_LIST, len(row))
+            else:
+                self.emit(LOAD_CONST, self.const(row))
+        self.emit(BUILD_LIST, len(rows))
+
+    def values(self, literal):
+        if isinstance(literal, list):
+            for item in literal:
+                self.visit(item)
+            self.emit(BUILD_LIST, len(literal))
+        else:
+            self.visit(literal)
+
+    # ------------------------- Sentencias y funciones del lenguaje -------------------------
+    def visit_printstatement(self, node):
+        for arg in node.args:
+            self.visit(arg)
+        self.emit(PRINT, len(node.args))
+
+    def visit_returnstatement(self, node):
+        if node.value is None:
+            self.emit(LOAD_CONST, self.const(None))
+        else:
+            self.visit(node.value)
+        self.emit(RETURN_VALUE)
+
+    def visit_breakstatement(self, node):
+        if not self.loops:
+            self.emit(CALL, self.const(outside_loop), 0)
+            return
+        self.loops[-1][1].append(self.emit(JUMP, 0))
+
+    def visit_continuestatement(self, node):
+        if not self.loops:
+            self.emit(CALL, self.const(outside_loop), 0)
+            return
+        self.loops[-1][0].append(self.emit(JUMP, 0))
+
+    def visit_trigfunction(self, node):
+        self.visit(node.argument)
+        self.emit(CALL, self.const(TRIG_FUNCTIONS[node.function]), 1)
+
+    def visit_statfunction(self, node):
+        if node.function == 'efects':
+            for arg in node.args:
+                self.visit(arg)
+            self.emit(BUILD_LIST, len(node.args))
+            self.emit(CALL, self.const(model_builder(Effects.from_args)), 1)
+            return
+        if node.function not in STAT_FUNCTIONS:
+            raise CompileError(f"Función '{node.function}' no soportada")
+        for arg in node.args:
+            self.visit(arg)
+        self.emit(CALL, self.const(make_stat_function(node.function)), len(node.args))
+
+    def visit_twowaymodelexpression(self, node):
+        self.visit(node.expression)
+        self.emit(CALL, self.const(model_builder(declare_model)), 1)
+
+    def visit_keyvaluepair(self, node):
+        self.visit(node.key)
+        self.visit(node.value)
+        self.emit(CALL, self.const(make_pair), 2)
+
+
+def compile_program(program, base_dir=None):
+    return Compiler.compile_program(program, base_dir)
@@ -0,0 +1,422 @@
+"""Pase de optimización del AST, antes de interpretarlo o compilarlo.
+
+- Plegado de constantes: BinaryOperation, UnaryOperation y TrigFunction
+  con operandos literales se reemplazan por su valor,
+  calculado con las mismas tablas que el intérprete. Las operaciones que
+  fallarían (división por cero, tipos inválidos) se dejan para que el error
+  aparezca al ejecutarlas.
+- Propagación de constantes: una variable declarada en el nivel superior con
+  un valor literal y que nunca se vuelve a escribir se reemplaza por ese
+  valor en las sentencias siguientes.
+- Invariantes de ciclo: las subexpresiones de un for-range que no dependen
+  de variables escritas en el cuerpo se calculan una sola vez, en
+  ForRangeStatement.invariants, que se ejecuta antes de la primera vuelta y
+  sólo si el rango no es vacío.
+- Reducciones: un nido de for-range rectangular cuyo cuerpo es sólo
+  `acc = acc + t1 + ...` (o con '-', o `acc = acc * t`) se reemplaza por un
+  ReductionLoop, que evalúa los términos de todas las vueltas a la vez
+  (ver visitors/reduction.py). Se aplica antes que los invariantes.
+"""
+from src.my_ast import (
+    ASTNode, ASTVisitor, ArrayAccess, ArrayAssignment, ArrayDeclaration, Assignment,
+    BinaryOperation, BooleanLiteral, BreakStatement, ContinueStatement, Declaration,
+    FloatLiteral, ForRangeStatement, FunctionCall, Identifier, IfStatement, IntegerLiteral,
+    Literal, MatrixDeclaration, MemberAccess, ModelFileDeclaration, Parameter, PrintStatement,
+    PropertyAccess, ReductionLoop, ReturnStatement, SpecialDeclaration, StatFunction, StringLiteral,
+    TwoWayModelExpression, UnaryOperation, WhileStatement, walk
+)
+from visitors.compiler import EXPRESSION_NODES
+from visitors.interpreter import (
+    BINARY_OPERATORS, COERCIONS, TRIG_FUNCTIONS, UNARY_OPERATORS, Interpreter, InterpreterError
+)
+from visitors.reduction import nest, reduction_terms
+
+# Clase de literal para cada tipo de valor plegado (bool antes que int)
+LITERAL_CLASSES = (
+    (bool, BooleanLiteral), (int, IntegerLiteral), (float, FloatLiteral), (str, StringLiteral),
+)
+
+# Errores que deja una operación al plegarla: se conserva sin plegar
+FOLD_ERRORS = (InterpreterError, TypeError, ValueError, OverflowError, ZeroDivisionError)
+
+# Bits máximos de un entero calculado con '^' al plegar
+MAX_POWER_BITS = 4096
+
+JUMP_NODES = (BreakStatement, ContinueStatement, ReturnStatement)
+# Lecturas de valores que una ArrayAssignment puede modificar
+ACCESS_NODES = (MemberAccess, ArrayAccess, PropertyAccess, StatFunction)
+# Expresiones que se pueden evaluar con las variables de un ciclo como mallas de índices
+GRID_NODES = (Identifier, Literal, BinaryOperation, UnaryOperation, ArrayAccess, MemberAccess, PropertyAccess)
+# Operadores que no fallan con números (división, módulo y potencia sí: 0 ^ -1)
+SAFE_OPERATORS = {'+', '-', '*', '<', '<=', '>', '>=', '==', '!=', '&', '|'}
+# Tipos declarados cuyas variables siempre tienen un valor numérico (la asignación convierte)
+NUMERIC_TYPES = {'int', 'float', 'bool'}
+
+
+def can_fail(node, numeric):
+    """Indica si evaluar el nodo (sin sus hijos) puede lanzar un error.
+
+    Sólo no fallan los literales numéricos, las variables de numeric (con un
+    valor numérico seguro) y los operadores de SAFE_OPERATORS y unarios; una
+    variable cualquiera puede no estar definida o ser una cadena o un array.
+    """
+    if isinstance(node, Literal):
+        return not isinstance(node.value, (bool, int, float))
+    if isinstance(node, Identifier):
+        return node.name not in numeric
+    return not (isinstance(node, UnaryOperation) or isinstance(node, BinaryOperation) and node.op in SAFE_OPERATORS)
+
+
+def literal_node(value, position=None):
+    """Literal con el valor de una operación plegada, o None si no es escalar"""
+    for kind, cls in LITERAL_CLASSES:
+        if isinstance(value, kind):
+            node = cls(value)
+            if position is not None:
+                node.lineno, node.lexpos = position.lineno, position.lexpos
+            return node
+    return None
+
+
+def is_constant(node):
+    return isinstance(node, Literal) and isinstance(node.value, (bool, int, float, str))
+
+
+def targets(node):
+    """Nombres que escriben las sentencias bajo node"""
+    for item in walk(node):
+        if isinstance(item, (Declaration, ArrayDeclaration, SpecialDeclaration, Parameter)):
+            yield item.identifier
+        elif isinstance(item, (MatrixDeclaration, ModelFileDeclaration)):
+            yield item.name
+        elif isinstance(item, Assignment):
+            yield item.identifier.name
+        elif isinstance(item, ArrayAssignment):
+            yield item.array_name.name
+        elif isinstance(item, ForRangeStatement):
+            yield item.var
+
+
+def numeric_names(program):
+    """Nombres que sólo se declaran con tipos numéricos: asignarles otro valor lo convierte o falla"""
+    numeric, excluded = set(), set()
+    for item in walk(program):
+        if isinstance(item, Declaration) and item.type in NUMERIC_TYPES:
+            numeric.add(item.identifier)
+        elif isinstance(item, (Declaration, ArrayDeclaration, SpecialDeclaration, Parameter)):
+            excluded.add(item.identifier)
+        elif isinstance(item, (MatrixDeclaration, ModelFileDeclaration)):
+            excluded.add(item.name)
+        elif isinstance(item, ArrayAssignment):
+            excluded.add(item.array_name.name)
+    return numeric - excluded
+
+
+def reads(node):
+    """Nombres de variables que lee la expresión node"""
+    for item in walk(node):
+        if isinstance(item, Identifier):
+            yield item.name
+
+
+class Optimizer(ASTVisitor):
+    """Transforma el AST en el lugar; cada visit_* devuelve el nodo resultante"""
+
+    def __init__(self):
+        self.constants = {}
+        self.candidates = set()
+        self.temporaries = 0
+        self.typed = set()  # ver numeric_names
+        self.numeric = set()  # de typed, las ya declaradas en el nivel superior
+
+    def optimize(self, program):
+        writes = {}
+        for name in targets(program):
+            writes[name] = writes.get(name, 0) + 1
+        self.candidates = {name for name, count in writes.items() if count == 1}
+        self.typed = numeric_names(program)
+        return self.visit(program)
+
+    def transform(self, value):
+        if isinstance(value, ASTNode):
+            return self.visit(value)
+        if isinstance(value, list):
+            return [self.transform(item) for item in value]
+        return value
+
+    def generic_visit(self, node):
+        for name in node._children:
+            setattr(node, name, self.transform(getattr(node, name)))
+        return node
+
+    # ------------------------- Sentencias -------------------------
+    def visit_program(self, node):
+        # Sólo las declaraciones del nivel superior se ejecutan siempre y en orden
+        statements = node.statements
+        for k, statement in enumerate(statements):
+            statements[k] = statement = self.transform(statement)
+            if isinstance(statement, Declaration):
+                self.propagate(statement)
+                if statement.identifier in self.typed:
+                    self.numeric.add(statement.identifier)
+        return node
+
+    def visit_functiondeclaration(self, node):
+        # El cuerpo puede ejecutarse antes de que se declare cualquier global
+        numeric, self.numeric = self.numeric, set()
+        self.generic_visit(node)
+        self.numeric = numeric
+        return node
+
+    def propagate(self, node):
+        name = node.identifier
+        if name not in self.candidates or node.type not in COERCIONS or not is_constant(node.value):
+            return
+        try:
+            self.constants[name] = Interpreter.coerce(node.type, node.value.value)
+        except InterpreterError:
+            pass
+
+    def visit_assignment(self, node):
+        node.expression = self.transform(node.expression)
+        return node
+
+    def visit_arrayassignment(self, node):
+        node.index = self.transform(node.index)
+        node.values = self.transform(node.values)
+        return node
+
+    def visit_forrangestatement(self, node):
+        node.start = self.transform(node.start)
+        node.end = self.transform(node.end)
+        node.body = self.transform(node.body)
+        reduction = reduction_loop(node)
+        if reduction is not None:
+            return reduction
+        LoopInvariants(self, node).hoist()
+        return node
+
+    def visit_reductionloop(self, node):
+        return node
+
+    # ------------------------- Expresiones -------------------------
+    def visit_identifier(self, node):
+        if node.name in self.constants:
+            return literal_node(self.constants[node.name], node)
+        return node
+
+    def visit_literal(self, node):
+        if isinstance(node.value, list):
+            # Filas de una matriz: los elementos plegados quedan como valores
+            node.value = [[self.unwrap(self.transform(item)) for item in row] if isinstance(row, list) else row
+                          for row in node.value]
+        return node
+
+    @staticmethod
+    def unwrap(item):
+        # Las cadenas sueltas en una fila se evaluarían como nombres de variable
+        return item.value if is_constant(item) and not isinstance(item.value, str) else item
+
+    def visit_binaryoperation(self, node):
+        node.left = self.transform(node.left)
+        node.right = self.transform(node.right)
+        op, left, right = node.op, node.left, node.right
+        if op in ('&', '|') and is_constant(left) and bool(left.value) == (op == '|'):
+            # El lado derecho no se evalúa: 'false & x' y 'true | x'
+            return literal_node(op == '|', node)
+        if op == '~' or op not in BINARY_OPERATORS or not (is_constant(left) and is_constant(right)):
+            return node
+        if self.too_large(op, left.value, right.value):
+            return node
+        try:
+            value = BINARY_OPERATORS[op](left.value, right.value)
+        except FOLD_ERRORS:
+            return node
+        return literal_node(value, node) or node
+
+    @staticmethod
+    def too_large(op, left, right):
+        """Operaciones que al plegarlas producirían valores desmedidos"""
+        if op == '*':
+            return isinstance(left, str) or isinstance(right, str)
+        if op == '^' and isinstance(left, int) and isinstance(right, int):
+            return abs(left) > 1 and right > 0 and left.bit_length() * right > MAX_POWER_BITS
+        return False
+
+    def visit_unaryoperation(self, node):
+        node.operand = self.transform(node.operand)
+        if not is_constant(node.operand):
+            return node
+        try:
+            value = UNARY_OPERATORS[node.op](node.operand.value)
+        except FOLD_ERRORS:
+            return node
+        return literal_node(value, node) or node
+
+    def visit_trigfunction(self, node):
+        node.argument = self.transform(node.argument)
+        if not is_constant(node.argument):
+            return node
+        try:
+            value = TRIG_FUNCTIONS[node.function](node.argument.value)
+        except FOLD_ERRORS:
+            return node
+        return literal_node(value, node) or node
+
+
+class LoopInvariants:
+    """Extrae las subexpresiones invariantes del cuerpo de un for-range.
+
+    Sólo se consideran las que se evalúan en todas las vueltas: las
+    sentencias del cuerpo anteriores a cualquier break/continue/return, sin
+    entrar en bloques condicionales ni en el lado derecho de '&'/'|'. Un
+    cuerpo con llamadas a funciones del programa no se toca (pueden escribir
+    cualquier variable global), y si modifica arrays no se extraen accesos.
+
+    Las invariantes se evalúan antes de la primera vuelta: las que pueden
+    fallar (ver can_fail) sólo se extraen mientras la vuelta todavía no hizo
+    nada que se note antes del error (imprimir o fallar de otra forma), es
+    decir, de la primera sentencia y antes de otra operación que pueda fallar.
+    Una variable puede fallar salvo que ya esté declarada con un tipo
+    numérico en el nivel superior y nunca cambie de tipo.
+    """
+
+    def __init__(self, optimizer, loop):
+        self.optimizer = optimizer
+        self.loop = loop
+        self.body = loop.body if isinstance(loop.body, list) else [loop.body]
+        self.written = set(targets(self.body)) | {loop.var}
+        self.mutates = any(isinstance(item, ArrayAssignment) for item in walk(self.body))
+        self.pristine = True  # la vuelta todavía no hizo nada antes de la expresión actual
+        self.numeric = optimizer.numeric
+
+    def hoist(self):
+        if any(isinstance(item, FunctionCall) for item in walk(self.body)):
+            return
+        for k, statement in enumerate(self.body):
+            if any(isinstance(item, JUMP_NODES) for item in walk(statement)):
+                break
+            self.body[k] = self.statement(statement)
+            self.pristine = False
+        if not isinstance(self.loop.body, list):
+            self.loop.body = self.body[0]
+
+    def statement(self, node):
+        if isinstance(node, Assignment):
+            node.expression = self.expression(node.expression)
+        elif isinstance(node, Declaration) and node.value is not None:
+            node.value = self.expression(node.value)
+        elif isinstance(node, ArrayDeclaration):
+            node.size = self.expression(node.size)
+        elif isinstance(node, ArrayAssignment):
+            self.pristine = False  # busca el array antes de evaluar el índice
+            node.index = self.expression(node.index)
+            if isinstance(node.values, list):
+                node.values = [self.expression(value) for value in node.values]
+        elif isinstance(node, (IfStatement, WhileStatement)):
+            node.condition = self.expression(node.condition)
+        elif isinstance(node, ForRangeStatement):
+            node.start = self.expression(node.start)
+            node.end = self.expression(node.end)
+        elif isinstance(node, PrintStatement):
+            node.args = [self.expression(arg) for arg in node.args]
+        elif isinstance(node, EXPRESSION_NODES):
+            return self.expression(node)
+        return node
+
+    def expression(self, node):
+        if not isinstance(node, ASTNode) or isinstance(node, Literal):
+            return node
+        if self.invariant(node) and (self.pristine or not self.can_fail(node)):
+            return self.temporary(node)
+        children = node._children
+        if isinstance(node, BinaryOperation) and node.op in ('&', '|'):
+            children = ('left',)  # el lado derecho no siempre se evalúa
+        for name in children:
+            value = getattr(node, name)
+            if isinstance(value, list):
+                setattr(node, name, [self.expression(item) for item in value])
+            else:
+                setattr(node, name, self.expression(value))
+        # Lo que queda sin extraer se evalúa en la vuelta, antes que lo que sigue
+        if self.pristine and self.can_fail(node):
+            self.pristine = False
+        return node
+
+    def can_fail(self, node):
+        return any(can_fail(item, self.numeric) for item in walk(node))
+
+    def invariant(self, node):
+        if not isinstance(node, EXPRESSION_NODES) or isinstance(node, Identifier):
+            return False
+        for item in walk(node):
+            if isinstance(item, (FunctionCall, TwoWayModelExpression)):
+                return False
+            if isinstance(item, BinaryOperation) and item.op == '~':
+                return False
+            if isinstance(item, Literal) and isinstance(item.value, list):
+                return False  # cada evaluación crea una lista nueva
+            if self.mutates and isinstance(item, ACCESS_NODES):
+                return False
+        return self.written.isdisjoint(reads(node))
+
+    def temporary(self, node):
+        """Guarda node en una variable oculta ('$' no es válido en el lenguaje)"""
+        name = f'$inv{self.optimizer.temporaries}'
+        self.optimizer.temporaries += 1
+        self.loop.invariants.append(Assignment(Identifier(name), node))
+        reference = Identifier(name)
+        reference.lineno, reference.lexpos = node.lineno, node.lexpos
+        return reference
+
+
+def grid_expression(node, excluded):
+    """Indica si node se puede evaluar sobre mallas y no lee ninguno de los nombres excluded"""
+    for item in walk(node):
+        if not isinstance(item, GRID_NODES):
+            return False
+        if isinstance(item, Literal) and not is_constant(item):
+            return False
+        if isinstance(item, BinaryOperation) and item.op in ('&', '|', '~'):
+            return False
+        if isinstance(item, Identifier) and item.name in excluded:
+            return False
+    return True
+
+
+def reduction_loop(loop):
+    """ReductionLoop que reemplaza al for-range loop, o None si no es una reducción.
+
+    Los ciclos de adentro ya se visitaron: si el cuerpo es un ReductionLoop
+    sobre el mismo acumulador, el nido se extiende con este ciclo.
+    """
+    body = loop.body[0] if isinstance(loop.body, list) and len(loop.body) == 1 else loop.body
+    if isinstance(body, ReductionLoop):
+        inner, _ = nest(body)
+        accumulator = body.accumulator
+        names = {accumulator} | {item.var for item in inner}
+        if loop.var in names:
+            return None
+        names.add(loop.var)
+        # Un nido rectangular: los rangos de adentro no dependen de las vueltas de afuera
+        if not all(grid_expression(bound, names) for item in inner for bound in (item.start, item.end)):
+            return None
+        loop.body = [body.loop] if isinstance(loop.body, list) else body.loop
+    elif isinstance(body, Assignment):
+        accumulator = body.identifier.name
+        reduction = reduction_terms(body.expression, accumulator)
+        if reduction is None or loop.var == accumulator:
+            return None
+        if not all(grid_expression(term, {accumulator}) for _, term in reduction[1]):
+            return None
+        names = {accumulator, loop.var}
+    else:
+        return None
+    if not (grid_expression(loop.start, names) and grid_expression(loop.end, names)):
+        return None
+    return ReductionLoop(loop, accumulator)
+
+
+def optimize(program):
+    """Optimiza un Program en el lugar y lo devuelve"""
+    return Optimizer().optimize(program)
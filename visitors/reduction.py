@@ -0,0 +1,291 @@
+"""Ejecución vectorizada de los ReductionLoop que arma visitors/optimizer.py.
+
+Un ReductionLoop es un nido de for-range rectangular cuyo cuerpo es sólo
+`acc = acc + t1 + t2 ...` (con '+'/'-', o con '*'). En lugar de recorrer las
+vueltas, las variables del nido se reemplazan por mallas de índices (un
+np.arange por ciclo, cada uno en su propia dimensión) y cada término se
+evalúa una sola vez para todas las vueltas. Un acceso como `Y.R[i][j][1]`
+toma de una vez el valor 1 de cada celda a partir de los offsets de la tabla.
+
+Los términos se acumulan en el orden del ciclo: np.add.accumulate suma de a
+un valor, así que un acumulador float da el mismo resultado bit a bit, y los
+enteros se suman de forma exacta, como los int de Python. Al terminar, las
+variables de los ciclos quedan con su último valor, como en el ciclo.
+
+Si algo no se puede evaluar así (valores que no son números ni arrays de
+números, índices fuera de rango, divisiones por cero, enteros que no caben
+en int64, un acumulador int con términos float) se ejecuta el ciclo
+original, que da los mismos resultados y errores que sin optimizar.
+"""
+import math
+
+import numpy as np
+
+from src.my_ast import BinaryOperation, ForRangeStatement, Identifier, walk
+from src.streak import LazyRunTable, RaggedArray
+from src.typedarray import TypedArray
+from src.vectorize import UFUNCS, apply_binary, unary
+from visitors.interpreter import BINARY_OPERATORS, COERCIONS, Interpreter
+
+# Operadores de una reducción: '+' y '-' se acumulan sumando, '*' multiplicando
+SUM_OPERATORS = {'+', '-'}
+PRODUCT_OPERATORS = {'*'}
+
+# Mayor entero que se acepta en una operación entera entre mallas (int64 con margen)
+MAX_INTEGER = 2.0 ** 62
+
+SCALAR_TYPES = (bool, int, float, np.bool_, np.integer, np.floating)
+
+
+class NotVectorizable(Exception):
+    """El nido no se puede evaluar sobre todas las vueltas: se ejecuta el ciclo"""
+
+
+def nest(node):
+    """(ciclos del nido, de afuera hacia adentro; asignación del cuerpo)"""
+    loops = []
+    statement = node.loop
+    while isinstance(statement, ForRangeStatement):
+        loops.append(statement)
+        body = statement.body
+        statement = body[0] if isinstance(body, list) and len(body) == 1 else body
+    return loops, statement
+
+
+def reduction_terms(expression, accumulator):
+    """(operador, [(signo, término)]) de `acc op t1 op t2 ...`, o None si no es una reducción"""
+    if (isinstance(expression, BinaryOperation) and expression.op in ('+', '*')
+            and isinstance(expression.right, Identifier) and expression.right.name == accumulator
+            and not isinstance(expression.left, Identifier)):
+        # `acc = t + acc`: la suma y el producto de dos valores no dependen del orden
+        return expression.op, [(1, expression.left)]
+    terms = []
+    operators = None
+    while isinstance(expression, BinaryOperation):
+        kind = SUM_OPERATORS if expression.op in SUM_OPERATORS else PRODUCT_OPERATORS
+        if expression.op not in kind or operators not in (None, kind):
+            return None
+        operators = kind
+        terms.append((-1 if expression.op == '-' else 1, expression.right))
+        expression = expression.left
+    if not terms or not isinstance(expression, Identifier) or expression.name != accumulator:
+        return None
+    terms.reverse()
+    return ('+' if operators is SUM_OPERATORS else '*'), terms
+
+
+def loop_names(node):
+    """Variables que usa el nido: el acumulador, las de los ciclos y las que se leen"""
+    loops, assignment = nest(node)
+    names = [node.accumulator] + [loop.var for loop in loops]
+    for item in walk([[loop.start, loop.end] for loop in loops] + [assignment.expression]):
+        if isinstance(item, Identifier) and item.name not in names:
+            names.append(item.name)
+    return names
+
+
+class Lanes:
+    """Valor de una expresión en todas las vueltas del nido (un ndarray con una dimensión por ciclo)"""
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+
+class Gather:
+    """Acceso a un array indexado con una malla al que todavía le faltan índices"""
+    __slots__ = ('base', 'positions')
+
+    def __init__(self, base, positions):
+        self.base = base
+        self.positions = positions
+
+
+def index_values(position):
+    if position.__class__ is Lanes:
+        if position.data.dtype.kind not in 'iu':
+            raise NotVectorizable("índices que no son enteros")
+        return position.data
+    return int(position)
+
+
+def check_range(positions, low, high):
+    if not (np.all(np.greater_equal(positions, low)) and np.all(np.less(positions, high))):
+        raise NotVectorizable("índice fuera de rango")
+
+
+def gather(value, position):
+    """value[position] cuando value es un Gather o position una malla de índices"""
+    if value.__class__ is Gather:
+        base, positions = value.base, value.positions + (index_values(position),)
+    else:
+        base, positions = value, (index_values(position),)
+    if isinstance(base, RaggedArray):
+        if len(positions) < 3:
+            return Gather(base, positions)
+        return Lanes(ragged_values(base, *positions))
+    data = base.data if base.__class__ is TypedArray else base
+    if data.__class__ is not np.ndarray or data.dtype.kind not in 'biuf':
+        raise NotVectorizable(f"no se puede indexar {type(base).__name__} con una malla")
+    if len(positions) < data.ndim:
+        return Gather(base, positions)
+    # Índices negativos y fuera de rango como en data[i][j]: NumPy los trata igual
+    return Lanes(data[positions])
+
+
+def ragged_values(table, i, j, k):
+    """Valor k de cada celda (i, j) de una tabla irregular, como table[i][j][k]"""
+    check_range(i, 0, table.rows)
+    if isinstance(table, LazyRunTable):
+        check_range(j, 0, table.cols)
+    else:
+        # table[i] es una lista de celdas: admite índices negativos
+        check_range(j, -table.cols, table.cols)
+        j = np.where(np.less(j, 0), np.add(j, table.cols), j)
+    offsets = table.offsets
+    cell = np.add(np.multiply(i, table.cols), j)
+    start = offsets[cell]
+    count = offsets[np.add(cell, 1)] - start
+    check_range(k, -count, count)
+    return table.values[start + np.where(np.less(k, 0), np.add(k, count), k)]
+
+
+def checked_binary(op, left, right):
+    """left op right con al menos una malla, con las reglas de los escalares de Python"""
+    if op not in UFUNCS:
+        raise NotVectorizable(f"'{op}' no se evalúa sobre mallas")
+    result = apply_binary(op, left, right)
+    kind = result.dtype.kind
+    if op in ('+', '-', '*', '^') and kind in 'iu':
+        # Los int de Python no desbordan: el mismo cálculo en float acota el resultado
+        estimate = apply_binary(op, np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64))
+        if not np.all(np.less(np.abs(estimate), MAX_INTEGER)):
+            raise NotVectorizable("entero fuera de int64")
+    elif op == '^' and kind == 'f' and not np.all(np.isfinite(result)) \
+            and np.all(np.isfinite(left)) and np.all(np.isfinite(right)):
+        # 0 ^ -1, base negativa con exponente no entero o desborde: error o complejo en Python
+        raise NotVectorizable("potencia fuera del dominio")
+    return result
+
+
+class GridInterpreter(Interpreter):
+    """Evalúa los límites y los términos de un nido con sus variables como mallas"""
+
+    def __init__(self, values):
+        super().__init__()
+        self.globals.update(values)
+        self.grids = set()
+
+    def visit_identifier(self, node):
+        value = self.lookup(node.name)
+        return Lanes(value) if node.name in self.grids else value
+
+    def visit_binaryoperation(self, node):
+        if node.op in ('&', '|'):
+            return super().visit_binaryoperation(node)
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if left.__class__ is not Lanes and right.__class__ is not Lanes:
+            if left.__class__ is Gather or right.__class__ is Gather:
+                raise NotVectorizable("acceso incompleto a un array")
+            return BINARY_OPERATORS[node.op](left, right)
+        return Lanes(checked_binary(node.op, self.lane_values(left), self.lane_values(right)))
+
+    @staticmethod
+    def lane_values(value):
+        if value.__class__ is Lanes:
+            return value.data
+        if not isinstance(value, SCALAR_TYPES):
+            # Un array entero operado con una malla sería un array por vuelta
+            raise NotVectorizable(f"operando {type(value).__name__} en una reducción")
+        return value
+
+    def visit_unaryoperation(self, node):
+        operand = self.visit(node.operand)
+        if operand.__class__ is Lanes:
+            return Lanes(unary(node.op, operand.data))
+        return super().visit_unaryoperation(node)
+
+    def index(self, value, position):
+        if value.__class__ is Lanes:
+            raise NotVectorizable("indexar un escalar")
+        if value.__class__ is Gather or position.__class__ is Lanes:
+            return gather(value, position)
+        return Interpreter.index(value, position)
+
+    def member(self, value, name):
+        if value.__class__ in (Lanes, Gather):
+            raise NotVectorizable(f"miembro '{name}' de una malla")
+        return Interpreter.member(value, name)
+
+    def term(self, node, shape):
+        value = self.visit(node)
+        if value.__class__ is Lanes:
+            value = value.data
+        elif not isinstance(value, SCALAR_TYPES):
+            raise NotVectorizable(f"término {type(value).__name__} en una reducción")
+        data = np.asarray(value)
+        if data.dtype.kind not in 'biuf':
+            raise NotVectorizable("término no numérico")
+        return np.broadcast_to(data, shape)
+
+
+def reduce_loop(node, values, declared=None):
+    """Nuevos valores que deja el nido de node como {variable: valor}, o None si hay que ejecutarlo.
+
+    `values` tiene los valores actuales de loop_names(node) y `declared` es el
+    tipo declarado del acumulador.
+    """
+    loops, assignment = nest(node)
+    op, terms = reduction_terms(assignment.expression, node.accumulator)
+    evaluator = GridInterpreter(values)
+    try:
+        with np.errstate(all='ignore'):
+            ranges = []
+            for loop in loops:
+                start, end = int(evaluator.visit(loop.start)), int(evaluator.visit(loop.end))
+                if start >= end:
+                    # Un rango vacío: no hay asignaciones, sólo los ciclos de afuera avanzan
+                    return {outer.var: r[-1] for outer, r in zip(loops, ranges)}
+                ranges.append(range(start, end))
+            for loop, grid in zip(loops, np.ix_(*[np.arange(r.start, r.stop) for r in ranges])):
+                evaluator.globals[loop.var] = grid
+                evaluator.grids.add(loop.var)
+            shape = tuple(len(r) for r in ranges)
+            columns = []
+            for sign, term in terms:
+                column = evaluator.term(term, shape)
+                # acc - t es exactamente acc + (-t), también en float
+                columns.append(-1 * column if sign < 0 else column)
+            total = accumulate(op, values.get(node.accumulator), columns, declared)
+    except Exception:
+        # El ciclo original repite el cálculo y, si corresponde, da el error de siempre
+        return None
+    result = {loop.var: r[-1] for loop, r in zip(loops, ranges)}
+    result[node.accumulator] = total
+    return result
+
+
+def accumulate(op, acc, columns, declared):
+    """acc op t1 op t2 ... en el orden del ciclo (las columnas ya tienen el signo de '-')"""
+    if not isinstance(acc, SCALAR_TYPES) or isinstance(acc, (bool, np.bool_)):
+        raise NotVectorizable("acumulador no numérico")
+    values = np.stack(columns, axis=-1).ravel()  # vuelta por vuelta, término por término
+    if values.dtype.kind == 'b':
+        values = values.astype(np.int64)
+    floating = values.dtype.kind == 'f' or isinstance(acc, (float, np.floating))
+    # La conversión al tipo declarado en cada vuelta sólo puede dejar el valor como está
+    if declared is not None and (declared not in ('int', 'float') or (declared == 'float') != floating):
+        raise NotVectorizable(f"acumulador {declared} con términos {values.dtype}")
+    if floating:
+        sequence = np.empty(values.size + 1, dtype=np.float64)
+        sequence[0] = acc
+        sequence[1:] = values
+        ufunc = np.add if op == '+' else np.multiply
+        total = ufunc.accumulate(sequence)[-1].item()
+    elif op == '*':
+        total = math.prod(values.tolist(), start=int(acc))
+    else:
+        bound = max(abs(int(values.max())), abs(int(values.min()))) * values.size
+        total = int(acc) + (int(values.sum()) if bound < 2 ** 63 else sum(values.tolist()))
+    return Interpreter.coerce(declared, total) if declared in COERCIONS else total
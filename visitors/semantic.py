@@ -0,0 +1,608 @@
+"""Análisis semántico del AST, antes de ejecutarlo.
+
+Arma una tabla de símbolos por ámbito (el programa y cada función), con el
+tipo estático de cada variable. Los tipos son los declarados
+('int', 'float', 'twoWayModel', ...; 'float[]' para un array) o el de las
+expresiones asignadas a una variable sin declarar; una variable escrita con
+tipos distintos (o un contador de for-range declarado como float) queda sin
+tipo (None). La tabla sólo sirve para validar: el intérprete y el compilador
+(visitors/compiler.py) resuelven los nombres y los tipos por su cuenta.
+
+Con ella valida de una vez lo que se puede saber sin ejecutar:
+
+- variables que nunca se declaran ni asignan, funciones no definidas o
+  llamadas con otra cantidad de argumentos;
+- operaciones entre tipos incompatibles (p. ej. string - int) y literales
+  que no se pueden convertir al tipo declarado;
+- tamaños de arrays: valores de más en `float a(2) = [...]`, cantidad de
+  valores en `a[2] = [...]` e índices constantes fuera de rango;
+- forma de los twoWayModel: la tabla n_ij de `[filas, columnas, n_ij]`, las
+  celdas del literal contra n_ij, y los efectos contra el modelo en `~`.
+
+Los errores se juntan y se lanzan todos en un SemanticError. Los mensajes son
+los mismos que daría la ejecución al llegar a esa sentencia; por eso sólo son
+errores en el código que siempre se ejecuta. Dentro de un if, del cuerpo de
+un ciclo o de una función, o a la derecha de '&'/'|', quedan como avisos
+(SymbolTable.warnings): el programa puede no llegar nunca a esa sentencia.
+"""
+from src.datablock import DataBlock
+from src.my_ast import (
+    ASTNode, ASTVisitor, ArrayAccess, ArrayAssignment, ArrayDeclaration, Assignment,
+    BinaryOperation, Declaration, ForRangeStatement, FunctionCall, Identifier, Literal,
+    MatrixDeclaration, ModelFileDeclaration, SpecialDeclaration, StatFunction, TrigFunction,
+    UnaryOperation
+)
+from visitors.interpreter import COERCIONS
+
+NUMERIC_TYPES = {'int', 'float'}
+# bool se comporta como número en las operaciones de Python
+ARITHMETIC_TYPES = {'int', 'float', 'bool'}
+SCALAR_TYPES = set(COERCIONS)
+ORDER_OPERATORS = {'<', '<=', '>', '>='}
+COMPARISON_OPERATORS = ORDER_OPERATORS | {'==', '!=', '&', '|'}
+
+# Valor de Symbol.type mientras no se conoce (distinto de None: tipos en conflicto)
+UNSET = object()
+
+
+def format_messages(label, errors):
+    return [f"{label} (línea {lineno}): {message}" if lineno is not None
+            else f"{label}: {message}" for lineno, message in errors]
+
+
+class SemanticError(Exception):
+    """Errores del análisis semántico: lista de (línea, mensaje)"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('\n'.join(self.messages()))
+
+    def messages(self):
+        return format_messages("Error semántico", self.errors)
+
+
+class Symbol:
+    __slots__ = ('name', 'scope', 'type', 'declared', 'writes', 'length', 'shape', 'counts', 'effects')
+
+    def __init__(self, name, scope):
+        self.name = name
+        self.scope = scope
+        self.type = UNSET
+        self.declared = set()  # tipos de las declaraciones (todo menos asignaciones)
+        self.writes = []      # (tipo de escritura, nodo, ámbito) en orden del código
+        self.length = None    # arrays: cantidad de elementos
+        self.shape = None     # twoWayModel: (filas, columnas)
+        self.counts = None    # twoWayModel: tabla n_ij como tupla de tuplas
+        self.effects = None   # efects: (efectos de fila, efectos de columna)
+
+    @property
+    def element_type(self):
+        """Tipo de los elementos de un array ('float' para 'float[]')"""
+        if isinstance(self.type, str) and self.type.endswith('[]'):
+            return self.type[:-2]
+        return None
+
+    def kinds(self):
+        return [kind for kind, _, _ in self.writes]
+
+    def __repr__(self):
+        kind = None if self.type is UNSET else self.type
+        return f"Symbol({self.scope.name}.{self.name}, tipo={kind})"
+
+
+class Scope:
+    """Tabla de símbolos de un ámbito; las búsquedas siguen al ámbito global"""
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.symbols = {}
+
+    def define(self, name):
+        symbol = self.symbols.get(name)
+        if symbol is None:
+            symbol = self.symbols[name] = Symbol(name, self)
+        return symbol
+
+    def lookup(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.symbols:
+                return scope.symbols[name]
+            scope = scope.parent
+        return None
+
+    def target(self, name):
+        """Símbolo que escribe una asignación: el local, el global si existe, o uno local nuevo"""
+        if name in self.symbols or self.parent is None or name not in self.parent.symbols:
+            return self.define(name)
+        return self.parent.symbols[name]
+
+    def names(self):
+        return list(self.symbols)
+
+    def __iter__(self):
+        return iter(self.symbols.values())
+
+
+class SymbolTable:
+    def __init__(self):
+        self.globals = Scope('<programa>')
+        self.functions = {}   # nombre -> FunctionDeclaration
+        self.scopes = {}      # nombre de función -> Scope
+        self.warnings = []    # (línea, mensaje) del código que puede no ejecutarse
+
+    def messages(self):
+        return format_messages("Aviso semántico", self.warnings)
+
+    def symbols(self):
+        yield from self.globals
+        for scope in self.scopes.values():
+            yield from scope
+
+
+# ------------------------- Valores y tipos estáticos -------------------------
+def constant(node):
+    """Valor numérico de un literal (o de su negación), None si no es constante"""
+    if isinstance(node, UnaryOperation) and node.op == '-':
+        value = constant(node.operand)
+        return -value if value is not None else None
+    if (isinstance(node, Literal) and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool)):
+        return node.value
+    return None
+
+
+def matrix_rows(node):
+    """Filas de un literal de matriz (lista de listas o DataBlock), None si no lo es"""
+    value = node.value if isinstance(node, Literal) else node
+    if isinstance(value, DataBlock) or (isinstance(value, list) and all(isinstance(row, list) for row in value)):
+        return value
+    return None
+
+
+def expression_type(node, scope):
+    """Tipo estático de una expresión, o None si depende de la ejecución"""
+    if isinstance(node, Literal):
+        if isinstance(node.value, (list, DataBlock)):
+            return 'matrix'
+        return node.type
+    if isinstance(node, Identifier):
+        symbol = scope.lookup(node.name)
+        return None if symbol is None or symbol.type is UNSET else symbol.type
+    if isinstance(node, UnaryOperation):
+        if node.op == '!':
+            return 'bool'
+        operand = expression_type(node.operand, scope)
+        return operand if operand in NUMERIC_TYPES else None
+    if isinstance(node, BinaryOperation):
+        if node.op in COMPARISON_OPERATORS:
+            return 'bool'
+        if node.op == '~':
+            return 'streak'
+        left, right = expression_type(node.left, scope), expression_type(node.right, scope)
+        if node.op == '+' and left == right == 'string':
+            return 'string'
+        if left not in NUMERIC_TYPES or right not in NUMERIC_TYPES:
+            return None
+        if node.op == '/' or 'float' in (left, right):
+            return 'float'
+        return 'int' if node.op in ('+', '-', '*', '%') else None
+    if isinstance(node, TrigFunction):
+        return 'float'
+    if isinstance(node, ArrayAccess):
+        array = expression_type(node.array, scope)
+        return array[:-2] if isinstance(array, str) and array.endswith('[]') else None
+    if isinstance(node, StatFunction):
+        return {'efects': 'efects', 'mean': 'float'}.get(node.function)
+    return None
+
+
+def value_count(node, scope):
+    """Cantidad de valores que aporta una expresión al aplanarla, None si no se sabe"""
+    if isinstance(node, list):
+        counts = [value_count(item, scope) for item in node]
+        return None if None in counts else sum(counts)
+    rows = matrix_rows(node)
+    if rows is not None:
+        if isinstance(rows, DataBlock):
+            return rows.values.size
+        return value_count([item for row in rows for item in row], scope)
+    if isinstance(node, (int, float)):
+        return 1
+    if isinstance(node, Identifier):
+        symbol = scope.lookup(node.name)
+        if symbol is not None and symbol.length is not None:
+            return symbol.length
+    kind = expression_type(node, scope)
+    return 1 if kind in SCALAR_TYPES else None
+
+
+# ------------------------- Recolección de símbolos -------------------------
+class Walker(ASTVisitor):
+    """Recorre todos los nodos hijos; las subclases atienden los que les importan"""
+
+    def generic_visit(self, node):
+        for child in node.children():
+            if isinstance(child, (ASTNode, list)):
+                self.visit(child)
+
+    def visit_list(self, node):
+        for item in node:
+            if isinstance(item, (ASTNode, list)):
+                self.visit(item)
+
+
+class SymbolCollector(Walker):
+    """Primer recorrido: crea los símbolos de cada ámbito y anota sus escrituras"""
+
+    def __init__(self, table):
+        self.table = table
+        self.scope = table.globals
+        self.pending = []
+
+    def collect(self, program):
+        self.visit(program)
+        # Las funciones después del código global: así sus asignaciones ven
+        # todas las variables globales
+        for node in self.pending:
+            self.scope = self.table.scopes[node.name] = Scope(node.name, self.table.globals)
+            for param in node.params:
+                self.write('param', param.identifier, param, declare=True)
+            self.visit(node.body)
+        self.scope = self.table.globals
+
+    def write(self, kind, name, node, declare=False):
+        symbol = self.scope.define(name) if declare else self.scope.target(name)
+        symbol.writes.append((kind, node, self.scope))
+
+    def visit_functiondeclaration(self, node):
+        self.table.functions[node.name] = node
+        self.pending.append(node)
+
+    def visit_declaration(self, node):
+        self.generic_visit(node)
+        self.write('declaration', node.identifier, node, declare=True)
+
+    def visit_arraydeclaration(self, node):
+        self.generic_visit(node)
+        self.write('array', node.identifier, node, declare=True)
+
+    def visit_specialdeclaration(self, node):
+        self.generic_visit(node)
+        self.write('special', node.identifier, node, declare=True)
+
+    def visit_matrixdeclaration(self, node):
+        self.write('model', node.name, node, declare=True)
+
+    def visit_modelfiledeclaration(self, node):
+        self.write('model', node.name, node, declare=True)
+
+    def visit_assignment(self, node):
+        self.visit(node.expression)
+        self.write('assign', node.identifier.name, node)
+
+    def visit_forrangestatement(self, node):
+        self.visit(node.start)
+        self.visit(node.end)
+        self.write('for', node.var, node)
+        self.visit(node.invariants)
+        self.visit(node.body)
+
+
+# ------------------------- Tipos y formas -------------------------
+def declared_type(kind, node):
+    if kind == 'declaration':
+        return node.type
+    if kind == 'array':
+        return f'{node.type}[]'
+    if kind == 'special':
+        return node.decl_type
+    if kind == 'model':
+        return 'twoWayModel'
+    if kind == 'param':
+        return node.type
+    if kind == 'for':
+        return 'int'
+    return None
+
+
+def infer_types(table):
+    """Tipo de cada símbolo: el declarado si es único, el de sus asignaciones si no declara"""
+    pending = []
+    for symbol in table.symbols():
+        symbol.declared = {declared_type(kind, node) for kind, node, _ in symbol.writes if kind != 'assign'}
+        if len(symbol.declared) > 1:
+            symbol.type = None
+        elif symbol.declared:
+            symbol.type = next(iter(symbol.declared))
+            if 'assign' in symbol.kinds() and symbol.type not in SCALAR_TYPES:
+                pending.append(symbol)  # sin conversión: vale lo que se le asigne
+        else:
+            pending.append(symbol)
+    # Las asignaciones pueden depender de otras variables sin declarar: se
+    # repite hasta que no cambie ningún tipo
+    for _ in range(len(pending) + 1):
+        changed = False
+        for symbol in pending:
+            kinds = symbol.declared | {expression_type(node.expression, scope)
+                                       for kind, node, scope in symbol.writes if kind == 'assign'}
+            kind = kinds.pop() if len(kinds) == 1 else None
+            if kind != symbol.type:
+                symbol.type = kind
+                changed = True
+        if not changed:
+            break
+    for symbol in table.symbols():
+        if symbol.type is UNSET:
+            symbol.type = None
+
+
+def infer_shapes(table):
+    """Largo de los arrays, forma de los modelos y de los efectos declarados una sola vez"""
+    symbols = list(table.symbols())
+    for symbol in symbols:
+        if symbol.kinds() == ['array']:
+            _, node, _ = symbol.writes[0]
+            size = constant(node.size)
+            if size is not None and size >= 0:
+                symbol.length = int(size)
+    for symbol in symbols:
+        if symbol.type == 'twoWayModel':
+            model_shape(symbol)
+    for symbol in symbols:
+        if symbol.kinds() == ['special'] and symbol.type == 'efects':
+            _, node, scope = symbol.writes[0]
+            if node.dimensions is not None and len(node.dimensions) == 3:
+                rows, cols = (value_count(arg, scope) for arg in node.dimensions[1:])
+                if rows is not None and cols is not None:
+                    symbol.effects = (rows, cols)
+
+
+def model_shape(symbol):
+    nodes = [node for _, node, _ in symbol.writes]
+    matrices = [node for node in nodes if isinstance(node, MatrixDeclaration)]
+    literals = [node for node in nodes if isinstance(node, Declaration)]
+    if len(matrices) + len(literals) != len(nodes):
+        return  # asignaciones o un archivo de datos: se sabe al ejecutar
+    if len(matrices) == 1:
+        counts = matrix_rows(matrices[0].data)
+        if counts is None:
+            return
+        counts = counts.tolist() if isinstance(counts, DataBlock) else [
+            [constant(item) if isinstance(item, ASTNode) else item for item in row] for row in counts]
+        if all(isinstance(item, (int, float)) and item >= 0 and item == int(item) for row in counts for item in row):
+            symbol.shape = (matrices[0].rows, matrices[0].cols)
+            symbol.counts = tuple(tuple(int(item) for item in row) for row in counts)
+    elif not matrices and len(literals) == 1:
+        cells = matrix_rows(literals[0].value)
+        if cells is not None:
+            symbol.shape = (1, len(cells))
+            symbol.counts = (tuple(len(cell) for cell in cells),)
+
+
+# ------------------------- Verificación -------------------------
+class Checker(Walker):
+    """Segundo recorrido: resuelve los identificadores y junta los errores"""
+
+    def __init__(self, table):
+        self.table = table
+        self.scope = table.globals
+        self.errors = []
+        self.conditional = 0  # > 0 en código que puede no ejecutarse
+
+    def error(self, node, message):
+        problems = self.table.warnings if self.conditional else self.errors
+        problems.append((getattr(node, 'lineno', None), message))
+
+    def visit_branch(self, *nodes):
+        """Visita código que sólo se ejecuta según los valores: sus errores son avisos"""
+        self.conditional += 1
+        try:
+            self.visit_list(nodes)
+        finally:
+            self.conditional -= 1
+
+    def symbol(self, node):
+        return self.scope.lookup(node.name) if isinstance(node, Identifier) else None
+
+    def type_of(self, node):
+        return expression_type(node, self.scope)
+
+    # ------------------------- Sentencias -------------------------
+    def visit_functiondeclaration(self, node):
+        outer, self.scope = self.scope, self.table.scopes[node.name]
+        try:
+            self.visit_branch(node.body)
+        finally:
+            self.scope = outer
+
+    def visit_ifstatement(self, node):
+        self.visit(node.condition)
+        self.visit_branch(node.true_block, node.elif_blocks, node.false_block)
+
+    def visit_whilestatement(self, node):
+        self.visit(node.condition)
+        self.visit_branch(node.body)
+
+    def visit_forstatement(self, node):
+        self.visit_list([node.init, node.condition])
+        self.visit_branch(node.body, node.update)
+
+    def visit_forrangestatement(self, node):
+        self.visit_list([node.start, node.end])
+        self.visit_branch(node.invariants, node.body)
+
+    def visit_declaration(self, node):
+        self.generic_visit(node)
+        if node.value is None:
+            return
+        if node.type == 'twoWayModel':
+            self.check_cells(node)
+        else:
+            self.check_conversion(node, node.type, node.value)
+
+    def visit_assignment(self, node):
+        self.visit(node.expression)
+        symbol = self.scope.target(node.identifier.name)
+        if len(symbol.declared) == 1:
+            self.check_conversion(node, next(iter(symbol.declared)), node.expression)
+
+    def check_conversion(self, node, type_specifier, value):
+        """Literales que no se pueden convertir al tipo numérico declarado"""
+        if isinstance(value, Literal) and isinstance(value.value, str) and type_specifier in NUMERIC_TYPES:
+            try:
+                COERCIONS[type_specifier](value.value)
+            except ValueError:
+                self.error(node, f"No se puede convertir {value.value!r} a {type_specifier}")
+
+    def visit_arraydeclaration(self, node):
+        self.generic_visit(node)
+        size = constant(node.size)
+        if node.value is None or size is None:
+            return
+        count = value_count(node.value, self.scope)
+        if count is not None and count > int(size):
+            self.error(node, f"Demasiados valores para '{node.identifier}({int(size)})'")
+
+    def visit_arrayassignment(self, node):
+        self.generic_visit(node)
+        name = node.array_name.name
+        count = constant(node.index)
+        if count is None:
+            return
+        count = int(count)
+        values = value_count(node.values, self.scope)
+        if values is not None and values != count:
+            self.error(node, f"'{name}[{count}]' espera {count} valores y recibió {values}")
+        symbol = self.symbol(node.array_name)
+        if symbol is not None and symbol.length is not None and count > symbol.length:
+            self.error(node, f"Índice fuera de rango en '{name}[{count}]'")
+
+    def visit_matrixdeclaration(self, node):
+        rows = matrix_rows(node.data)
+        if rows is None:
+            return
+        if len(rows) != node.rows:
+            self.error(node, f"Número de filas incorrecto. Esperado: {node.rows}, Obtenido: {len(rows)}")
+        for row in rows:
+            if len(row) != node.cols:
+                self.error(node, f"Número de columnas incorrecto. Esperado: {node.cols}, Obtenido: {len(row)}")
+                break
+        if isinstance(node.data, Literal) and isinstance(node.data.value, list):
+            self.visit(node.data)
+        values = rows.values.tolist() if isinstance(rows, DataBlock) else [
+            constant(item) if isinstance(item, ASTNode) else item for row in rows for item in row]
+        if any(isinstance(value, (int, float)) and value < 0 for value in values):
+            self.error(node, "twoWayModel inválido: Los tamaños de celda no pueden ser negativos")
+
+    def check_cells(self, node):
+        """Celdas de `twoWayModel m = [...]` contra la forma declarada de m"""
+        symbol = self.scope.lookup(node.identifier)
+        cells = matrix_rows(node.value)
+        # Sólo si la forma viene de un `twoWayModel m[filas, columnas, n_ij]` anterior
+        if cells is None or symbol is None or symbol.counts is None or not isinstance(
+                symbol.writes[0][1], MatrixDeclaration):
+            return
+        rows, cols = symbol.shape
+        if len(cells) != rows * cols:
+            self.error(node, f"twoWayModel inválido: Se esperaban {rows * cols} celdas ({rows}x{cols}) "
+                             f"y hay {len(cells)}")
+            return
+        sizes = [len(cell) for cell in cells]
+        expected = [count for row in symbol.counts for count in row]
+        if sizes != expected:
+            actual = [sizes[i * cols:(i + 1) * cols] for i in range(rows)]
+            self.error(node, f"twoWayModel inválido: Los tamaños de celda {actual} no coinciden con "
+                             f"{[list(row) for row in symbol.counts]}")
+
+    def visit_specialdeclaration(self, node):
+        self.generic_visit(node)
+        if node.decl_type == 'efects' and node.dimensions is not None and len(node.dimensions) != 3:
+            self.error(node, "twoWayModel inválido: efects espera (mu, efectos_fila, efectos_columna) "
+                             f"y recibió {len(node.dimensions)} valores")
+
+    # ------------------------- Expresiones -------------------------
+    def visit_identifier(self, node):
+        if self.scope.lookup(node.name) is None:
+            self.error(node, f"Variable no definida: '{node.name}'")
+
+    def visit_literal(self, node):
+        if isinstance(node.value, list):
+            for row in node.value:
+                if isinstance(row, list):
+                    self.visit([item for item in row if isinstance(item, ASTNode)])
+
+    def visit_functioncall(self, node):
+        self.generic_visit(node)
+        function = self.table.functions.get(node.name)
+        if function is None:
+            self.error(node, f"Función no definida: '{node.name}'")
+        elif len(node.args) != len(function.params):
+            self.error(node, f"'{node.name}' espera {len(function.params)} argumentos y recibió {len(node.args)}")
+
+    def visit_unaryoperation(self, node):
+        self.generic_visit(node)
+        operand = self.type_of(node.operand)
+        if node.op == '-' and operand == 'string':
+            self.error(node, "Operando inválido para '-': string")
+
+    def visit_binaryoperation(self, node):
+        op = node.op
+        if op in ('&', '|'):
+            # El operando derecho sólo se evalúa según el izquierdo
+            self.visit(node.left)
+            self.visit_branch(node.right)
+            return
+        self.generic_visit(node)
+        if op == '~':
+            self.check_streak(node)
+            return
+        if op in ('==', '!='):
+            return
+        if op == '%' and self.type_of(node.left) == 'string':
+            return  # formato de strings de Python
+        left, right = self.type_of(node.left), self.type_of(node.right)
+        if left is None or right is None or (left in ARITHMETIC_TYPES and right in ARITHMETIC_TYPES):
+            return
+        if left not in SCALAR_TYPES or right not in SCALAR_TYPES:
+            return  # arrays y modelos: se resuelven al ejecutar
+        if left == right == 'string' and op in ORDER_OPERATORS | {'+'}:
+            return
+        if op == '*' and {left, right} in ({'string', 'int'}, {'string', 'bool'}):
+            return
+        self.error(node, f"Operandos inválidos para '{op}': {left} y {right}")
+
+    def check_streak(self, node):
+        effects, model = self.symbol(node.left), self.symbol(node.right)
+        if effects is None or model is None or effects.effects is None or model.shape is None:
+            return
+        if effects.effects != model.shape:
+            self.error(node, "twoWayModel inválido: Efectos {}x{} incompatibles con un modelo {}x{}".format(
+                *effects.effects, *model.shape))
+
+    def visit_arrayaccess(self, node):
+        self.generic_visit(node)
+        symbol = self.symbol(node.array)
+        index = constant(node.index)
+        if symbol is None or symbol.length is None or index is None:
+            return
+        if not -symbol.length <= int(index) < symbol.length:
+            self.error(node, f"Índice fuera de rango: {index}")
+
+
+def check(program):
+    """Valida los identificadores, tipos y formas de `program`, sin modificarlo.
+
+    Devuelve la SymbolTable, con los avisos en `warnings`; si hay errores en
+    el código que siempre se ejecuta lanza SemanticError con todos.
+    """
+    table = SymbolTable()
+    SymbolCollector(table).collect(program)
+    infer_types(table)
+    infer_shapes(table)
+    checker = Checker(table)
+    checker.visit(program)
+    if checker.errors:
+        raise SemanticError(checker.errors)
+    return table
@@ -0,0 +1,295 @@
+"""Máquina de pila que ejecuta los CodeObject generados por visitors/compiler.py.
+
+El ciclo principal es un único while sobre la lista de instrucciones: no hay
+llamadas recursivas por nodo, sólo por llamadas a funciones del programa.
+"""
+import sys
+
+from visitors.compiler import (
+    LOAD_CONST, LOAD_SLOT, LOAD_SLOT_CHECKED, STORE_SLOT, LOAD_NAME, STORE_NAME,
+    POP, ADD, SUB, MUL, DIV, MOD, POW, LT, LE, GT, GE, EQ, NE, NEG, NOT,
+    JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, FOR_NEXT,
+    INDEX, GET_MEMBER, BUILD_LIST, PRINT, CALL, CALL_FUNCTION, DEFINE_FUNCTION,
+    RETURN_VALUE, compile_program,
+)
+from src.vectorize import ARRAY_CLASSES, binary, unary
+from visitors.interpreter import Interpreter, InterpreterError, invalid_operands, printable, truth
+
+# Valor de las ranuras que todavía no fueron asignadas
+UNSET = object()
+
+
+def operation_error(op, left, right, error):
+    """InterpreterError con el mismo mensaje que da el intérprete cuando left op right falla"""
+    if left.__class__ in ARRAY_CLASSES or right.__class__ in ARRAY_CLASSES:
+        # Como Interpreter.vector_binary
+        if error.__class__ is ZeroDivisionError:
+            return InterpreterError(str(error))
+        return InterpreterError(f"Operandos inválidos para '{op}': {error}")
+    # El intérprete revisa el divisor antes de operar
+    if error.__class__ is ZeroDivisionError or (op in ('/', '%') and right == 0):
+        return InterpreterError("Módulo por cero" if op == '%' else "División por cero")
+    return invalid_operands(op, left, right)
+
+
+class VM:
+    def __init__(self, output=None):
+        self.output = output or sys.stdout
+        self.functions = {}
+        self.globals = None
+
+    def run(self, code):
+        """Ejecuta el CodeObject del programa y devuelve sus variables globales"""
+        self.globals = [UNSET] * code.nslots
+        self.execute(code, self.globals)
+        return {
+            name: value for name, value in zip(code.slot_names, self.globals)
+            if value is not UNSET and '$' not in name
+        }
+
+    def call(self, name, args):
+        code = self.functions.get(name)
+        if code is None:
+            raise InterpreterError(f"Función no definida: '{name}'")
+        if len(args) != len(code.params):
+            raise InterpreterError(f"'{name}' espera {len(code.params)} argumentos y recibió {len(args)}")
+        slots = [UNSET] * code.nslots
+        slots[:len(args)] = args
+        return self.execute(code, slots)
+
+    def execute(self, code, slots):
+        instructions = code.code
+        consts = code.consts
+        global_slots = self.globals
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        while True:
+            op = instructions[pc]
+            # Las instrucciones más frecuentes van primero
+            if op == LOAD_SLOT:
+                push(slots[instructions[pc + 1]])
+                pc += 2
+            elif op == LOAD_CONST:
+                push(consts[instructions[pc + 1]])
+                pc += 2
+            elif op == STORE_SLOT:
+                slots[instructions[pc + 1]] = pop()
+                pc += 2
+            elif op == FOR_NEXT:
+                counter = instructions[pc + 1]
+                i = slots[counter]
+                if i < slots[counter + 1]:
+                    slots[instructions[pc + 2]] = i
+                    slots[counter] = i + 1
+                    pc += 4
+                else:
+                    pc = instructions[pc + 3]
+            elif op == JUMP:
+                pc = instructions[pc + 1]
+            elif op == ADD:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] + right
+                except TypeError as e:
+                    raise operation_error('+', stack[-1], right, e)
+                pc += 1
+            elif op == SUB:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] - right
+                except TypeError as e:
+                    raise operation_error('-', stack[-1], right, e)
+                pc += 1
+            elif op == MUL:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] * right
+                except TypeError as e:
+                    raise operation_error('*', stack[-1], right, e)
+                pc += 1
+            elif op == LT:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] < right
+                except TypeError as e:
+                    raise operation_error('<', stack[-1], right, e)
+                pc += 1
+            elif op == JUMP_IF_FALSE:
+                value = pop()
+                if value.__class__ in ARRAY_CLASSES:
+                    truth(value)  # error: una condición no puede ser un array
+                if value:
+                    pc += 2
+                else:
+                    pc = instructions[pc + 1]
+            elif op == DIV:
+                right = pop()
+                try:
+                    if right.__class__ in ARRAY_CLASSES or stack[-1].__class__ in ARRAY_CLASSES:
+                        stack[-1] = binary('/', stack[-1], right)
+                    elif right == 0:
+                        # Como en el intérprete: un escalar de NumPy daría inf o nan sin fallar
+                        raise InterpreterError("División por cero")
+                    else:
+                        stack[-1] = stack[-1] / right
+                except (ZeroDivisionError, TypeError) as e:
+                    raise operation_error('/', stack[-1], right, e)
+                pc += 1
+            elif op == MOD:
+                right = pop()
+                try:
+                    if right.__class__ in ARRAY_CLASSES or stack[-1].__class__ in ARRAY_CLASSES:
+                        stack[-1] = binary('%', stack[-1], right)
+                    elif right == 0:
+                        # Como en el intérprete: un escalar de NumPy daría inf o nan sin fallar
+                        raise InterpreterError("Módulo por cero")
+                    else:
+                        stack[-1] = stack[-1] % right
+                except (ZeroDivisionError, TypeError) as e:
+                    raise operation_error('%', stack[-1], right, e)
+                pc += 1
+            elif op == POW:
+                right = pop()
+                try:
+                    if right.__class__ in ARRAY_CLASSES or stack[-1].__class__ in ARRAY_CLASSES:
+                        stack[-1] = binary('^', stack[-1], right)
+                    else:
+                        stack[-1] = stack[-1] ** right
+                except (ZeroDivisionError, TypeError) as e:
+                    raise operation_error('^', stack[-1], right, e)
+                pc += 1
+            elif op == LE:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] <= right
+                except TypeError as e:
+                    raise operation_error('<=', stack[-1], right, e)
+                pc += 1
+            elif op == GT:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] > right
+                except TypeError as e:
+                    raise operation_error('>', stack[-1], right, e)
+                pc += 1
+            elif op == GE:
+                right = pop()
+                try:
+                    stack[-1] = stack[-1] >= right
+                except TypeError as e:
+                    raise operation_error('>=', stack[-1], right, e)
+                pc += 1
+            elif op == EQ:
+                right = pop()
+                stack[-1] = stack[-1] == right
+                pc += 1
+            elif op == NE:
+                right = pop()
+                stack[-1] = stack[-1] != right
+                pc += 1
+            elif op == INDEX:
+                position = pop()
+                try:
+                    stack[-1] = stack[-1][int(position)]
+                except (IndexError, KeyError, TypeError):
+                    stack[-1] = Interpreter.index(stack[-1], position)  # lanza el error del intérprete
+                pc += 1
+            elif op == CALL:
+                argc = instructions[pc + 2]
+                if argc == 1:
+                    stack[-1] = consts[instructions[pc + 1]](stack[-1])
+                else:
+                    args = stack[len(stack) - argc:]
+                    del stack[len(stack) - argc:]
+                    push(consts[instructions[pc + 1]](*args))
+                pc += 3
+            elif op == LOAD_NAME:
+                # Como Interpreter.lookup: la variable local si tiene valor, si no la global
+                value = slots[instructions[pc + 1]]
+                if value is UNSET:
+                    value = global_slots[instructions[pc + 2]]
+                    if value is UNSET:
+                        raise InterpreterError(
+                            f"Variable no definida: '{code.slot_names[instructions[pc + 1]]}'")
+                push(value)
+                pc += 3
+            elif op == STORE_NAME:
+                # Como Interpreter.assign: la global sólo si existe y no hay una local
+                if slots[instructions[pc + 1]] is UNSET and global_slots[instructions[pc + 2]] is not UNSET:
+                    global_slots[instructions[pc + 2]] = pop()
+                else:
+                    slots[instructions[pc + 1]] = pop()
+                pc += 3
+            elif op == LOAD_SLOT_CHECKED:
+                value = slots[instructions[pc + 1]]
+                if value is UNSET:
+                    raise InterpreterError(
+                        f"Variable no definida: '{code.slot_names[instructions[pc + 1]]}'")
+                push(value)
+                pc += 2
+            elif op == POP:
+                pop()
+                pc += 1
+            elif op == NEG:
+                if stack[-1].__class__ in ARRAY_CLASSES:
+                    stack[-1] = unary('-', stack[-1])
+                else:
+                    try:
+                        stack[-1] = -stack[-1]
+                    except TypeError:
+                        stack[-1] = Interpreter.apply_unary('-', stack[-1])  # lanza el error del intérprete
+                pc += 1
+            elif op == NOT:
+                if stack[-1].__class__ in ARRAY_CLASSES:
+                    stack[-1] = unary('!', stack[-1])
+                else:
+                    stack[-1] = not stack[-1]
+                pc += 1
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if stack[-1]:
+                    pop()
+                    pc += 2
+                else:
+                    pc = instructions[pc + 1]
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = instructions[pc + 1]
+                else:
+                    pop()
+                    pc += 2
+            elif op == GET_MEMBER:
+                stack[-1] = Interpreter.member(stack[-1], consts[instructions[pc + 1]])
+                pc += 2
+            elif op == BUILD_LIST:
+                count = instructions[pc + 1]
+                items = stack[len(stack) - count:]
+                del stack[len(stack) - count:]
+                push(items)
+                pc += 2
+            elif op == PRINT:
+                count = instructions[pc + 1]
+                items = stack[len(stack) - count:]
+                del stack[len(stack) - count:]
+                print(*map(printable, items), file=self.output)
+                pc += 2
+            elif op == CALL_FUNCTION:
+                argc = instructions[pc + 2]
+                args = stack[len(stack) - argc:]
+                del stack[len(stack) - argc:]
+                push(self.call(consts[instructions[pc + 1]], args))
+                pc += 3
+            elif op == DEFINE_FUNCTION:
+                function = consts[instructions[pc + 1]]
+                self.functions[function.name] = function
+                pc += 2
+            elif op == RETURN_VALUE:
+                return pop()
+            else:
+                raise InterpreterError(f"Instrucción desconocida {op} en {pc}")
+
+
+def run(program, output=None, base_dir=None):
+    """Compila y ejecuta un Program; devuelve el entorno global resultante"""
+    return VM(output).run(compile_program(program, base_dir))